@@ -0,0 +1,571 @@
+#!/usr/bin/env python3
+
+import argparse
+import gzip
+import hashlib
+import http.server
+import json
+import random
+import re
+import socket
+import threading
+import time
+import urllib.parse
+from typing import Any
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_ORGANIZATION = "mockorg"
+DEFAULT_USER = "mockuser"
+DEFAULT_REPOSITORY_COUNT = 1000
+DEFAULT_PAGE_SIZE = 30
+DEFAULT_RATE_LIMIT = 5000
+DEFAULT_RATE_LIMIT_WINDOW = 3600
+MAX_PAGE_SIZE = 100
+RANDOM_SEED = 1
+
+GRAPHQL_MUTATION_REGEXP = re.compile(
+    r"(\w+): (updateRepository|updateSubscription)\(input: \{([^}]*)\}\)"
+)
+GRAPHQL_INPUT_REGEXP = re.compile(r'(\w+): ("[^"]*"|\w+)')
+GRAPHQL_FIRST_REGEXP = re.compile(r"first: (\d+)")
+REPOSITORY_PATH_REGEXP = re.compile(r"^/repos/([^/]+)/([^/]+)(/hooks|/subscription)?$")
+ORGANIZATION_REPOSITORY_PATH_REGEXP = re.compile(r"^/orgs/([^/]+)/repos$")
+ORGANIZATION_MEMBERSHIP_PATH_REGEXP = re.compile(r"^/user/memberships/orgs/([^/]+)$")
+
+
+class MockRepository:
+    def __init__(self, index: int, owner: str, name: str, rnd: random.Random):
+        self.index = index
+        self.owner = owner
+        self.name = name
+        self.size = rnd.randint(0, 500000)
+        self.has_projects = rnd.random() < 0.5
+        self.has_wiki = rnd.random() < 0.5
+        self.admin = rnd.random() < 0.9
+        self.subscribed = rnd.random() < 0.5
+        self.webhook_count = rnd.choice([0, 0, 1, 2])
+        self.updated_at = time.strftime(
+            "%Y-%m-%dT%H:%M:%SZ", time.gmtime(1600000000 + (index * 3600))
+        )
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.owner}/{self.name}"
+
+    @property
+    def node_id(self) -> str:
+        return f"R_{self.index}"
+
+    def rest_item(self, host: str) -> dict[str, Any]:
+        # subset of REST API repository item, padded to approximate full payload size
+        return {
+            "id": self.index,
+            "node_id": self.node_id,
+            "name": self.name,
+            "full_name": self.full_name,
+            "private": False,
+            "owner": {"login": self.owner, "type": "Organization"},
+            "html_url": f"https://github.com/{self.full_name}",
+            "url": f"http://{host}/repos/{self.full_name}",
+            "git_url": f"git://github.com/{self.full_name}.git",
+            "size": self.size,
+            "has_projects": self.has_projects,
+            "has_wiki": self.has_wiki,
+            "updated_at": self.updated_at,
+            "permissions": {
+                "admin": self.admin,
+                "maintain": self.admin,
+                "push": True,
+                "triage": True,
+                "pull": True,
+            },
+            "description": "x" * 200,
+        }
+
+    def graphql_node(self) -> dict[str, Any]:
+        return {
+            "id": self.node_id,
+            "nameWithOwner": self.full_name,
+            "url": f"https://github.com/{self.full_name}",
+            "diskUsage": self.size,
+            "hasProjectsEnabled": self.has_projects,
+            "hasWikiEnabled": self.has_wiki,
+            "isArchived": False,
+            "isFork": False,
+            "isPrivate": False,
+            "viewerPermission": "ADMIN" if (self.admin) else "WRITE",
+            "viewerSubscription": "SUBSCRIBED" if (self.subscribed) else "UNSUBSCRIBED",
+            "updatedAt": self.updated_at,
+        }
+
+
+class MockGitHubServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        organization: str = DEFAULT_ORGANIZATION,
+        user: str = DEFAULT_USER,
+        repository_count: int = DEFAULT_REPOSITORY_COUNT,
+        latency: float = 0,
+        rate_limit: int = DEFAULT_RATE_LIMIT,
+        rate_limit_window: int = DEFAULT_RATE_LIMIT_WINDOW,
+        failure_rate: float = 0,
+    ):
+        super().__init__(address, MockGitHubRequestHandler)
+
+        self.organization = organization
+        self.user = user
+        self.repository_count = repository_count
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.failure_rate = failure_rate
+        self.failure_random = random.Random(RANDOM_SEED)
+        self.lock = threading.Lock()
+
+        self.reset()
+
+    def reset(self) -> None:
+        # generate synthetic organization - three quarters of repositories owned by organization
+        rnd = random.Random(RANDOM_SEED)
+        with self.lock:
+            self.repository_list = [
+                MockRepository(
+                    index,
+                    (self.organization if (index % 4) else self.user),
+                    f"repository-{index:06d}",
+                    rnd,
+                )
+                for index in range(self.repository_count)
+            ]
+
+            self.repository_collection = {
+                item.full_name: item for item in self.repository_list
+            }
+
+            self.node_collection = {item.node_id: item for item in self.repository_list}
+            self.request_count = 0
+            self.byte_count = 0
+            # remaining requests of each auth token, sharing one reset window
+            self.rate_limit_remaining_collection: dict[str, int] = {}
+            self.rate_limit_reset = int(time.time()) + self.rate_limit_window
+
+    def stats(self) -> dict[str, int]:
+        with self.lock:
+            return {"requests": self.request_count, "bytes": self.byte_count}
+
+
+class MockGitHubRequestHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: MockGitHubServer
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self):
+        self._handle()
+
+    def do_PATCH(self):
+        self._handle()
+
+    def do_POST(self):
+        self._handle()
+
+    def do_PUT(self):
+        self._handle()
+
+    def _handle(self) -> None:
+        if self.server.latency > 0:
+            time.sleep(self.server.latency)
+
+        url_part = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(url_part.query))
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        # apply rate limit of auth token
+        with self.server.lock:
+            if time.time() >= self.server.rate_limit_reset:
+                self.server.rate_limit_remaining_collection.clear()
+                self.server.rate_limit_reset = (
+                    int(time.time()) + self.server.rate_limit_window
+                )
+
+            rate_limited = self._rate_limit_remaining() < 1
+            if not rate_limited:
+                self.server.rate_limit_remaining_collection[self._auth_token()] = (
+                    self._rate_limit_remaining() - 1
+                )
+
+        if rate_limited:
+            self._send(403, {"message": "API rate limit exceeded"})
+            return
+
+        # transient failures - half as 502 responses, half as dropped connections
+        with self.server.lock:
+            failure = self.server.failure_random.random()
+
+        if failure < (self.server.failure_rate / 2):
+            self._send(502, {"message": "Server Error"})
+            return
+
+        if failure < self.server.failure_rate:
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)
+            return
+
+        # route request
+        path = url_part.path
+        repository_match = REPOSITORY_PATH_REGEXP.search(path)
+        organization_match = ORGANIZATION_REPOSITORY_PATH_REGEXP.search(path)
+        membership_match = ORGANIZATION_MEMBERSHIP_PATH_REGEXP.search(path)
+
+        if (self.command == "GET") and (path == "/user/repos"):
+            # repositories held in creation order
+            self._send_paged(
+                (
+                    self.server.repository_list[::-1]
+                    if (query.get("sort") == "created")
+                    and (query.get("direction") == "desc")
+                    else self.server.repository_list
+                ),
+                query,
+            )
+
+        elif (self.command == "GET") and (path == "/user/subscriptions"):
+            self._send_paged(
+                [item for item in self.server.repository_list if item.subscribed],
+                query,
+            )
+
+        elif (self.command == "GET") and (organization_match is not None):
+            self._send_paged(
+                [
+                    item
+                    for item in self.server.repository_list
+                    if item.owner == organization_match.group(1)
+                ],
+                query,
+            )
+
+        elif (self.command == "GET") and (membership_match is not None):
+            # authenticated user is an active owner of the organization alone
+            if membership_match.group(1) != self.server.organization:
+                self._send(404, {"message": "Not Found"})
+                return
+
+            self._send(
+                200,
+                {
+                    "state": "active",
+                    "role": "admin",
+                    "organization": {"login": self.server.organization},
+                },
+            )
+
+        elif (self.command == "POST") and (path == "/graphql"):
+            self._handle_graphql(json.loads(body))
+
+        elif repository_match is not None:
+            self._handle_repository(
+                self.server.repository_collection.get(
+                    f"{repository_match.group(1)}/{repository_match.group(2)}"
+                ),
+                repository_match.group(3),
+                json.loads(body) if (body) else {},
+            )
+
+        else:
+            self._send(404, {"message": "Not Found"})
+
+    def _handle_repository(
+        self,
+        repository: MockRepository | None,
+        sub_path: str | None,
+        parameter_collection: dict[str, Any],
+    ) -> None:
+        if repository is None:
+            self._send(404, {"message": "Not Found"})
+
+        elif (self.command == "GET") and (sub_path == "/hooks"):
+            if not repository.admin:
+                self._send(404, {"message": "Not Found"})
+                return
+
+            self._send(
+                200,
+                [
+                    {
+                        "id": index,
+                        "config": {
+                            "url": f"https://hooks.example.com/{repository.full_name}/{index}"
+                        },
+                    }
+                    for index in range(repository.webhook_count)
+                ],
+            )
+
+        elif (self.command == "GET") and (sub_path == "/subscription"):
+            if not repository.subscribed:
+                self._send(404, {"message": "Not Found"})
+                return
+
+            self._send(200, {"subscribed": True, "ignored": False})
+
+        elif (self.command == "PUT") and (sub_path == "/subscription"):
+            repository.subscribed = bool(parameter_collection.get("subscribed"))
+            self._send(200, {"subscribed": repository.subscribed, "ignored": False})
+
+        elif (self.command == "PATCH") and (sub_path is None):
+            repository.has_projects = parameter_collection.get(
+                "has_projects", repository.has_projects
+            )
+
+            repository.has_wiki = parameter_collection.get(
+                "has_wiki", repository.has_wiki
+            )
+
+            repository.updated_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+            self._send(200, repository.rest_item(self.headers["Host"]))
+
+        elif (self.command == "GET") and (sub_path is None):
+            self._send(200, repository.rest_item(self.headers["Host"]))
+
+        else:
+            self._send(404, {"message": "Not Found"})
+
+    def _handle_graphql(self, request_data: dict[str, Any]) -> None:
+        query = request_data["query"]
+        variable_collection = request_data.get("variables") or {}
+
+        if query.startswith("mutation"):
+            # aliased repository/subscription mutations
+            data: dict[str, Any] = {}
+            error_list: list[dict[str, Any]] = []
+            for alias, mutation_name, input_data in GRAPHQL_MUTATION_REGEXP.findall(
+                query
+            ):
+                input_collection = {
+                    key: json.loads(value) if (value.startswith('"')) else value
+                    for key, value in GRAPHQL_INPUT_REGEXP.findall(input_data)
+                }
+
+                repository = self.server.node_collection.get(
+                    input_collection.get("repositoryId")
+                    or input_collection.get("subscribableId", "")
+                )
+
+                if repository is None:
+                    data[alias] = None
+                    error_list.append(
+                        {
+                            "type": "NOT_FOUND",
+                            "path": [alias],
+                            "message": "Could not resolve to a node",
+                        }
+                    )
+                    continue
+
+                if mutation_name == "updateRepository":
+                    if "hasProjectsEnabled" in input_collection:
+                        repository.has_projects = (
+                            input_collection["hasProjectsEnabled"] == "true"
+                        )
+
+                    if "hasWikiEnabled" in input_collection:
+                        repository.has_wiki = (
+                            input_collection["hasWikiEnabled"] == "true"
+                        )
+
+                    repository.updated_at = time.strftime(
+                        "%Y-%m-%dT%H:%M:%SZ", time.gmtime()
+                    )
+                else:
+                    repository.subscribed = (
+                        input_collection.get("state") == "SUBSCRIBED"
+                    )
+
+                data[alias] = {"clientMutationId": None}
+
+            self._send(
+                200, {"data": data} | ({"errors": error_list} if (error_list) else {})
+            )
+            return
+
+        # repository connection - viewer or organization
+        if "organization(" in query:
+            root = "organization"
+            repository_list = [
+                item
+                for item in self.server.repository_list
+                if item.owner == variable_collection.get("login")
+            ]
+        else:
+            root = "viewer"
+            repository_list = self.server.repository_list
+
+        if "orderBy: {field: CREATED_AT, direction: DESC}" in query:
+            repository_list = repository_list[::-1]
+
+        first_match = GRAPHQL_FIRST_REGEXP.search(query)
+        first = int(first_match.group(1)) if (first_match) else MAX_PAGE_SIZE
+        offset = int(variable_collection.get("cursor") or 0)
+        node_list = [
+            item.graphql_node() for item in repository_list[offset : offset + first]
+        ]
+
+        self._send(
+            200,
+            {
+                "data": {
+                    root: {
+                        "repositories": {
+                            "nodes": node_list,
+                            "pageInfo": {
+                                "endCursor": str(offset + first),
+                                "hasNextPage": (offset + first) < len(repository_list),
+                            },
+                        }
+                    }
+                }
+            },
+        )
+
+    def _send_paged(
+        self,
+        repository_list: list[MockRepository],
+        query: dict[str, str],
+    ) -> None:
+        page = max(1, int(query.get("page", 1)))
+        page_size = min(MAX_PAGE_SIZE, int(query.get("per_page", DEFAULT_PAGE_SIZE)))
+        page_last = max(1, -(-len(repository_list) // page_size))
+        offset = (page - 1) * page_size
+
+        # build Link header
+        # info: https://docs.github.com/en/rest/using-the-rest-api/using-pagination-in-the-rest-api
+        def page_url(link_page: int) -> str:
+            link_query = query | {"page": str(link_page), "per_page": str(page_size)}
+            path = urllib.parse.urlsplit(self.path).path
+            return f"http://{self.headers['Host']}{path}?{urllib.parse.urlencode(link_query)}"
+
+        link_list: list[str] = []
+        if page < page_last:
+            link_list.append(f'<{page_url(page + 1)}>; rel="next"')
+            link_list.append(f'<{page_url(page_last)}>; rel="last"')
+
+        if page > 1:
+            link_list.append(f'<{page_url(1)}>; rel="first"')
+            link_list.append(f'<{page_url(page - 1)}>; rel="prev"')
+
+        self._send(
+            200,
+            [
+                item.rest_item(self.headers["Host"])
+                for item in repository_list[offset : offset + page_size]
+            ],
+            {"Link": ", ".join(link_list)} if (link_list) else {},
+        )
+
+    def _auth_token(self) -> str:
+        return self.headers.get("Authorization", "")
+
+    def _rate_limit_remaining(self) -> int:
+        return self.server.rate_limit_remaining_collection.get(
+            self._auth_token(), self.server.rate_limit
+        )
+
+    def _send(
+        self, http_code: int, data: Any, header_collection: dict[str, str] = {}
+    ) -> None:
+        body = bytes(json.dumps(data, separators=(",", ":")), "utf-8")
+        rate_limit_remaining = self._rate_limit_remaining()
+        header_collection = header_collection | {
+            "Content-Type": "application/json; charset=utf-8",
+            "X-RateLimit-Limit": str(self.server.rate_limit),
+            "X-RateLimit-Remaining": str(max(0, rate_limit_remaining)),
+            "X-RateLimit-Reset": str(self.server.rate_limit_reset),
+            "X-RateLimit-Resource": (
+                "graphql" if (self.path.endswith("/graphql")) else "core"
+            ),
+            "X-RateLimit-Used": str(self.server.rate_limit - rate_limit_remaining),
+        }
+
+        # conditional GET requests
+        if (http_code == 200) and (self.command == "GET"):
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            header_collection["ETag"] = etag
+            if self.headers.get("If-None-Match") == etag:
+                # not modified - not counted against rate limit
+                with self.server.lock:
+                    self.server.rate_limit_remaining_collection[self._auth_token()] = (
+                        self._rate_limit_remaining() + 1
+                    )
+
+                http_code = 304
+                body = b""
+
+        if body and ("gzip" in self.headers.get("Accept-Encoding", "")):
+            body = gzip.compress(body)
+            header_collection["Content-Encoding"] = "gzip"
+
+        self.send_response(http_code)
+        for key, value in header_collection.items():
+            self.send_header(key, value)
+
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+        with self.server.lock:
+            self.server.request_count += 1
+            self.server.byte_count += len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", default=DEFAULT_PORT, type=int)
+    parser.add_argument("--organization", default=DEFAULT_ORGANIZATION)
+    parser.add_argument("--user", default=DEFAULT_USER)
+    parser.add_argument(
+        "--repository-count", default=DEFAULT_REPOSITORY_COUNT, type=int
+    )
+    parser.add_argument(
+        "--latency", default=0, help="seconds added to each response", type=float
+    )
+    parser.add_argument("--rate-limit", default=DEFAULT_RATE_LIMIT, type=int)
+    parser.add_argument(
+        "--rate-limit-window", default=DEFAULT_RATE_LIMIT_WINDOW, type=int
+    )
+    parser.add_argument(
+        "--failure-rate",
+        default=0,
+        help="fraction of requests failing with a 502 response or dropped connection",
+        type=float,
+    )
+
+    arg_list = parser.parse_args()
+
+    server = MockGitHubServer(
+        (arg_list.host, arg_list.port),
+        arg_list.organization,
+        arg_list.user,
+        arg_list.repository_count,
+        arg_list.latency,
+        arg_list.rate_limit,
+        arg_list.rate_limit_window,
+        arg_list.failure_rate,
+    )
+
+    print(f"Listening on http://{arg_list.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+import argparse
+import random
+import re
+import string
+import time
+
+from lib import common
+
+DEFAULT_FILTER_COUNT_LIST = [1, 10, 50, 200]
+DEFAULT_NAME_COUNT_LIST = [1000, 10000, 100000]
+NAME_OWNER_COUNT = 20
+RANDOM_SEED = 1
+
+
+class ReferenceRepositoryFilter:
+    # original list of separately compiled regular expressions - baseline for comparison
+    def __init__(self, include_list: list[str], exclude_list: list[str]):
+        self.include_list = [self._build(item) for item in include_list]
+        self.exclude_list = [self._build(item) for item in exclude_list]
+
+    def accept(self, name: str) -> bool:
+        if any(item.search(name) for item in self.exclude_list):
+            return False
+
+        if len(self.include_list) < 1:
+            return True
+
+        return any(item.search(name) for item in self.include_list)
+
+    def _build(self, filter_item: str) -> re.Pattern:
+        return re.compile("^" + re.escape(filter_item).replace("\\*", ".+?") + "$")
+
+
+def random_word(rnd: random.Random) -> str:
+    return "".join(
+        rnd.choice(string.ascii_lowercase + "-_") for _ in range(rnd.randint(3, 12))
+    )
+
+
+def build_name_list(rnd: random.Random, count: int) -> list[str]:
+    owner_list = [random_word(rnd) for _ in range(NAME_OWNER_COUNT)]
+    return [f"{rnd.choice(owner_list)}/{random_word(rnd)}" for _ in range(count)]
+
+
+def build_filter_list(
+    rnd: random.Random, name_list: list[str], count: int
+) -> list[str]:
+    # mix of literal, prefix, suffix and infix wildcard filters based on actual names
+    filter_list: list[str] = []
+    for _ in range(count):
+        owner, repository = rnd.choice(name_list).split("/")
+        filter_list.append(
+            rnd.choice(
+                [
+                    f"{owner}/{repository}",
+                    f"{owner}/{repository[:2]}*",
+                    f"*/{repository[-3:]}",
+                    f"{owner[:1]}*/*{repository[1:3]}*",
+                ]
+            )
+        )
+
+    return filter_list
+
+
+def measure(
+    repository_filter: common.RepositoryFilter | ReferenceRepositoryFilter,
+    name_list: list[str],
+) -> tuple[float, list[bool]]:
+    time_start = time.perf_counter()
+    result_list = [repository_filter.accept(name) for name in name_list]
+
+    return time.perf_counter() - time_start, result_list
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--filter-count", default=DEFAULT_FILTER_COUNT_LIST, nargs="+", type=int
+    )
+
+    parser.add_argument(
+        "--name-count", default=DEFAULT_NAME_COUNT_LIST, nargs="+", type=int
+    )
+
+    arg_list = parser.parse_args()
+    rnd = random.Random(RANDOM_SEED)
+
+    print("filters\tnames\treference/sec\tcompiled/sec\tspeedup")
+    for name_count in arg_list.name_count:
+        name_list = build_name_list(rnd, name_count)
+        for filter_count in arg_list.filter_count:
+            include_list = build_filter_list(rnd, name_list, filter_count)
+            exclude_list = build_filter_list(rnd, name_list, max(1, filter_count // 4))
+
+            reference_time, reference_result_list = measure(
+                ReferenceRepositoryFilter(include_list, exclude_list), name_list
+            )
+
+            compiled_time, compiled_result_list = measure(
+                common.RepositoryFilter(include_list, exclude_list), name_list
+            )
+
+            # compiled matcher must accept/reject exactly as the reference
+            if compiled_result_list != reference_result_list:
+                raise AssertionError(
+                    f"Result mismatch for {filter_count} filters, {name_count} names"
+                )
+
+            print(
+                f"{filter_count}\t{name_count}"
+                f"\t{name_count / reference_time:.0f}"
+                f"\t{name_count / compiled_time:.0f}"
+                f"\t{reference_time / compiled_time:.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
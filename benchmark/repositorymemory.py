@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from benchmark import mockserver
+from lib import githubapi
+
+DEFAULT_REPOSITORY_COUNT = 50000
+MOCK_AUTH_TOKEN = "ghp_" + ("0" * 36)
+ITEM_TYPE_DICT = "dict"
+ITEM_TYPE_REPOSITORY = "repository"
+
+
+def list_repository(base_url: str, item_type: str, hold: bool) -> None:
+    # child process - list organization repositories as full JSON dicts, or projected records
+    githubapi.set_client(githubapi.GitHubClient(base_url=base_url, pacing=False))
+    repository_list = (
+        githubapi._request_paged(
+            MOCK_AUTH_TOKEN,
+            f"orgs/{mockserver.DEFAULT_ORGANIZATION}/repos",
+            parameter_collection={"type": "all"},
+        )
+        if (item_type == ITEM_TYPE_DICT)
+        else githubapi.organization_repository_list(
+            MOCK_AUTH_TOKEN, mockserver.DEFAULT_ORGANIZATION, "all"
+        )
+    )
+
+    if hold:
+        # hold every repository, as a sorted listing would
+        repository_count = len(list(repository_list))
+    else:
+        repository_count = sum(1 for _ in repository_list)
+
+    print(repository_count)
+
+
+def run_child(base_url: str, item_type: str, hold: bool) -> dict[str, float]:
+    time_start = time.perf_counter()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "benchmark.repositorymemory",
+            "--child",
+            item_type,
+            "--base-url",
+            base_url,
+        ]
+        + (["--hold"] if (hold) else []),
+        stdout=subprocess.PIPE,
+    )
+
+    # read repository count, then wait4() for resource usage of the child process alone
+    stdout = process.stdout.read() if (process.stdout is not None) else b""
+    _, _, rusage = os.wait4(process.pid, 0)
+
+    return {
+        "wall_time": time.perf_counter() - time_start,
+        "repository_count": int(stdout or 0),
+        # ru_maxrss reported in kilobytes on Linux
+        "peak_rss": rusage.ru_maxrss,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--repository-count", default=DEFAULT_REPOSITORY_COUNT, type=int
+    )
+    parser.add_argument(
+        "--child",
+        choices=[ITEM_TYPE_DICT, ITEM_TYPE_REPOSITORY],
+        help=argparse.SUPPRESS,
+    )
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    parser.add_argument("--hold", action="store_true", help=argparse.SUPPRESS)
+
+    arg_list = parser.parse_args()
+    if arg_list.child is not None:
+        list_repository(arg_list.base_url, arg_list.child, arg_list.hold)
+        return
+
+    # start mock API server on a free port - all repositories owned by organization
+    server = mockserver.MockGitHubServer(
+        (mockserver.DEFAULT_HOST, 0),
+        user=mockserver.DEFAULT_ORGANIZATION,
+        repository_count=arg_list.repository_count,
+        rate_limit=1000000,
+    )
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://{mockserver.DEFAULT_HOST}:{server.server_port}"
+
+    for hold in (False, True):
+        for item_type in (ITEM_TYPE_DICT, ITEM_TYPE_REPOSITORY):
+            result = run_child(base_url, item_type, hold)
+            print(
+                f"{item_type} {'held' if (hold) else 'streamed'}".ljust(24)
+                + f"{result['repository_count']:8d} repositories"
+                + f"{result['wall_time']:8.2f}s"
+                + f"{result['peak_rss'] / 1024:8.1f} MB RSS"
+            )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
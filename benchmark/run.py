@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmark import mockserver
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+MOCK_AUTH_TOKEN = "ghp_" + ("0" * 36)
+
+# script and arguments for each benchmark scenario
+SCENARIO_LIST = [
+    ("listorganizationrepositorybysize.py", []),
+    ("listorganizationrepositorybysize.py", ["--graphql"]),
+    ("listorganizationrepositorywebhooks.py", []),
+    ("listorganizationrepositorywebhooks.py", ["--asyncio"]),
+    ("removerepositorywiki.py", []),
+    ("removerepositorywiki.py", ["--commit"]),
+    ("removerepositorywiki.py", ["--commit", "--graphql"]),
+    ("removerepositoryprojects.py", ["--commit"]),
+    ("subscriberepositories.py", []),
+    ("subscriberepositories.py", ["--commit"]),
+    ("subscriberepositories.py", ["--commit", "--graphql"]),
+    ("subscriberepositories.py", ["--commit", "--subscription-strategy", "check"]),
+    ("subscriberepositories.py", ["--commit", "--subscription-strategy", "list"]),
+    (
+        "updaterepositories.py",
+        ["--commit", "--disable-wiki", "--disable-projects", "--subscribe"],
+    ),
+]
+
+
+def run_scenario(
+    server: mockserver.MockGitHubServer,
+    config_file: str,
+    script: str,
+    argument_list: list[str],
+) -> dict[str, float]:
+    # each scenario starts from fresh synthetic data and counters
+    server.reset()
+    environment = os.environ | {
+        "API_BASE_URL": f"http://{mockserver.DEFAULT_HOST}:{server.server_port}",
+        "AUTH_TOKEN": MOCK_AUTH_TOKEN,
+        "CONFIG_FILE": config_file,
+    }
+
+    # empty cache directory - no snapshot state carried between scenarios
+    with tempfile.TemporaryDirectory() as cache_dir:
+        time_start = time.perf_counter()
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                script,
+                "--no-cache",
+                "--no-pacing",
+                "--cache-dir",
+                cache_dir,
+            ]
+            + argument_list,
+            cwd=ROOT_DIR,
+            env=environment,
+            stdout=subprocess.DEVNULL,
+        )
+
+        # wait4() returns resource usage of the child process alone
+        _, status, rusage = os.wait4(process.pid, 0)
+        wall_time = time.perf_counter() - time_start
+
+    stats = server.stats()
+    return {
+        "exit_code": os.waitstatus_to_exitcode(status),
+        "wall_time": wall_time,
+        "requests": stats["requests"],
+        "bytes": stats["bytes"],
+        # ru_maxrss reported in kilobytes on Linux
+        "peak_rss": rusage.ru_maxrss,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--repository-count", default=mockserver.DEFAULT_REPOSITORY_COUNT, type=int
+    )
+    parser.add_argument(
+        "--latency", default=0.02, help="seconds added to each response", type=float
+    )
+    parser.add_argument("--script", help="run only scenarios for the given script")
+    parser.add_argument("--json", action="store_true", help="output results as JSON")
+
+    arg_list = parser.parse_args()
+
+    # start mock API server on a free port
+    server = mockserver.MockGitHubServer(
+        (mockserver.DEFAULT_HOST, 0),
+        repository_count=arg_list.repository_count,
+        latency=arg_list.latency,
+        rate_limit=1000000,
+    )
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    result_list: list[dict[str, str | float]] = []
+    with tempfile.NamedTemporaryFile("w", suffix=".json") as config_fp:
+        json.dump(
+            {
+                "AUTH_TOKEN": MOCK_AUTH_TOKEN,
+                "ORGANIZATION": mockserver.DEFAULT_ORGANIZATION,
+                "REPOSITORY_TYPE": "all",
+            },
+            config_fp,
+        )
+
+        config_fp.flush()
+
+        for script, argument_list in SCENARIO_LIST:
+            if (arg_list.script is not None) and (script != arg_list.script):
+                continue
+
+            result = run_scenario(server, config_fp.name, script, argument_list)
+            result_list.append(
+                {"script": script, "arguments": " ".join(argument_list)} | result
+            )
+
+            if not arg_list.json:
+                print(
+                    f"{script} {' '.join(argument_list)}".ljust(58)
+                    + f"{result['wall_time']:8.2f}s"
+                    + f"{result['requests']:8d} req"
+                    + f"{result['bytes'] / 1024:10.0f} KB"
+                    + f"{result['peak_rss'] / 1024:8.1f} MB RSS"
+                    + ("" if (result["exit_code"] == 0) else " [FAILED]")
+                )
+
+    server.shutdown()
+    if arg_list.json:
+        print(json.dumps(result_list, indent=2))
+
+    # any failed scenario fails the run
+    if any(result["exit_code"] != 0 for result in result_list):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
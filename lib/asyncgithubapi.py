@@ -0,0 +1,732 @@
+import asyncio
+import collections
+import contextlib
+import email.parser
+import http.client
+import json
+import ssl
+import time
+import urllib.parse
+from collections.abc import AsyncGenerator, Callable, Iterable
+from typing import Any
+
+from lib import githubapi, responsecache
+
+DEFAULT_CONCURRENCY = 64
+REQUEST_RETRY_EXCEPTION_LIST = githubapi.REQUEST_RETRY_EXCEPTION_LIST + (
+    asyncio.IncompleteReadError,
+)
+REQUEST_CONNECTION_EXCEPTION_LIST = githubapi.REQUEST_CONNECTION_EXCEPTION_LIST + (
+    asyncio.IncompleteReadError,
+)
+
+
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class AsyncGitHubClient:
+    def __init__(
+        self,
+        base_url: str = githubapi.API_BASE_URL,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        timeout: float = githubapi.REQUEST_TIMEOUT,
+        max_requests: int | None = None,
+        pacing: bool = True,
+        request_hook_list: list[githubapi.RequestHook] | None = None,
+        retry_max: int = githubapi.REQUEST_RETRY_MAX,
+        auth_token_pool: list[str] | None = None,
+        response_cache: responsecache.ResponseCache | None = None,
+    ):
+        # split base URL into host, port and path prefix
+        url_part = urllib.parse.urlsplit(base_url)
+        self._ssl_context = (
+            ssl.create_default_context() if (url_part.scheme == "https") else None
+        )
+
+        self._host = url_part.netloc
+        self._hostname = url_part.hostname or ""
+        self._port = url_part.port or (443 if (self._ssl_context) else 80)
+        self._path_prefix = url_part.path.rstrip("/")
+        self._timeout = timeout
+
+        # bound in flight requests, idle keep-alive connections shared between requests
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._connection_pool: collections.deque[_Connection] = collections.deque()
+        self._pool_size = concurrency
+
+        # rate limit scheduler for each auth token, optional cap of total requests sent
+        self._rate_limit_collection: dict[
+            tuple[str | None, str], githubapi.RateLimitScheduler
+        ] = {}
+        self._max_requests = max_requests
+        self._pacing = pacing
+        self.request_count = 0
+
+        # retry limit for transient failures of idempotent requests
+        self._retry_max = retry_max
+        self.retry_count = 0
+
+        # functions called with a record of every request sent
+        self.request_hook_list = list(request_hook_list or [])
+
+        # tokens sharing pooled read requests of the first token - mutations never pooled
+        self.auth_token_pool = list(auth_token_pool or [])
+        self._listing_token_selector = githubapi.ListingTokenSelector()
+
+        # conditional request cache of GET responses, keyed by auth token and path
+        self._response_cache = response_cache
+
+        # headers sent with every request
+        self._header_collection = {
+            "Accept": githubapi.REQUEST_ACCEPT_VERSION,
+            "Accept-Encoding": "gzip",
+            "Host": self._host,
+            "User-Agent": githubapi.REQUEST_USER_AGENT,
+            "X-GitHub-Api-Version": githubapi.REQUEST_API_VERSION,
+        }
+
+    def close(self) -> None:
+        while self._connection_pool:
+            self._connection_pool.pop().close()
+
+    def rate_limit(
+        self,
+        auth_token: str | None,
+        resource: str = githubapi.RATE_LIMIT_RESOURCE_CORE,
+    ) -> githubapi.RateLimitScheduler:
+        key = (auth_token, resource)
+        if key not in self._rate_limit_collection:
+            self._rate_limit_collection[key] = githubapi.RateLimitScheduler(
+                self._pacing
+            )
+
+        return self._rate_limit_collection[key]
+
+    def listing_auth_token(
+        self, auth_token: str, api_path: str
+    ) -> contextlib.AbstractContextManager[str]:
+        return self._listing_token_selector.select(
+            self.auth_token_pool,
+            self.rate_limit,
+            auth_token,
+            githubapi._rate_limit_resource(api_path),
+        )
+
+    async def request(
+        self,
+        auth_token: str | None,
+        api_path: str,
+        method: str | None = None,
+        parameter_collection: dict[str, Any] = {},
+        mutation: bool | None = None,
+        endpoint: str | None = None,
+        token_pool: bool = False,
+    ) -> Any:
+        response = await self.request_response(
+            auth_token,
+            api_path,
+            method,
+            parameter_collection,
+            mutation,
+            endpoint,
+            token_pool,
+        )
+
+        return response.data
+
+    async def request_response(
+        self,
+        auth_token: str | None,
+        api_path: str,
+        method: str | None = None,
+        parameter_collection: dict[str, Any] = {},
+        mutation: bool | None = None,
+        endpoint: str | None = None,
+        token_pool: bool = False,
+    ) -> githubapi.APIResponse:
+        method, request_path, header_collection, data_send = githubapi._request_build(
+            self._path_prefix,
+            self._header_collection,
+            auth_token,
+            api_path,
+            method,
+            parameter_collection,
+        )
+
+        resource = githubapi._rate_limit_resource(api_path)
+
+        if mutation is None:
+            # requests other than GET assumed to mutate
+            mutation = method != "GET"
+
+        # make the request, following redirects for GET requests (e.g. renamed repositories)
+        # rate limited requests are retried after waiting for the rate limit to reset
+        retryable = githubapi._request_retryable(method, mutation)
+        rate_limit_retry_count = 0
+        retry_count = 0
+        redirect_count = 0
+        while True:
+            if (self._max_requests is not None) and (
+                self.request_count >= self._max_requests
+            ):
+                raise githubapi.RequestBudgetError(self._max_requests)
+
+            # pooled reads sent with the token of most remaining quota - chosen again on retry
+            request_auth_token = (
+                githubapi._auth_token_select(
+                    self.auth_token_pool, self.rate_limit, auth_token, resource
+                )
+                if (token_pool and (not mutation))
+                else auth_token
+            )
+
+            rate_limit = self.rate_limit(request_auth_token, resource)
+            request_header_collection = githubapi._request_auth_header(
+                header_collection, auth_token, request_auth_token
+            )
+
+            # cached response available? make a conditional request
+            cache_entry: responsecache.CacheEntry | None = None
+            if (self._response_cache is not None) and (method == "GET"):
+                cache_entry = self._response_cache.get(request_auth_token, request_path)
+                if cache_entry is not None:
+                    request_header_collection = request_header_collection | {
+                        "If-None-Match": cache_entry.etag
+                    }
+
+            self.request_count += 1
+            await asyncio.sleep(rate_limit.reserve(mutation))
+
+            try:
+                async with self._semaphore:
+                    # latency measured once connection slot acquired
+                    time_start = time.monotonic()
+                    http_code, response_header_collection, response_body = (
+                        await self._send(
+                            method,
+                            request_path,
+                            request_header_collection,
+                            data_send,
+                            retryable,
+                        )
+                    )
+
+            except REQUEST_RETRY_EXCEPTION_LIST as err:
+                # connection failure - retry idempotent requests after backoff, otherwise raised as API error
+                if (not retryable) or (retry_count >= self._retry_max):
+                    raise githubapi.ConnectionRequestError(err) from err
+
+                connection_retry_wait = githubapi._request_retry_wait(retry_count)
+                githubapi._request_hook_call(
+                    self.request_hook_list,
+                    method,
+                    endpoint or api_path,
+                    0,
+                    time.monotonic() - time_start,
+                    http.client.HTTPMessage(),
+                    0,
+                    connection_retry_wait,
+                    str(err) or type(err).__name__,
+                    request_auth_token,
+                )
+
+                retry_count += 1
+                self.retry_count += 1
+                await asyncio.sleep(connection_retry_wait)
+                continue
+
+            except REQUEST_CONNECTION_EXCEPTION_LIST as err:
+                # connection failure not retried (e.g. connection refused, DNS failure)
+                raise githubapi.ConnectionRequestError(err) from err
+
+            latency = time.monotonic() - time_start
+            response_bytes = len(response_body)
+            response_body = githubapi._response_body_decode(
+                response_header_collection, response_body
+            )
+
+            rate_limit.update(response_header_collection)
+            rate_limit_wait = rate_limit.retry_wait(
+                http_code, response_header_collection, response_body
+            )
+
+            if rate_limit_retry_count >= githubapi.RATE_LIMIT_RETRY_MAX:
+                rate_limit_wait = None
+
+            # server error - retry idempotent requests after backoff
+            retry_wait: float | None = None
+            if (
+                (http_code in githubapi.REQUEST_RETRY_HTTP_CODE_SET)
+                and retryable
+                and (retry_count < self._retry_max)
+            ):
+                retry_wait = githubapi._request_retry_wait(
+                    retry_count, response_header_collection
+                )
+
+            githubapi._request_hook_call(
+                self.request_hook_list,
+                method,
+                endpoint or api_path,
+                http_code,
+                latency,
+                response_header_collection,
+                response_bytes,
+                rate_limit_wait if (rate_limit_wait is not None) else retry_wait,
+                auth_token=request_auth_token,
+            )
+
+            if rate_limit_wait is not None:
+                # wait for rate limit held by scheduler before next request
+                rate_limit_retry_count += 1
+                continue
+
+            if retry_wait is not None:
+                retry_count += 1
+                self.retry_count += 1
+                await asyncio.sleep(retry_wait)
+                continue
+
+            location = response_header_collection.get("Location")
+            if (
+                (http_code in (301, 302, 307, 308))
+                and (method == "GET")
+                and (location is not None)
+                and (redirect_count < githubapi.REQUEST_REDIRECT_MAX)
+            ):
+                location_part = urllib.parse.urlsplit(location)
+                if location_part.netloc in ("", self._host):
+                    request_path = location_part.path + (
+                        f"?{location_part.query}" if (location_part.query) else ""
+                    )
+
+                    redirect_count += 1
+                    continue
+
+            if (http_code == 304) and (cache_entry is not None):
+                # not modified - serve cached response, which isn't counted against rate limit
+                http_code = 200
+                response_body = cache_entry.body
+                if (cache_entry.link is not None) and (
+                    "Link" not in response_header_collection
+                ):
+                    response_header_collection["Link"] = cache_entry.link
+
+            elif (
+                (http_code == 200)
+                and (self._response_cache is not None)
+                and (method == "GET")
+                and ("ETag" in response_header_collection)
+            ):
+                self._response_cache.set(
+                    request_auth_token,
+                    request_path,
+                    response_header_collection["ETag"],
+                    response_header_collection.get("Link"),
+                    response_body,
+                )
+
+            break
+
+        if http_code >= 300:
+            # raise as API error
+            raise githubapi.APIRequestError(http_code, str(response_body))
+
+        # parse JSON response (if any) and return
+        return githubapi.APIResponse(
+            http_code,
+            response_header_collection,
+            json.loads(response_body) if (response_body) else None,
+        )
+
+    async def _send(
+        self,
+        method: str,
+        request_path: str,
+        header_collection: dict[str, str],
+        data_send: bytes | None,
+        resend: bool = True,
+    ) -> tuple[int, http.client.HTTPMessage, bytes]:
+        # resend only where safe to repeat - request may have been received before connection closed
+        # build HTTP/1.1 request
+        header_collection = header_collection | {
+            "Content-Length": str(len(data_send or b""))
+        }
+        request_data = (
+            f"{method} {request_path} HTTP/1.1\r\n"
+            + "".join(f"{key}: {value}\r\n" for key, value in header_collection.items())
+            + "\r\n"
+        ).encode("latin-1") + (data_send or b"")
+
+        while True:
+            # reuse an idle connection from the pool, otherwise open a new connection
+            connection_reused = bool(self._connection_pool)
+            if connection_reused:
+                connection = self._connection_pool.pop()
+            else:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(
+                        self._hostname,
+                        self._port,
+                        ssl=self._ssl_context,
+                    ),
+                    self._timeout,
+                )
+
+                connection = _Connection(reader, writer)
+
+            try:
+                connection.writer.write(request_data)
+                await connection.writer.drain()
+
+                http_code, response_header_collection, response_body, will_close = (
+                    await asyncio.wait_for(
+                        self._read_response(connection.reader, method),
+                        self._timeout,
+                    )
+                )
+
+            except (
+                asyncio.IncompleteReadError,
+                BrokenPipeError,
+                ConnectionResetError,
+            ):
+                # keep-alive connection closed by remote end whilst idle - retry with new connection
+                connection.close()
+                if connection_reused and resend:
+                    continue
+
+                raise
+
+            except BaseException:
+                connection.close()
+                raise
+
+            break
+
+        # return connection to pool, unless closed by remote end or pool is full
+        if will_close or (len(self._connection_pool) >= self._pool_size):
+            connection.close()
+        else:
+            self._connection_pool.append(connection)
+
+        return http_code, response_header_collection, response_body
+
+    async def _read_response(
+        self, reader: asyncio.StreamReader, method: str
+    ) -> tuple[int, http.client.HTTPMessage, bytes, bool]:
+        # status line, e.g. "HTTP/1.1 200 OK"
+        status_line = await reader.readline()
+        if not status_line:
+            raise asyncio.IncompleteReadError(status_line, None)
+
+        http_code = int(status_line.split(b" ", 2)[1])
+
+        # headers, up to blank line
+        header_line_list: list[bytes] = []
+        while True:
+            header_line = await reader.readline()
+            if header_line in (b"\r\n", b"\n", b""):
+                break
+
+            header_line_list.append(header_line)
+
+        response_header_collection = email.parser.Parser(
+            _class=http.client.HTTPMessage
+        ).parsestr(b"".join(header_line_list).decode("latin-1"))
+
+        will_close = response_header_collection.get("Connection", "").lower() == "close"
+
+        # body - empty, chunked, content length or read until connection closed
+        response_body = b""
+        if (method == "HEAD") or (http_code in (204, 304)) or (http_code < 200):
+            pass
+
+        elif (
+            response_header_collection.get("Transfer-Encoding", "").lower() == "chunked"
+        ):
+            chunk_list: list[bytes] = []
+            while True:
+                chunk_size = int((await reader.readline()).split(b";")[0], 16)
+                if chunk_size == 0:
+                    # skip trailer headers
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+
+                    break
+
+                chunk_list.append(await reader.readexactly(chunk_size))
+                await reader.readexactly(2)
+
+            response_body = b"".join(chunk_list)
+
+        elif "Content-Length" in response_header_collection:
+            response_body = await reader.readexactly(
+                int(response_header_collection["Content-Length"])
+            )
+
+        else:
+            response_body = await reader.read()
+            will_close = True
+
+        return http_code, response_header_collection, response_body, will_close
+
+
+_default_client: AsyncGitHubClient | None = None
+
+
+def client() -> AsyncGitHubClient:
+    # return shared client, created on first use
+    global _default_client
+
+    if _default_client is None:
+        _default_client = AsyncGitHubClient()
+
+    return _default_client
+
+
+def set_client(github_client: AsyncGitHubClient) -> None:
+    global _default_client
+
+    if _default_client is not None:
+        _default_client.close()
+
+    _default_client = github_client
+
+
+async def _request(
+    auth_token: str | None,
+    api_path: str,
+    method: str | None = None,
+    parameter_collection: dict[str, Any] = {},
+    endpoint: str | None = None,
+    token_pool: bool = False,
+) -> Any:
+    return await client().request(
+        auth_token,
+        api_path,
+        method,
+        parameter_collection,
+        endpoint=endpoint,
+        token_pool=token_pool,
+    )
+
+
+async def _request_paged(
+    auth_token: str,
+    api_path: str,
+    parameter_collection: dict[str, bool | str] = {},
+    item_processor: Callable[[list[Any]], Iterable[Any]] = list,
+    page_size: int = githubapi.REQUEST_PAGE_SIZE,
+    endpoint: str | None = None,
+    page_cursor: str | None = None,
+    page_complete: githubapi.PageComplete | None = None,
+    token_pool: bool = False,
+) -> AsyncGenerator[Any]:
+    github_client = client()
+    if token_pool:
+        # pooled listing - pages requested with token selected for listing
+        with github_client.listing_auth_token(
+            auth_token, api_path
+        ) as listing_auth_token:
+            async for item in _request_paged(
+                listing_auth_token,
+                api_path,
+                parameter_collection,
+                item_processor,
+                page_size,
+                endpoint,
+                page_cursor,
+                page_complete,
+            ):
+                yield item
+
+        return
+
+    async def request_page(page: int) -> tuple[int, list[Any]]:
+        # build paging parameters - merged with base request parameters
+        parameter_paged_collection = parameter_collection.copy()
+        parameter_paged_collection.update(page=str(page), per_page=str(page_size))
+
+        response = await github_client.request_response(
+            auth_token,
+            api_path,
+            parameter_collection=parameter_paged_collection,
+            endpoint=endpoint,
+        )
+
+        # process page items as received, decoded response then dropped
+        return (
+            githubapi._link_last_page(response.header_collection),
+            list(item_processor(response.data)),
+        )
+
+    def page_processed(page: int, page_last: int) -> None:
+        # items of page consumed by caller - report cursor of the next page, None when all pages processed
+        if page_complete is not None:
+            page_complete(str(page + 1) if (page < page_last) else None)
+
+    # request first page (or page to resume from) - response Link header will give the final page number
+    page_start = int(page_cursor) if (page_cursor) else 1
+    page_last, item_list = await request_page(page_start)
+    page_last = max(page_start, page_last)
+
+    for item in item_list:
+        yield item
+
+    del item_list
+    page_processed(page_start, page_last)
+
+    # request remaining pages concurrently, with a bounded window of requests in flight
+    # results are yielded in page order
+    task_queue: collections.deque[asyncio.Task[tuple[int, list[Any]]]] = (
+        collections.deque()
+    )
+
+    try:
+        page = page_start
+        page_next = page_start + 1
+        while task_queue or (page_next <= page_last):
+            while (page_next <= page_last) and (
+                len(task_queue) < githubapi.REQUEST_PAGE_WORKER_COUNT * 2
+            ):
+                task_queue.append(asyncio.create_task(request_page(page_next)))
+                page_next += 1
+
+            _, item_list = await task_queue.popleft()
+            for item in item_list:
+                yield item
+
+            del item_list
+
+            page += 1
+            page_processed(page, page_last)
+
+    finally:
+        for task in task_queue:
+            task.cancel()
+
+
+def _urlquote(value: str) -> str:
+    return urllib.parse.quote(value)
+
+
+# info: https://docs.github.com/en/rest/repos/repos#list-repositories-for-the-authenticated-user
+def user_repository_list(
+    auth_token: str, repository_type: str
+) -> AsyncGenerator[githubapi.Repository]:
+    return _request_paged(
+        auth_token,
+        "user/repos",
+        parameter_collection={"type": repository_type},
+        item_processor=githubapi.repository_item_list,
+    )
+
+
+# info: https://docs.github.com/en/rest/repos/repos#list-organization-repositories
+def organization_repository_list(
+    auth_token: str,
+    organization_name: str,
+    repository_type: str,
+    page_cursor: str | None = None,
+    page_complete: githubapi.PageComplete | None = None,
+) -> AsyncGenerator[githubapi.Repository]:
+    return _request_paged(
+        auth_token,
+        f"orgs/{_urlquote(organization_name)}/repos",
+        parameter_collection={"type": repository_type},
+        item_processor=githubapi.repository_item_list,
+        endpoint="orgs/{org}/repos",
+        page_cursor=page_cursor,
+        page_complete=page_complete,
+        token_pool=True,
+    )
+
+
+# info: https://docs.github.com/en/rest/repos/repos#update-a-repository
+async def update_repository_properties(
+    auth_token: str,
+    owner: str,
+    repository: str,
+    default_branch: str | None = None,
+    description: str | None = None,
+    homepage: str | None = None,
+    issues: str | None = None,
+    private: str | None = None,
+    projects: bool | None = None,
+    wiki: bool | None = None,
+) -> Any:
+    # build up request collection from given arguments
+    patch_collection: dict[str, bool | str] = {"name": repository}
+
+    def add_property(param: bool | str | None, key: str):
+        if param is not None:
+            patch_collection[key] = param
+
+    add_property(default_branch, "default_branch")
+    add_property(description, "description")
+    add_property(homepage, "homepage")
+    add_property(issues, "has_issues")
+    add_property(private, "private")
+    add_property(projects, "has_projects")
+    add_property(wiki, "has_wiki")
+
+    # update repository
+    return await _request(
+        auth_token,
+        f"repos/{_urlquote(owner)}/{_urlquote(repository)}",
+        method="PATCH",
+        parameter_collection=patch_collection,
+        endpoint="repos/{owner}/{repo}",
+    )
+
+
+# info: https://docs.github.com/en/rest/activity/watching#list-repositories-watched-by-the-authenticated-user
+def user_subscription_list(auth_token: str) -> AsyncGenerator[githubapi.Repository]:
+    return _request_paged(
+        auth_token, "user/subscriptions", item_processor=githubapi.repository_item_list
+    )
+
+
+# info: https://docs.github.com/en/rest/activity/watching#get-a-repository-subscription
+async def repository_subscription(auth_token: str, owner: str, repository: str) -> Any:
+    return await _request(
+        auth_token,
+        f"repos/{_urlquote(owner)}/{_urlquote(repository)}/subscription",
+        endpoint="repos/{owner}/{repo}/subscription",
+    )
+
+
+# info: https://docs.github.com/en/rest/activity/watching#set-a-repository-subscription
+async def set_user_repository_subscription(
+    auth_token: str,
+    owner: str,
+    repository: str,
+    subscribed: bool = False,
+    ignored: bool = False,
+) -> Any:
+    return await _request(
+        auth_token,
+        f"repos/{_urlquote(owner)}/{_urlquote(repository)}/subscription",
+        method="PUT",
+        parameter_collection={"subscribed": subscribed, "ignored": ignored},
+        endpoint="repos/{owner}/{repo}/subscription",
+    )
+
+
+# info: https://docs.github.com/en/rest/webhooks/repos#list-repository-webhooks
+async def repository_webhook_list(
+    auth_token: str, owner: str, repository: str
+) -> list[dict[str, Any]]:
+    return await _request(
+        auth_token,
+        f"repos/{_urlquote(owner)}/{_urlquote(repository)}/hooks",
+        endpoint="repos/{owner}/{repo}/hooks",
+        token_pool=True,
+    )
@@ -0,0 +1,218 @@
+import json
+import os
+import threading
+import time
+from collections.abc import AsyncGenerator, AsyncIterable, Callable, Generator, Iterable
+from typing import Any
+
+from lib import fileutil, githubapi
+
+CHECKPOINT_VERSION = 2
+CHECKPOINT_SAVE_INTERVAL = 5
+MUTATED_RESULT_NAME = "mutated"
+
+
+class Checkpoint:
+    def __init__(
+        self,
+        file_path: str,
+        run_key: str,
+        save_interval: float = CHECKPOINT_SAVE_INTERVAL,
+    ):
+        # run key identifies script/arguments - a checkpoint of a different run is ignored
+        self.file_path = file_path
+        self._run_key = run_key
+        self._save_interval = save_interval
+        self._lock = threading.Lock()
+        self._save_time = 0.0
+        self._changed = False
+        self._removed = False
+
+        # paging cursor/results of each listing, keyed results of each completed unit of work
+        self._listing_collection: dict[str, dict[str, Any]] = {}
+        self._result_collection: dict[str, dict[str, Any]] = {}
+        self.resumed = self._load()
+
+    def __enter__(self) -> "Checkpoint":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        if exc_type is None:
+            # run complete - next run starts afresh
+            self.remove()
+        else:
+            self.save(force=True)
+
+    def listing_cursor(self, name: str) -> str | None:
+        return self._listing_collection.get(name, {}).get("cursor")
+
+    def listing_done(self, name: str) -> bool:
+        return self._listing_collection.get(name, {}).get("done", False)
+
+    def listing_result(self, name: str) -> Any:
+        return self._listing_collection.get(name, {}).get("result")
+
+    def listing_page_complete(
+        self, name: str, result: Callable[[], Any]
+    ) -> Callable[[str | None], None]:
+        # page complete function for a paged listing - records cursor of the next page and
+        # results of all pages so far, a cursor of None marks the listing as complete
+        def page_complete(cursor: str | None) -> None:
+            with self._lock:
+                self._listing_collection[name] = {
+                    "cursor": cursor,
+                    "done": cursor is None,
+                    "result": result(),
+                }
+                self._changed = True
+
+            self.save()
+
+        return page_complete
+
+    def result_collection(self, name: str) -> dict[str, Any]:
+        with self._lock:
+            return dict(self._result_collection.get(name, {}))
+
+    def result_set(self, name: str, key: str, value: Any) -> None:
+        with self._lock:
+            self._result_collection.setdefault(name, {})[key] = value
+            self._changed = True
+
+        self.save()
+
+    def mutated_set(self, description: str) -> set[str]:
+        # repositories successfully mutated by previous runs, for each kind of change
+        return set(self.result_collection(f"{MUTATED_RESULT_NAME}/{description}"))
+
+    def mutated(self, description: str, repository_name: str) -> None:
+        self.result_set(f"{MUTATED_RESULT_NAME}/{description}", repository_name, True)
+
+    def save(self, force: bool = False) -> None:
+        with self._lock:
+            # write no more than once every save interval, unless forced
+            if (
+                self._removed
+                or (not self._changed)
+                or (
+                    (not force)
+                    and ((time.monotonic() - self._save_time) < self._save_interval)
+                )
+            ):
+                return
+
+            content = json.dumps(
+                {
+                    "version": CHECKPOINT_VERSION,
+                    "run": self._run_key,
+                    "listing": self._listing_collection,
+                    "result": self._result_collection,
+                },
+                separators=(",", ":"),
+            )
+
+            fileutil.atomic_write(self.file_path, content)
+            self._save_time = time.monotonic()
+            self._changed = False
+
+    def remove(self) -> None:
+        with self._lock:
+            self._removed = True
+
+            try:
+                os.unlink(self.file_path)
+            except FileNotFoundError:
+                pass
+
+    def _load(self) -> bool:
+        try:
+            fp = open(self.file_path, "rb")
+            checkpoint_data = json.load(fp)
+            fp.close()
+        except (FileNotFoundError, ValueError):
+            return False
+
+        if (checkpoint_data.get("version") != CHECKPOINT_VERSION) or (
+            checkpoint_data.get("run") != self._run_key
+        ):
+            # checkpoint of a different run - ignore
+            return False
+
+        self._listing_collection = checkpoint_data["listing"]
+        self._result_collection = checkpoint_data["result"]
+
+        return True
+
+
+class _Listing:
+    def __init__(self, run_checkpoint: Checkpoint, name: str, item_key_list: list[str]):
+        # repositories of listing pages completed by the run being resumed
+        self.restore_item_list = [
+            githubapi.Repository(**item)
+            for item in (run_checkpoint.listing_result(name) or [])
+        ]
+
+        self.done = run_checkpoint.listing_done(name)
+        self.cursor = run_checkpoint.listing_cursor(name)
+
+        # repositories recorded with just the fields used by caller, results of all pages saved with each page cursor
+        self._item_list = [
+            {key: getattr(item, key) for key in item_key_list}
+            for item in self.restore_item_list
+        ]
+        self._item_key_list = item_key_list
+        self.page_complete = run_checkpoint.listing_page_complete(
+            name, lambda: list(self._item_list)
+        )
+
+    def record(self, item: githubapi.Repository) -> None:
+        self._item_list.append({key: getattr(item, key) for key in self._item_key_list})
+
+
+def paged_list(
+    run_checkpoint: Checkpoint | None,
+    name: str,
+    item_key_list: list[str],
+    item_list: Callable[..., Iterable[githubapi.Repository]],
+) -> Generator[githubapi.Repository]:
+    # paged list function called with cursor/page complete arguments - resumed from checkpoint, if any
+    if run_checkpoint is None:
+        yield from item_list()
+        return
+
+    listing = _Listing(run_checkpoint, name, item_key_list)
+    yield from listing.restore_item_list
+    if listing.done:
+        return
+
+    for item in item_list(
+        page_cursor=listing.cursor, page_complete=listing.page_complete
+    ):
+        listing.record(item)
+        yield item
+
+
+async def paged_list_async(
+    run_checkpoint: Checkpoint | None,
+    name: str,
+    item_key_list: list[str],
+    item_list: Callable[..., AsyncIterable[githubapi.Repository]],
+) -> AsyncGenerator[githubapi.Repository]:
+    if run_checkpoint is None:
+        async for item in item_list():
+            yield item
+
+        return
+
+    listing = _Listing(run_checkpoint, name, item_key_list)
+    for item in listing.restore_item_list:
+        yield item
+
+    if listing.done:
+        return
+
+    async for item in item_list(
+        page_cursor=listing.cursor, page_complete=listing.page_complete
+    ):
+        listing.record(item)
+        yield item
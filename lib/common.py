@@ -1,48 +1,218 @@
 import argparse
+import atexit
+import concurrent.futures
+import contextlib
+import functools
 import json
 import os
+import queue
 import re
+import sqlite3
 import sys
-from typing import Any
+import threading
+from collections.abc import Callable, Generator, Iterable
+from typing import Any, NoReturn, TypeVar
 
-from lib import githubapi
+from lib import (
+    checkpoint,
+    githubapi,
+    inventory,
+    metrics,
+    mutation,
+    plan,
+    responsecache,
+)
 
 GITHUB_AUTH_TOKEN_KEY_NAME = "AUTH_TOKEN"
+GITHUB_AUTH_TOKEN_POOL_KEY_NAME = "AUTH_TOKEN_POOL"
 GITHUB_AUTH_TOKEN_REGEXP = re.compile(
     r"^(ghp_[a-zA-Z0-9]{36}|github_pat_[a-zA-Z0-9]{22}_[a-zA-Z0-9]{59})$"
 )
 
+DEFAULT_CONCURRENCY = 8
 REPOSITORY_FILTER_REGEXP = re.compile(r"^[*/A-Za-z0-9_.-]+$")
+ORGANIZATION_NAME_REGEXP = re.compile(r"^[A-Za-z0-9][A-Za-z0-9-]*$")
+
+# user repository types able to be narrowed to organization listings, mapped to organization repository type
+NARROW_REPOSITORY_TYPE_COLLECTION = {
+    "all": "all",
+    "member": "all",
+    "private": "private",
+    "public": "public",
+}
 MANDATORY_CONFIG_KEY_SET = {GITHUB_AUTH_TOKEN_KEY_NAME, "REPOSITORY_TYPE"}
-CONFIG_FILE = (
-    os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + "/config.json"
+CONFIG_FILE = os.environ.get(
+    "CONFIG_FILE",
+    os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + "/config.json",
 )
+API_BASE_URL = os.environ.get("API_BASE_URL", githubapi.API_BASE_URL)
+
+_request_metrics: metrics.RequestMetrics | None = None
+
+T = TypeVar("T")
 
 
-def _exit_error(message: str) -> None:
+def _exit_error(message: str) -> NoReturn:
     print(f"Error: {message}", file=sys.stderr)
     sys.exit(1)
 
 
-def github_api_exit_error(message: str, api_request_error: githubapi.APIRequestError):
-    _exit_error(f"{message} HTTP code: {api_request_error.http_code}")
+def github_api_exit_error(
+    message: str, api_request_error: githubapi.APIRequestError
+) -> NoReturn:
+    _exit_error(f"{message} {_github_api_error_detail(api_request_error)}")
 
 
-def read_arguments() -> tuple[bool, list[str], list[str]]:
+def github_api_error(message: str, api_request_error: githubapi.APIRequestError):
+    # report without exit - for long running (e.g. --watch) scripts
+    print(
+        f"Error: {message} {_github_api_error_detail(api_request_error)}",
+        file=sys.stderr,
+    )
+
+
+def _github_api_error_detail(api_request_error: githubapi.APIRequestError) -> str:
+    if isinstance(api_request_error, githubapi.GraphQLRequestError):
+        # GraphQL errors are returned with a HTTP 200 - report error messages instead
+        message_list = [
+            item.get("message", "") for item in api_request_error.error_list
+        ]
+        return f"GraphQL error: {'; '.join(message_list)}"
+
+    if isinstance(api_request_error, githubapi.ConnectionRequestError):
+        return f"Connection error: {api_request_error.response}"
+
+    return f"HTTP code: {api_request_error.http_code}"
+
+
+def argument_parser(
+    repository_filter: bool = True,
+    organization: bool = False,
+    repository_inventory: bool = False,
+    change_plan: bool = False,
+) -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser()
 
+    if organization:
+        parser.add_argument(
+            "--organization",
+            help="organizations to scan, space or comma separated - overrides ORGANIZATION config",
+            nargs="+",
+        )
+
+    if repository_filter:
+        parser.add_argument(
+            "--commit", action="store_true", help="apply changes, otherwise dry run"
+        )
+
+        parser.add_argument(
+            "--include",
+            help="repository include filter - defaults to '*'",
+            nargs="*",
+        )
+
+        parser.add_argument("--exclude", help="repository exclude filter", nargs="*")
+
+    if change_plan:
+        parser.add_argument(
+            "--plan-out",
+            help="write planned changes to file for a later --apply, instead of a dry run",
+        )
+
+        parser.add_argument(
+            "--apply",
+            help="apply changes planned by --plan-out from file, without listing repositories",
+        )
+
+        parser.add_argument(
+            "--plan-check-age",
+            default=plan.DEFAULT_PLAN_CHECK_AGE,
+            help="seconds after which --apply checks each repository remains as planned - "
+            + f"defaults to {plan.DEFAULT_PLAN_CHECK_AGE}",
+            type=int,
+        )
+
+    parser.add_argument(
+        "--concurrency",
+        default=DEFAULT_CONCURRENCY,
+        help=f"maximum concurrent API requests - defaults to {DEFAULT_CONCURRENCY}",
+        type=int,
+    )
+
+    parser.add_argument(
+        "--graphql",
+        action="store_true",
+        help="fetch repository lists via the GraphQL API",
+    )
+
     parser.add_argument(
-        "--commit", action="store_true", help="apply changes, otherwise dry run"
+        "--max-requests",
+        help="maximum API requests made by the run - defaults to unlimited",
+        type=int,
     )
 
     parser.add_argument(
-        "--include",
-        help="repository include filter - defaults to '*'",
-        nargs="*",
+        "--retry-max",
+        default=githubapi.REQUEST_RETRY_MAX,
+        help=f"retries of idempotent requests failing with a server or connection error - defaults to {githubapi.REQUEST_RETRY_MAX}",
+        type=int,
     )
 
-    parser.add_argument("--exclude", help="repository exclude filter", nargs="*")
+    parser.add_argument(
+        "--no-pacing",
+        action="store_true",
+        help="disable request pacing used to avoid secondary rate limits",
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="disable conditional request cache of API responses",
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        default=responsecache.DEFAULT_CACHE_DIR,
+        help=f"API response cache directory - defaults to '{responsecache.DEFAULT_CACHE_DIR}'",
+    )
 
+    if repository_inventory:
+        parser.add_argument(
+            "--inventory",
+            action="store_true",
+            help="answer from local repository inventory under --cache-dir, listing repositories again once stale",
+        )
+
+        parser.add_argument(
+            "--inventory-ttl",
+            default=inventory.DEFAULT_INVENTORY_TTL,
+            help=f"seconds before inventory is stale - defaults to {inventory.DEFAULT_INVENTORY_TTL}",
+            type=int,
+        )
+
+    parser.add_argument(
+        "--checkpoint",
+        help="save progress to file, a later run given the same file resumes from where stopped",
+    )
+
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="print API request statistics to stderr on exit",
+    )
+
+    parser.add_argument("--stats-file", help="write API request statistics to file")
+    parser.add_argument(
+        "--stats-format",
+        choices=[metrics.STATS_FORMAT_JSON, metrics.STATS_FORMAT_PROMETHEUS],
+        default=metrics.STATS_FORMAT_JSON,
+        help=f"format of --stats-file - defaults to '{metrics.STATS_FORMAT_JSON}'",
+    )
+
+    return parser
+
+
+def parse_arguments(parser: argparse.ArgumentParser) -> argparse.Namespace:
     arg_list = parser.parse_args()
 
     # validate repository include/exclude filters
@@ -56,14 +226,698 @@ def read_arguments() -> tuple[bool, list[str], list[str]]:
                 # invalid filter characters
                 _exit_error(f"Invalid {filter_type} filter of [{filter_item}]")
 
-    validate_filter_list("include", arg_list.include)
-    validate_filter_list("exclude", arg_list.exclude)
+    if hasattr(arg_list, "include"):
+        validate_filter_list("include", arg_list.include)
+        validate_filter_list("exclude", arg_list.exclude)
+
+        arg_list.include = [] if (arg_list.include is None) else arg_list.include
+        arg_list.exclude = [] if (arg_list.exclude is None) else arg_list.exclude
+
+    if arg_list.concurrency < 1:
+        _exit_error(f"Invalid concurrency of [{arg_list.concurrency}]")
+
+    if (arg_list.max_requests is not None) and (arg_list.max_requests < 1):
+        _exit_error(f"Invalid maximum requests of [{arg_list.max_requests}]")
+
+    if arg_list.retry_max < 0:
+        _exit_error(f"Invalid retry maximum of [{arg_list.retry_max}]")
+
+    if hasattr(arg_list, "inventory_ttl") and (arg_list.inventory_ttl < 0):
+        _exit_error(f"Invalid inventory TTL of [{arg_list.inventory_ttl}]")
+
+    if getattr(arg_list, "plan_out", None) is not None:
+        if arg_list.commit:
+            _exit_error("Unable to write a plan with --commit")
+
+        if arg_list.apply is not None:
+            _exit_error("Unable to write a plan with --apply")
+
+    if hasattr(arg_list, "plan_check_age") and (arg_list.plan_check_age < 0):
+        _exit_error(f"Invalid plan check age of [{arg_list.plan_check_age}]")
+
+    # record every API request, reporting statistics once the run exits
+    global _request_metrics
+    if arg_list.stats or (arg_list.stats_file is not None):
+        _request_metrics = metrics.RequestMetrics()
+        atexit.register(
+            _request_metrics_report,
+            _request_metrics,
+            arg_list.stats,
+            arg_list.stats_file,
+            arg_list.stats_format,
+        )
+
+    # size API client connection pool to hold a connection for each concurrent request
+    githubapi.set_client(
+        githubapi.GitHubClient(
+            base_url=API_BASE_URL,
+            pool_size=arg_list.concurrency + githubapi.REQUEST_PAGE_WORKER_COUNT,
+            page_concurrency=arg_list.concurrency,
+            max_requests=arg_list.max_requests,
+            pacing=not arg_list.no_pacing,
+            request_hook_list=request_hook_list(),
+            retry_max=arg_list.retry_max,
+            response_cache=(
+                None
+                if (arg_list.no_cache)
+                else responsecache.ResponseCache(arg_list.cache_dir)
+            ),
+        )
+    )
+
+    return arg_list
+
+
+def organization_list(organization_value_list: list[str]) -> list[str]:
+    # split comma separated organization names, dropping duplicates
+    name_list: list[str] = []
+    for organization_value in organization_value_list:
+        for organization_name in organization_value.split(","):
+            organization_name = organization_name.strip()
+            if not ORGANIZATION_NAME_REGEXP.search(organization_name):
+                _exit_error(f"Invalid organization of [{organization_name}]")
+
+            if organization_name not in name_list:
+                name_list.append(organization_name)
+
+    return name_list
+
+
+def organization_item_list(
+    organization_list: list[str],
+    item_list: Callable[[str], Iterable[T]],
+    concurrency: int,
+) -> Generator[tuple[str, T]]:
+    if len(organization_list) == 1:
+        # single organization - no threads required
+        for item in item_list(organization_list[0]):
+            yield (organization_list[0], item)
+
+        return
+
+    # list organizations concurrently, items yielded as received from each
+    # page requests of all listings bounded by API client page concurrency
+    item_queue: queue.Queue[tuple[str, Any, BaseException | None]] = queue.Queue()
+    listing_stop = threading.Event()
+
+    def list_organization(organization_name: str) -> None:
+        try:
+            for item in item_list(organization_name):
+                if listing_stop.is_set():
+                    # another listing failed (or consumer stopped) - abandon listing
+                    return
+
+                item_queue.put((organization_name, item, None))
+
+            item_queue.put((organization_name, None, None))
+
+        except BaseException as err:
+            # includes exit of a failed listing - raised again by consumer
+            item_queue.put((organization_name, None, err))
+
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(len(organization_list), concurrency)
+    )
+
+    try:
+        for organization_name in organization_list:
+            executor.submit(list_organization, organization_name)
+
+        active_count = len(organization_list)
+        while active_count > 0:
+            organization_name, item, err = item_queue.get()
+            if err is not None:
+                raise err
+
+            if item is None:
+                # organization listing complete
+                active_count -= 1
+                continue
+
+            yield (organization_name, item)
+
+    finally:
+        # error reported without waiting for listings in progress, which stop at their next item
+        listing_stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def checkpoint_open(
+    arg_list: argparse.Namespace, *key_list: str
+) -> contextlib.AbstractContextManager[checkpoint.Checkpoint | None]:
+    if arg_list.checkpoint is None:
+        # no checkpoint
+        return contextlib.nullcontext()
+
+    # checkpoint applies to a run of the same script, config and filter/request arguments
+    run_checkpoint = checkpoint.Checkpoint(
+        arg_list.checkpoint,
+        json.dumps(
+            [
+                os.path.basename(sys.argv[0]),
+                list(key_list),
+                getattr(arg_list, "include", None),
+                getattr(arg_list, "exclude", None),
+                getattr(arg_list, "apply", None),
+                arg_list.graphql,
+            ]
+        ),
+    )
+
+    if run_checkpoint.resumed:
+        print(f"Resuming from checkpoint [{arg_list.checkpoint}]", file=sys.stderr)
+
+    return run_checkpoint
+
+
+def inventory_open(
+    arg_list: argparse.Namespace,
+) -> contextlib.AbstractContextManager[inventory.Inventory | None]:
+    if not getattr(arg_list, "inventory", False):
+        # no inventory
+        return contextlib.nullcontext()
+
+    try:
+        return inventory.Inventory(
+            inventory.inventory_path(arg_list.cache_dir), arg_list.inventory_ttl
+        )
+    except sqlite3.Error as err:
+        _exit_error(f"Unable to open repository inventory - {err}")
+
+
+def inventory_paged_list(
+    run_inventory: inventory.Inventory | None,
+    source_key: str,
+    run_checkpoint: checkpoint.Checkpoint | None,
+    name: str,
+    item_key_list: list[str],
+    item_list: Callable[..., Iterable[githubapi.Repository]],
+) -> Iterable[githubapi.Repository]:
+    if run_inventory is None:
+        return checkpoint.paged_list(run_checkpoint, name, item_key_list, item_list)
+
+    # refresh inventory from listing - checkpoint records every inventory field and those used by caller, restoring complete repositories
+    return run_inventory.refresh(
+        source_key,
+        checkpoint.paged_list(
+            run_checkpoint,
+            name,
+            inventory.REPOSITORY_KEY_LIST
+            + [
+                key for key in item_key_list if key not in inventory.REPOSITORY_KEY_LIST
+            ],
+            item_list,
+        ),
+    )
+
+
+def plan_write(
+    arg_list: argparse.Namespace, action: str, change_list: list[plan.PlanChange]
+) -> None:
+    try:
+        plan.Plan(os.path.basename(sys.argv[0]), action, change_list).write(
+            arg_list.plan_out
+        )
+    except OSError as err:
+        _exit_error(f"Unable to write plan to [{arg_list.plan_out}] - {err}")
+
+    print(f"\n\nPlanned {len(change_list)} changes, written to [{arg_list.plan_out}]")
+
+
+def plan_load(arg_list: argparse.Namespace, action: str) -> plan.Plan:
+    try:
+        change_plan = plan.Plan.load(arg_list.apply)
+    except (OSError, ValueError) as err:
+        _exit_error(f"Unable to load plan [{arg_list.apply}] - {err}")
+
+    # plan applied only by script/action writing it
+    if (change_plan.script != os.path.basename(sys.argv[0])) or (
+        change_plan.action != action
+    ):
+        _exit_error(f"Plan [{arg_list.apply}] is not a plan to {action}")
+
+    return change_plan
+
+
+def plan_repository_name_list(
+    arg_list: argparse.Namespace,
+    change_plan: plan.Plan,
+    repository_state: plan.RepositoryState,
+) -> list[str]:
+    plan_age = change_plan.age()
+    print(
+        f"Applying plan [{arg_list.apply}] of {len(change_plan.change_list)} changes, "
+        + f"created {int(plan_age)} seconds ago"
+    )
+
+    if plan_age >= arg_list.plan_check_age:
+        print("\n\nChecking repositories unchanged since planned:")
+
+    # repositories of plan - less those no longer in planned state, once plan is older than check age
+    try:
+        repository_name_list = plan.check(
+            change_plan,
+            arg_list.plan_check_age,
+            arg_list.concurrency,
+            repository_state,
+        )
+    except githubapi.APIRequestError as err:
+        github_api_exit_error("Unable to check repository state.", err)
+
+    return repository_name_list
+
+
+def repository_filter_paged_list(
+    run_checkpoint: checkpoint.Checkpoint | None,
+    name: str,
+    item_key_list: list[str],
+    auth_token: str,
+    repository_type: str,
+    repository_filter: "RepositoryFilter",
+    graphql: bool = False,
+) -> Generator[githubapi.Repository]:
+    # user repository listing, narrowed to organization listings where include filters allow
+    # repositories still to be tested by caller against filter - organization listings may return more than accepted
+    owner_list = _repository_listing_owner_list(
+        auth_token, repository_type, repository_filter
+    )
+
+    if owner_list is None:
+        yield from checkpoint.paged_list(
+            run_checkpoint,
+            name,
+            item_key_list,
+            functools.partial(
+                githubapi.user_repository_list, auth_token, repository_type, graphql
+            ),
+        )
+
+        return
+
+    for owner in owner_list:
+        yield from checkpoint.paged_list(
+            run_checkpoint,
+            f"{name}/{owner}",
+            item_key_list,
+            functools.partial(
+                githubapi.organization_repository_list,
+                auth_token,
+                owner,
+                NARROW_REPOSITORY_TYPE_COLLECTION[repository_type],
+                graphql,
+            ),
+        )
+
+
+def _repository_listing_owner_list(
+    auth_token: str,
+    repository_type: str,
+    repository_filter: "RepositoryFilter",
+) -> list[str] | None:
+    # narrowed only where an organization listing of type equals the user listing within organization
+    if repository_type not in NARROW_REPOSITORY_TYPE_COLLECTION:
+        return None
+
+    owner_list = repository_filter.literal_owner_list()
+    if not owner_list:
+        return None
+
+    for owner in owner_list:
+        # user listing holds organization repositories user has a role in - as organization owner, every repository
+        # for members, repositories accessible by base permission alone are unknown - list all user repositories
+        if not githubapi.user_organization_owner(auth_token, owner):
+            return None
+
+    return owner_list
+
+
+def request_hook_list() -> list[githubapi.RequestHook]:
+    # request hooks for API clients created by scripts
+    hook_list: list[githubapi.RequestHook] = [_request_retry_report]
+    if _request_metrics is not None:
+        hook_list.append(_request_metrics.record)
+
+    return hook_list
+
+
+def auth_token_pool_configure(config_data: dict[str, str]) -> list[str]:
+    # pool config auth tokens for read requests of API client - returned for API clients created by scripts
+    auth_token_list = config_data[GITHUB_AUTH_TOKEN_POOL_KEY_NAME].split(",")
+    auth_token_pool = auth_token_list if (len(auth_token_list) > 1) else []
+    githubapi.client().auth_token_pool = auth_token_pool
+
+    return auth_token_pool
+
+
+def _request_retry_report(request_record: githubapi.RequestRecord) -> None:
+    if request_record.retry_wait is None:
+        # no work
+        return
+
+    reason = (
+        request_record.error
+        if (request_record.http_code == 0)
+        else f"HTTP code: {request_record.http_code}"
+    )
+
+    print(
+        f"Warning: {request_record.method} {request_record.endpoint} failed ({reason}), retrying in {request_record.retry_wait:.1f}s",
+        file=sys.stderr,
+    )
+
+
+def _request_metrics_report(
+    request_metrics: metrics.RequestMetrics,
+    stats: bool,
+    stats_file: str | None,
+    stats_format: str,
+) -> None:
+    if stats:
+        print(f"\n{request_metrics.format_text()}", file=sys.stderr)
+
+    if stats_file is not None:
+        try:
+            request_metrics.write(stats_file, stats_format)
+        except OSError as err:
+            print(
+                f"Error: Unable to write statistics to [{stats_file}] - {err}",
+                file=sys.stderr,
+            )
+
+
+def apply_repository_mutation(
+    description: str,
+    repository_mutation: Callable[[str], Any],
+    repository_name_list: Iterable[str],
+    dry_run: bool,
+    concurrency: int,
+    graphql_batch: mutation.GraphQLBatch | None = None,
+    success_set: set[str] | None = None,
+    run_checkpoint: checkpoint.Checkpoint | None = None,
+    not_found_set: set[str] | None = None,
+) -> set[str]:
+    # repositories failing mutation returned - caller records successful changes ahead of mutation_failure_exit()
+    if (run_checkpoint is not None) and (not dry_run):
+        # skip repositories already mutated by the run being resumed
+        mutated_set = run_checkpoint.mutated_set(description)
+        repository_name_all_list = list(repository_name_list)
+        repository_name_list = [
+            name for name in repository_name_all_list if name not in mutated_set
+        ]
+
+        skip_count = len(repository_name_all_list) - len(repository_name_list)
+        if skip_count > 0:
+            print(f"Skipping {skip_count} repositories changed by previous run")
+
+    if dry_run:
+        # simulation only - list repositories
+        for repository_name in repository_name_list:
+            print(repository_name)
+
+        return set()
+
+    # apply mutation to repositories, reporting each result
+    success_count = 0
+    failure_set: set[str] = set()
+    result_list = (
+        mutation.apply(repository_mutation, repository_name_list, concurrency)
+        if (graphql_batch is None)
+        else graphql_batch.apply(repository_name_list, concurrency)
+    )
+
+    for result in result_list:
+        if result.error is None:
+            success_count += 1
+            print(result.repository_name)
+
+            if success_set is not None:
+                success_set.add(result.repository_name)
+
+            if run_checkpoint is not None:
+                run_checkpoint.mutated(description, result.repository_name)
+        else:
+            failure_set.add(result.repository_name)
+            print(
+                f"{result.repository_name} - Unable to {description}. {_github_api_error_detail(result.error)}"
+            )
+
+            # repository deleted/renamed or access removed since listed
+            if (not_found_set is not None) and result.error.not_found:
+                not_found_set.add(result.repository_name)
+
+    print(f"\nSucceeded: {success_count}, failed: {len(failure_set)}")
+    return failure_set
+
+
+def mutation_failure_exit(failure_collection: dict[str, set[str]]) -> None:
+    # exit once all mutations applied - failed repositories by mutation description
+    message_list = [
+        f"Unable to {description} for {len(failure_set)} repositories"
+        for description, failure_set in failure_collection.items()
+        if failure_set
+    ]
+
+    if message_list:
+        _exit_error(", ".join(message_list))
+
+
+def repository_flag_status_set(
+    auth_token: str,
+    repository_type: str,
+    repository_filter: "RepositoryFilter",
+    flag_key: str,
+    flag_label: str,
+    graphql: bool = False,
+    node_id_collection: dict[str, str] | None = None,
+    updated_at_collection: dict[str, str] | None = None,
+    run_checkpoint: checkpoint.Checkpoint | None = None,
+    run_inventory: inventory.Inventory | None = None,
+) -> set[tuple[str, bool]]:
+    # repositories and state of flag (e.g. has_wiki)
+    repository_set: set[tuple[str, bool]] = set()
+    source_key = inventory.source_key(auth_token, "user", repository_type)
+    item_key_list = ["full_name", flag_key, "node_id", "updated_at"]
+
+    repository_list: Iterable[githubapi.Repository]
+    if (run_inventory is not None) and run_inventory.fresh(source_key):
+        # listing from fresh inventory - flagged repositories alone
+        repository_list = run_inventory.repository_list(
+            [source_key], **{flag_key: True}
+        )
+    elif run_inventory is not None:
+        # full listing held by inventory, resumed from checkpoint, if any
+        repository_list = inventory_paged_list(
+            run_inventory,
+            source_key,
+            run_checkpoint,
+            "repository",
+            item_key_list,
+            functools.partial(
+                githubapi.user_repository_list, auth_token, repository_type, graphql
+            ),
+        )
+    else:
+        # listing narrowed by include filters, resumed from checkpoint, if any
+        repository_list = repository_filter_paged_list(
+            run_checkpoint,
+            "repository",
+            item_key_list,
+            auth_token,
+            repository_type,
+            repository_filter,
+            graphql,
+        )
+
+    try:
+        for repository_item in repository_list:
+            name = repository_item.full_name
+            flag = bool(getattr(repository_item, flag_key))
+
+            # include/exclude repository?
+            if not repository_filter.accept(name):
+                continue
+
+            # GraphQL mutations address repositories by node ID
+            if node_id_collection is not None:
+                node_id_collection[name] = repository_item.node_id
+
+            # last update of repository recorded by plans
+            if updated_at_collection is not None:
+                updated_at_collection[name] = repository_item.updated_at
+
+            # display name and flag state
+            print(name + (f" - {flag_label} enabled" if (flag) else ""))
+            repository_set.add((name, flag))
+
+    except githubapi.APIRequestError as err:
+        github_api_exit_error(
+            f"Unable to fetch repository list for type {repository_type}.", err
+        )
+
+    return repository_set
+
+
+def _repository_flag_state(
+    auth_token: str, flag_key: str, repository_name: str
+) -> dict[str, Any]:
+    # split repository into owner/repository parts
+    owner, repository = repository_name.split("/")
+
+    repository_item = githubapi.repository_properties(auth_token, owner, repository)
+    return {
+        flag_key: getattr(repository_item, flag_key),
+        "updated_at": repository_item.updated_at,
+    }
+
+
+def repository_flag_disable(
+    arg_list: argparse.Namespace,
+    config_data: dict[str, str],
+    flag_key: str,
+    flag_label: str,
+    flag_label_plural: str,
+    repository_disable: Callable[[str, str], Any],
+    repository_disable_mutation: Callable[[dict[str, str], str], str],
+) -> None:
+    # disable flag (e.g. has_wiki) of repositories - listed, from a plan, or written to a plan
+    # repository_disable() called with auth token/repository name, repository_disable_mutation() with node IDs/repository name
+    description = f"disable {flag_label.lower()}"
+    dry_run = not arg_list.commit
+    config_auth_token = config_data[GITHUB_AUTH_TOKEN_KEY_NAME]
+    repository_type = config_data["REPOSITORY_TYPE"]
+    repository_filter = RepositoryFilter(arg_list.include, arg_list.exclude)
+    inventory_source_key = inventory.source_key(
+        config_auth_token, "user", repository_type
+    )
+
+    # save progress to checkpoint/hold repositories in local inventory, if requested - checkpoint removed once run completes
+    with (
+        checkpoint_open(arg_list, repository_type) as run_checkpoint,
+        inventory_open(arg_list) as run_inventory,
+    ):
+        repository_node_id_collection: dict[str, str] = {}
+        if arg_list.apply is not None:
+            # repositories/node IDs from plan - applied without listing repositories
+            change_plan = plan_load(arg_list, description)
+            repository_node_id_collection = change_plan.node_id_collection()
+            flag_repository_set = set(
+                plan_repository_name_list(
+                    arg_list,
+                    change_plan,
+                    functools.partial(
+                        _repository_flag_state, config_auth_token, flag_key
+                    ),
+                )
+            )
+            dry_run = False
+
+        else:
+            # fetch repository list and flag state of the specified repository type
+            print("Building repository list:")
+            repository_updated_at_collection: dict[str, str] = {}
+            all_repository_set = repository_flag_status_set(
+                config_auth_token,
+                repository_type,
+                repository_filter,
+                flag_key,
+                flag_label,
+                arg_list.graphql,
+                repository_node_id_collection,
+                repository_updated_at_collection,
+                run_checkpoint,
+                run_inventory,
+            )
+
+            # get total count, if zero then no work - a fresh inventory returns only flagged repositories
+            repository_count = (
+                len(all_repository_set)
+                if (run_inventory is None)
+                else sum(
+                    1
+                    for name in run_inventory.repository_name_list(
+                        [inventory_source_key]
+                    )
+                    if repository_filter.accept(name)
+                )
+            )
+            if (repository_count < 1) and (arg_list.plan_out is None):
+                print("\nNo repositories for processing")
+                return
+
+            print(f"\nTotal repositories: {repository_count}")
+
+            # determine flagged repositories
+            flag_repository_set = {name for name, flag in all_repository_set if flag}
+
+            if arg_list.plan_out is not None:
+                # record flagged repositories, for a later run with --apply
+                plan_write(
+                    arg_list,
+                    description,
+                    [
+                        plan.PlanChange(
+                            name,
+                            repository_node_id_collection[name],
+                            {flag_key: True},
+                            repository_updated_at_collection[name],
+                        )
+                        for name in sorted(flag_repository_set)
+                    ],
+                )
+
+                return
+
+        if not flag_repository_set:
+            # none flagged - no work
+            print(f"\nAll {flag_label_plural} disabled")
+            return
+
+        # disable flag (only simulation if dry run mode)
+        print(
+            f"\n\nDisabling {len(flag_repository_set)} {flag_label_plural}"
+            + (" [DRY RUN]" if (dry_run) else "")
+            + ":"
+        )
+
+        success_set: set[str] = set()
+        failure_set = apply_repository_mutation(
+            description,
+            functools.partial(repository_disable, config_auth_token),
+            flag_repository_set,
+            dry_run,
+            arg_list.concurrency,
+            (
+                mutation.GraphQLBatch(
+                    config_auth_token,
+                    functools.partial(
+                        repository_disable_mutation, repository_node_id_collection
+                    ),
+                )
+                if (arg_list.graphql)
+                else None
+            ),
+            success_set=success_set,
+            run_checkpoint=run_checkpoint,
+        )
+
+        if run_inventory is not None:
+            # keep inventory in step with disabled repositories, including those of a partly failed run
+            run_inventory.repository_update(
+                [inventory_source_key], success_set, **{flag_key: False}
+            )
+
+        # exit within checkpoint - kept for a resumed run to retry failed repositories
+        mutation_failure_exit({description: failure_set})
+
+
+def read_arguments() -> tuple[bool, list[str], list[str]]:
+    arg_list = parse_arguments(argument_parser())
 
     # return arguments
     return (
         not arg_list.commit,  # 'dry run' mode?
-        [] if (arg_list.include is None) else arg_list.include,
-        [] if (arg_list.exclude is None) else arg_list.exclude,
+        arg_list.include,
+        arg_list.exclude,
     )
 
 
@@ -93,58 +947,148 @@ def load_config(config_key_addition_set: set[str] = set()) -> dict[str, str]:
                 f"Unable to locate [{config_key}] config key in [{CONFIG_FILE}]"
             )
 
+        if isinstance(config_data[config_key], list):
+            # list of values (e.g. organizations, auth tokens) - held comma separated
+            config_data[config_key] = ",".join(
+                str(item).strip() for item in config_data[config_key]
+            )
+
         # ensure value is not empty
         if not config_data[config_key].strip():
             _exit_error(f"Config key [{config_key}] is empty")
 
-    # validate auth token format
+    # validate auth token format - multiple tokens given comma separated
     if env_auth_token is not None:
         config_data[GITHUB_AUTH_TOKEN_KEY_NAME] = env_auth_token
 
-    if not GITHUB_AUTH_TOKEN_REGEXP.search(config_data[GITHUB_AUTH_TOKEN_KEY_NAME]):
-        _exit_error(
-            "Invalid GitHub authorization token specified in config or environment variable"
-        )
+    auth_token_list: list[str] = []
+    for auth_token in config_data[GITHUB_AUTH_TOKEN_KEY_NAME].split(","):
+        auth_token = auth_token.strip()
+        if not GITHUB_AUTH_TOKEN_REGEXP.search(auth_token):
+            _exit_error(
+                "Invalid GitHub authorization token specified in config or environment variable"
+            )
+
+        if auth_token not in auth_token_list:
+            auth_token_list.append(auth_token)
+
+    # first token used for all requests, with reads able to use any token pooled (see auth_token_pool_configure())
+    # mutations always made with the first token
+    config_data[GITHUB_AUTH_TOKEN_KEY_NAME] = auth_token_list[0]
 
     # return expected config items from config data
     return {
         str(extract_key): str(config_data[extract_key]).strip()
         for extract_key in config_key_set
-    }
+    } | {GITHUB_AUTH_TOKEN_POOL_KEY_NAME: ",".join(auth_token_list)}
+
+
+class RepositoryFilterMatcher:
+    def __init__(self, filter_list: list[str]):
+        self.filter_list = filter_list
+
+        # filters without a wildcard matched by set lookup
+        self._literal_set = {item for item in filter_list if "*" not in item}
+
+        # index wildcard filters by literal prefix, or literal suffix where no prefix
+        # a name is then only tested against filters it could possibly match
+        prefix_collection: dict[str, list[str]] = {}
+        suffix_collection: dict[str, list[str]] = {}
+        any_list: list[str] = []
+        for filter_item in filter_list:
+            if "*" not in filter_item:
+                continue
+
+            prefix = filter_item.split("*")[0]
+            suffix = filter_item.split("*")[-1]
+            if prefix:
+                prefix_collection.setdefault(prefix, []).append(filter_item)
+            elif suffix:
+                suffix_collection.setdefault(suffix, []).append(filter_item)
+            else:
+                any_list.append(filter_item)
+
+        self._prefix_regexp_collection = {
+            key: RepositoryFilterMatcher._build(value)
+            for key, value in prefix_collection.items()
+        }
+
+        self._suffix_regexp_collection = {
+            key: RepositoryFilterMatcher._build(value)
+            for key, value in suffix_collection.items()
+        }
+
+        self._prefix_length_list = sorted({len(key) for key in prefix_collection})
+        self._suffix_length_list = sorted({len(key) for key in suffix_collection})
+        self._any_regexp = (
+            RepositoryFilterMatcher._build(any_list) if (any_list) else None
+        )
+
+    def __len__(self) -> int:
+        return len(self.filter_list)
+
+    def literal_owner_list(self) -> list[str] | None:
+        # owners of filters, sorted - None where the owner of any filter isn't literal
+        owner_set: set[str] = set()
+        for filter_item in self.filter_list:
+            owner, separator, _ = filter_item.partition("/")
+            if (not separator) or ("*" in owner):
+                return None
+
+            owner_set.add(owner)
+
+        return sorted(owner_set)
+
+    def match(self, name: str) -> bool:
+        if name in self._literal_set:
+            # matched
+            return True
+
+        for length in self._prefix_length_list:
+            regexp = self._prefix_regexp_collection.get(name[:length])
+            if (regexp is not None) and regexp.search(name):
+                return True
+
+        for length in self._suffix_length_list:
+            regexp = self._suffix_regexp_collection.get(name[-length:])
+            if (regexp is not None) and regexp.search(name):
+                return True
+
+        # no match
+        return (self._any_regexp is not None) and bool(self._any_regexp.search(name))
+
+    @staticmethod
+    def _build(filter_list: list[str]) -> re.Pattern:
+        # combine filters into a single alternation regular expression
+        # escape meta characters, set wildcard/start/end metas
+        re_filter = "|".join(
+            re.escape(item).replace("\\*", ".+?") for item in filter_list
+        )
+
+        return re.compile(f"^(?:{re_filter})$")
 
 
 class RepositoryFilter:
     def __init__(self, include_list: list[str], exclude_list: list[str]):
-        # convert include/exclude filters to regular expressions
-        self.include_list = RepositoryFilter._build(self, include_list)
-        self.exclude_list = RepositoryFilter._build(self, exclude_list)
+        # compile include/exclude filters into single pass matchers
+        self.include = RepositoryFilterMatcher(include_list)
+        self.exclude = RepositoryFilterMatcher(exclude_list)
 
     def accept(self, name: str) -> bool:
         # if exclude match - reject
-        if RepositoryFilter._is_match(self, self.exclude_list, name):
+        if self.exclude.match(name):
             return False
 
         # if include match - accept
-        if len(self.include_list) < 1:
+        if len(self.include) < 1:
             # if no include filters defined then always accept by default
             return True
 
-        return RepositoryFilter._is_match(self, self.include_list, name)
-
-    def _build(self, source_list: list[str]) -> list[re.Pattern]:
-        build_list: list[re.Pattern] = []
-        for filter_item in source_list:
-            # escape meta characters, set wildcard/start/end metas
-            re_filter = re.escape(filter_item).replace("\\*", ".+?")
-            build_list.append(re.compile(f"^{re_filter}$"))
+        return self.include.match(name)
 
-        return build_list
+    def literal_owner_list(self) -> list[str] | None:
+        # without include filters every repository is accepted - no owners
+        if len(self.include) < 1:
+            return None
 
-    def _is_match(self, filter_list: list[re.Pattern], name: str) -> bool:
-        for item in filter_list:
-            if item.search(name):
-                # matched
-                return True
-
-        # no match
-        return False
+        return self.include.literal_owner_list()
@@ -0,0 +1,19 @@
+import os
+import tempfile
+
+
+def atomic_write(file_path: str, data: bytes | str) -> None:
+    # write to temporary file in same directory, then move into place - readers never see a partial file
+    fd, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(file_path)), suffix=".tmp"
+    )
+
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(data if (isinstance(data, bytes)) else bytes(data, "utf-8"))
+
+        os.replace(temp_path, file_path)
+
+    except BaseException:
+        os.unlink(temp_path)
+        raise
@@ -1,16 +1,113 @@
+import collections
+import concurrent.futures
+import contextlib
+import gzip
+import http.client
 import json
-import urllib.error
+import math
+import queue
+import random
+import re
+import threading
+import time
 import urllib.parse
-import urllib.request
 from collections.abc import Generator
 from typing import Any, Callable
 
+from lib import responsecache
+
 API_BASE_URL = "https://api.github.com"
 REQUEST_ACCEPT_VERSION = "application/vnd.github+json"
 REQUEST_API_VERSION = "2022-11-28"
 REQUEST_USER_AGENT = "magnetikonline/githubutilities 1.0"
 REQUEST_DATA_CONTENT_TYPE = "application/json"
-REQUEST_PAGE_SIZE = 20
+REQUEST_PAGE_SIZE = 100
+REQUEST_PAGE_WORKER_COUNT = 4
+REQUEST_POOL_SIZE = 8
+REQUEST_REDIRECT_MAX = 5
+REQUEST_TIMEOUT = 60
+
+# retry of transient failures - exponential backoff with full jitter
+# info: https://aws.amazon.com/blogs/architecture/exponential-backoff-and-jitter/
+REQUEST_RETRY_MAX = 5
+REQUEST_RETRY_BACKOFF_BASE = 1
+REQUEST_RETRY_BACKOFF_MAX = 60
+REQUEST_RETRY_HTTP_CODE_SET = {500, 502, 503, 504}
+REQUEST_RETRY_METHOD_SET = {"GET", "PATCH", "PUT"}
+
+# transient connection failures retried - others (e.g. certificate/DNS failures, connection refused) raised at once
+REQUEST_RETRY_EXCEPTION_LIST = (
+    ConnectionResetError,
+    TimeoutError,
+    http.client.RemoteDisconnected,
+    http.client.IncompleteRead,
+)
+
+# all failures of a request without a response
+REQUEST_CONNECTION_EXCEPTION_LIST = (OSError, http.client.HTTPException)
+
+GRAPHQL_API_PATH = "graphql"
+GRAPHQL_PAGE_SIZE = 100
+GRAPHQL_MUTATION_BATCH_SIZE = 50
+GRAPHQL_MUTATION_ALIAS_PREFIX = "mutation"
+GRAPHQL_REPOSITORY_CONNECTION = """
+nodes {
+    id
+    nameWithOwner
+    url
+    diskUsage
+    hasProjectsEnabled
+    hasWikiEnabled
+    isArchived
+    isFork
+    isPrivate
+    viewerPermission
+    viewerSubscription
+    updatedAt
+}
+pageInfo {
+    endCursor
+    hasNextPage
+}
+"""
+
+# map REST API repository types to GraphQL repository connection arguments
+GRAPHQL_USER_REPOSITORY_TYPE_ARGUMENT = {
+    "all": "affiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER], ownerAffiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER]",
+    "owner": "affiliations: [OWNER], ownerAffiliations: [OWNER]",
+    "public": "privacy: PUBLIC, affiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER], ownerAffiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER]",
+    "private": "privacy: PRIVATE, affiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER], ownerAffiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER]",
+    "member": "affiliations: [COLLABORATOR, ORGANIZATION_MEMBER], ownerAffiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER]",
+}
+
+GRAPHQL_ORGANIZATION_REPOSITORY_TYPE_ARGUMENT = {
+    "all": "",
+    "public": "privacy: PUBLIC",
+    "private": "privacy: PRIVATE",
+    "forks": "isFork: true",
+    "sources": "isFork: false",
+}
+
+# map REST API repository sort/direction to GraphQL repository connection ordering
+GRAPHQL_REPOSITORY_ORDER_FIELD = {
+    "created": "CREATED_AT",
+    "full_name": "NAME",
+    "pushed": "PUSHED_AT",
+    "updated": "UPDATED_AT",
+}
+
+# request pacing - keeps clear of GitHub secondary rate limits
+# info: https://docs.github.com/en/rest/using-the-rest-api/rate-limits-for-the-rest-api
+RATE_LIMIT_REQUEST_PER_SECOND = 15
+RATE_LIMIT_REQUEST_BURST = 100
+RATE_LIMIT_MUTATION_PER_SECOND = 80 / 60
+RATE_LIMIT_MUTATION_BURST = 20
+RATE_LIMIT_RESOURCE_CORE = "core"
+RATE_LIMIT_RESOURCE_GRAPHQL = "graphql"
+RATE_LIMIT_RETRY_MAX = 5
+RATE_LIMIT_SECONDARY_WAIT = 60
+
+LINK_HEADER_LAST_REGEXP = re.compile(r'<([^>]+)>;\s*rel="last"')
 
 
 class APIRequestError(Exception):
@@ -21,63 +118,908 @@ class APIRequestError(Exception):
 
         super().__init__()
 
+    @property
+    def not_found(self) -> bool:
+        return self.http_code == 404
 
-def _request(
+
+class GraphQLRequestError(APIRequestError):
+    def __init__(self, error_list: list[dict[str, Any]]):
+        # GraphQL errors are returned with a HTTP 200 response
+        super().__init__(200, json.dumps(error_list))
+        self.error_list = error_list
+
+    @property
+    def not_found(self) -> bool:
+        # node ID unable to be resolved (e.g. repository deleted) reported as NOT_FOUND
+        return any(item.get("type") == "NOT_FOUND" for item in self.error_list)
+
+
+class ConnectionRequestError(APIRequestError):
+    def __init__(self, error: BaseException):
+        # request failed without a response (e.g. connection reset) - HTTP code of 0
+        super().__init__(0, str(error) or type(error).__name__)
+
+
+class RequestBudgetError(APIRequestError):
+    def __init__(self, max_requests: int):
+        super().__init__(429, f"Request budget of {max_requests} exhausted")
+
+
+class APIResponse:
+    def __init__(
+        self, http_code: int, header_collection: http.client.HTTPMessage, data: Any
+    ):
+        self.http_code = http_code
+        self.header_collection = header_collection
+        self.data = data
+
+
+class Repository:
+    __slots__ = (
+        "full_name",
+        "node_id",
+        "git_url",
+        "html_url",
+        "size",
+        "private",
+        "fork",
+        "archived",
+        "has_projects",
+        "has_wiki",
+        "admin",
+        "subscribed",
+        "updated_at",
+    )
+
+    def __init__(
+        self,
+        full_name: str,
+        node_id: str = "",
+        git_url: str = "",
+        html_url: str = "",
+        size: int = 0,
+        private: bool = False,
+        fork: bool = False,
+        archived: bool = False,
+        has_projects: bool = False,
+        has_wiki: bool = False,
+        admin: bool | None = None,
+        subscribed: bool | None = None,
+        updated_at: str = "",
+    ):
+        # repository fields used by scripts, projected from REST/GraphQL API items
+        # admin permission of token user and subscription state None when not reported
+        self.full_name = full_name
+        self.node_id = node_id
+        self.git_url = git_url
+        self.html_url = html_url
+        self.size = size
+        self.private = private
+        self.fork = fork
+        self.archived = archived
+        self.has_projects = has_projects
+        self.has_wiki = has_wiki
+        self.admin = admin
+        self.subscribed = subscribed
+        self.updated_at = updated_at
+
+    @property
+    def owner(self) -> str:
+        return self.full_name.split("/", 1)[0]
+
+    @property
+    def name(self) -> str:
+        return self.full_name.split("/", 1)[1]
+
+    def to_collection(self) -> dict[str, Any]:
+        return {key: getattr(self, key) for key in Repository.__slots__}
+
+
+class RequestRecord:
+    __slots__ = (
+        "method",
+        "endpoint",
+        "http_code",
+        "latency",
+        "response_bytes",
+        "rate_limit_resource",
+        "rate_limit_limit",
+        "rate_limit_remaining",
+        "rate_limit_used",
+        "retry_wait",
+        "error",
+        "auth_token_label",
+    )
+
+    def __init__(
+        self,
+        method: str,
+        endpoint: str,
+        http_code: int,
+        latency: float,
+        response_bytes: int,
+        header_collection: http.client.HTTPMessage,
+        retry_wait: float | None = None,
+        error: str | None = None,
+        auth_token_label: str | None = None,
+    ):
+        # single API request/response, as sent over the wire
+        # connection failures recorded with a HTTP code of zero and error message
+        self.method = method
+        self.endpoint = endpoint
+        self.http_code = http_code
+        self.latency = latency
+        self.response_bytes = response_bytes
+
+        # seconds until request is retried, if to be retried
+        self.retry_wait = retry_wait
+        self.error = error
+
+        # masked auth token request was sent with - token itself never recorded
+        self.auth_token_label = auth_token_label
+
+        def header_int(name: str) -> int | None:
+            value = header_collection.get(name)
+            return int(value) if (value is not None) and value.isdigit() else None
+
+        # rate limit state reported by response headers
+        self.rate_limit_resource: str | None = header_collection.get(
+            "X-RateLimit-Resource"
+        )
+        self.rate_limit_limit = header_int("X-RateLimit-Limit")
+        self.rate_limit_remaining = header_int("X-RateLimit-Remaining")
+        self.rate_limit_used = header_int("X-RateLimit-Used")
+
+
+RequestHook = Callable[[RequestRecord], None]
+
+# called once all items of a page are consumed, given the cursor of the next page
+PageComplete = Callable[[str | None], None]
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self._rate = rate
+        self._capacity = capacity
+        self._token = capacity
+        self._time = time.monotonic()
+
+    def reserve(self) -> float:
+        # refill bucket for time elapsed, then take a token
+        now = time.monotonic()
+        self._token = min(
+            self._capacity, self._token + ((now - self._time) * self._rate)
+        )
+        self._time = now
+        self._token -= 1
+
+        # return seconds to wait until the taken token would have been available
+        return 0 if (self._token >= 0) else (-self._token / self._rate)
+
+
+class RateLimitScheduler:
+    def __init__(self, pacing: bool = True):
+        self._lock = threading.Lock()
+        self._pacing = pacing
+        self._request_bucket = _TokenBucket(
+            RATE_LIMIT_REQUEST_PER_SECOND, RATE_LIMIT_REQUEST_BURST
+        )
+
+        self._mutation_bucket = _TokenBucket(
+            RATE_LIMIT_MUTATION_PER_SECOND, RATE_LIMIT_MUTATION_BURST
+        )
+
+        self._pause_until = 0.0
+        self.reserve_count = 0
+
+        # remaining request budget, as last reported by API response headers
+        self.limit: int | None = None
+        self.remaining: int | None = None
+        self.reset: int | None = None
+        self.used: int | None = None
+
+    def acquire(self, mutation: bool = False) -> None:
+        wait = self.reserve(mutation)
+        if wait > 0:
+            time.sleep(wait)
+
+    def reserve(self, mutation: bool = False) -> float:
+        # reserve a request, returning seconds to wait before it can be sent
+        with self._lock:
+            now = time.time()
+            wait = max(0.0, self._pause_until - now)
+
+            # budget exhausted - wait until the rate limit window resets
+            if (
+                (self.remaining is not None)
+                and (self.remaining <= 0)
+                and (self.reset is not None)
+            ):
+                wait = max(wait, self.reset - now + 1)
+
+            # pace requests
+            if self._pacing:
+                wait = max(wait, self._request_bucket.reserve())
+                if mutation:
+                    wait = max(wait, self._mutation_bucket.reserve())
+
+            # count request against remaining budget until response reports actual value
+            self.reserve_count += 1
+            if self.remaining is not None:
+                self.remaining -= 1
+
+        return wait
+
+    def available(self) -> float:
+        # requests available without waiting - unlimited until reported by a response
+        with self._lock:
+            if self._pause_until > time.time():
+                return -1
+
+            return math.inf if (self.remaining is None) else self.remaining
+
+    def update(self, header_collection: http.client.HTTPMessage) -> None:
+        def header_int(name: str) -> int | None:
+            value = header_collection.get(name)
+            return int(value) if (value is not None) and value.isdigit() else None
+
+        with self._lock:
+            self.limit = header_int("X-RateLimit-Limit") or self.limit
+            self.reset = header_int("X-RateLimit-Reset") or self.reset
+            self.used = header_int("X-RateLimit-Used") or self.used
+
+            remaining = header_int("X-RateLimit-Remaining")
+            if remaining is not None:
+                self.remaining = remaining
+
+    def retry_wait(
+        self,
+        http_code: int,
+        header_collection: http.client.HTTPMessage,
+        response_body: bytes,
+    ) -> float | None:
+        # determine if response is a rate limit error, returning seconds to wait before retry
+        # info: https://docs.github.com/en/rest/using-the-rest-api/troubleshooting-the-rest-api#rate-limit-errors
+        if http_code not in (403, 429):
+            return None
+
+        wait: float | None = None
+        retry_after = header_collection.get("Retry-After")
+        if (retry_after is not None) and retry_after.isdigit():
+            wait = int(retry_after)
+        elif (header_collection.get("X-RateLimit-Remaining") == "0") and (
+            self.reset is not None
+        ):
+            wait = max(0, self.reset - time.time()) + 1
+        elif b"secondary rate limit" in response_body.lower():
+            wait = RATE_LIMIT_SECONDARY_WAIT
+
+        if wait is not None:
+            # hold all further requests using this token until wait has passed
+            with self._lock:
+                self._pause_until = max(self._pause_until, time.time() + wait)
+
+        return wait
+
+
+class GitHubClient:
+    def __init__(
+        self,
+        base_url: str = API_BASE_URL,
+        pool_size: int = REQUEST_POOL_SIZE,
+        timeout: float = REQUEST_TIMEOUT,
+        max_requests: int | None = None,
+        response_cache: responsecache.ResponseCache | None = None,
+        pacing: bool = True,
+        request_hook_list: list[RequestHook] | None = None,
+        retry_max: int = REQUEST_RETRY_MAX,
+        auth_token_pool: list[str] | None = None,
+        page_concurrency: int | None = None,
+    ):
+        # split base URL into connection type, host and path prefix
+        url_part = urllib.parse.urlsplit(base_url)
+        self._connection_class: type[http.client.HTTPConnection] = (
+            http.client.HTTPSConnection
+            if (url_part.scheme == "https")
+            else http.client.HTTPConnection
+        )
+
+        self._host = url_part.netloc
+        self._path_prefix = url_part.path.rstrip("/")
+        self._timeout = timeout
+
+        # idle keep-alive connections - most recently used connection is reused first
+        self._connection_pool: queue.LifoQueue[http.client.HTTPConnection] = (
+            queue.LifoQueue(maxsize=pool_size)
+        )
+
+        # rate limit scheduler for each auth token, optional cap of total requests sent
+        self._rate_limit_collection: dict[
+            tuple[str | None, str], RateLimitScheduler
+        ] = {}
+        self._rate_limit_lock = threading.Lock()
+        self._max_requests = max_requests
+        self._pacing = pacing
+        self.request_count = 0
+
+        # retry limit for transient failures of idempotent requests
+        self._retry_max = retry_max
+        self.retry_count = 0
+
+        # conditional request cache for GET responses
+        self._response_cache = response_cache
+
+        # tokens sharing pooled read requests of the first token - mutations never pooled
+        self.auth_token_pool = list(auth_token_pool or [])
+        self._listing_token_selector = ListingTokenSelector()
+
+        # optional bound of listing page requests in flight, shared by all listings (e.g. of each organization)
+        self.page_semaphore = (
+            None
+            if (page_concurrency is None)
+            else threading.BoundedSemaphore(page_concurrency)
+        )
+
+        # functions called with a record of every request sent
+        self.request_hook_list = list(request_hook_list or [])
+
+        # headers sent with every request
+        self._header_collection = {
+            "Accept": REQUEST_ACCEPT_VERSION,
+            "Accept-Encoding": "gzip",
+            "User-Agent": REQUEST_USER_AGENT,
+            "X-GitHub-Api-Version": REQUEST_API_VERSION,
+        }
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._connection_pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def rate_limit(
+        self, auth_token: str | None, resource: str = RATE_LIMIT_RESOURCE_CORE
+    ) -> RateLimitScheduler:
+        with self._rate_limit_lock:
+            key = (auth_token, resource)
+            if key not in self._rate_limit_collection:
+                self._rate_limit_collection[key] = RateLimitScheduler(self._pacing)
+
+            return self._rate_limit_collection[key]
+
+    def listing_auth_token(
+        self, auth_token: str, api_path: str
+    ) -> contextlib.AbstractContextManager[str]:
+        return self._listing_token_selector.select(
+            self.auth_token_pool,
+            self.rate_limit,
+            auth_token,
+            _rate_limit_resource(api_path),
+        )
+
+    def request(
+        self,
+        auth_token: str | None,
+        api_path: str,
+        method: str | None = None,
+        parameter_collection: dict[str, Any] = {},
+        mutation: bool | None = None,
+        endpoint: str | None = None,
+        token_pool: bool = False,
+    ) -> Any:
+        return self.request_response(
+            auth_token,
+            api_path,
+            method,
+            parameter_collection,
+            mutation,
+            endpoint,
+            token_pool,
+        ).data
+
+    def request_response(
+        self,
+        auth_token: str | None,
+        api_path: str,
+        method: str | None = None,
+        parameter_collection: dict[str, Any] = {},
+        mutation: bool | None = None,
+        endpoint: str | None = None,
+        token_pool: bool = False,
+    ) -> APIResponse:
+        method, request_path, header_collection, data_send = _request_build(
+            self._path_prefix,
+            self._header_collection,
+            auth_token,
+            api_path,
+            method,
+            parameter_collection,
+        )
+
+        # make the request, following redirects for GET requests (e.g. renamed repositories)
+        # rate limited requests are retried after waiting for the rate limit to reset
+        resource = _rate_limit_resource(api_path)
+
+        if mutation is None:
+            # requests other than GET assumed to mutate
+            mutation = method != "GET"
+
+        retryable = _request_retryable(method, mutation)
+        rate_limit_retry_count = 0
+        retry_count = 0
+        redirect_count = 0
+        while True:
+            # pooled reads sent with the token of most remaining quota - chosen again on retry
+            request_auth_token = (
+                _auth_token_select(
+                    self.auth_token_pool, self.rate_limit, auth_token, resource
+                )
+                if (token_pool and (not mutation))
+                else auth_token
+            )
+
+            rate_limit = self.rate_limit(request_auth_token, resource)
+            self._request_count_increment()
+            rate_limit.acquire(mutation)
+
+            request_header_collection = _request_auth_header(
+                header_collection, auth_token, request_auth_token
+            )
+
+            # cached response available? make a conditional request
+            cache_entry: responsecache.CacheEntry | None = None
+            if (self._response_cache is not None) and (method == "GET"):
+                cache_entry = self._response_cache.get(request_auth_token, request_path)
+                if cache_entry is not None:
+                    request_header_collection = request_header_collection | {
+                        "If-None-Match": cache_entry.etag
+                    }
+
+            time_start = time.monotonic()
+            try:
+                http_code, response_header_collection, response_body = self._send(
+                    method,
+                    request_path,
+                    request_header_collection,
+                    data_send,
+                    retryable,
+                )
+
+            except REQUEST_RETRY_EXCEPTION_LIST as err:
+                # connection failure - retry idempotent requests after backoff, otherwise raised as API error
+                if (not retryable) or (retry_count >= self._retry_max):
+                    raise ConnectionRequestError(err) from err
+
+                connection_retry_wait = _request_retry_wait(retry_count)
+                _request_hook_call(
+                    self.request_hook_list,
+                    method,
+                    endpoint or api_path,
+                    0,
+                    time.monotonic() - time_start,
+                    http.client.HTTPMessage(),
+                    0,
+                    connection_retry_wait,
+                    str(err) or type(err).__name__,
+                    request_auth_token,
+                )
+
+                retry_count += 1
+                self._retry_count_increment()
+                time.sleep(connection_retry_wait)
+                continue
+
+            except REQUEST_CONNECTION_EXCEPTION_LIST as err:
+                # connection failure not retried (e.g. connection refused, DNS failure)
+                raise ConnectionRequestError(err) from err
+
+            latency = time.monotonic() - time_start
+            response_bytes = len(response_body)
+            response_body = _response_body_decode(
+                response_header_collection, response_body
+            )
+
+            rate_limit.update(response_header_collection)
+            rate_limit_wait = rate_limit.retry_wait(
+                http_code, response_header_collection, response_body
+            )
+
+            if rate_limit_retry_count >= RATE_LIMIT_RETRY_MAX:
+                rate_limit_wait = None
+
+            # server error - retry idempotent requests after backoff
+            retry_wait: float | None = None
+            if (
+                (http_code in REQUEST_RETRY_HTTP_CODE_SET)
+                and retryable
+                and (retry_count < self._retry_max)
+            ):
+                retry_wait = _request_retry_wait(
+                    retry_count, response_header_collection
+                )
+
+            _request_hook_call(
+                self.request_hook_list,
+                method,
+                endpoint or api_path,
+                http_code,
+                latency,
+                response_header_collection,
+                response_bytes,
+                rate_limit_wait if (rate_limit_wait is not None) else retry_wait,
+                auth_token=request_auth_token,
+            )
+
+            if rate_limit_wait is not None:
+                # wait for rate limit held by scheduler before next request
+                rate_limit_retry_count += 1
+                continue
+
+            if retry_wait is not None:
+                retry_count += 1
+                self._retry_count_increment()
+                time.sleep(retry_wait)
+                continue
+
+            location = response_header_collection.get("Location")
+            if (
+                (http_code in (301, 302, 307, 308))
+                and (method == "GET")
+                and (location is not None)
+                and (redirect_count < REQUEST_REDIRECT_MAX)
+            ):
+                location_part = urllib.parse.urlsplit(location)
+                if location_part.netloc in ("", self._host):
+                    request_path = location_part.path + (
+                        f"?{location_part.query}" if (location_part.query) else ""
+                    )
+
+                    redirect_count += 1
+                    continue
+
+            if (http_code == 304) and (cache_entry is not None):
+                # not modified - serve cached response, which isn't counted against rate limit
+                http_code = 200
+                response_body = cache_entry.body
+                if (cache_entry.link is not None) and (
+                    "Link" not in response_header_collection
+                ):
+                    response_header_collection["Link"] = cache_entry.link
+
+            elif (
+                (http_code == 200)
+                and (self._response_cache is not None)
+                and (method == "GET")
+                and ("ETag" in response_header_collection)
+            ):
+                self._response_cache.set(
+                    request_auth_token,
+                    request_path,
+                    response_header_collection["ETag"],
+                    response_header_collection.get("Link"),
+                    response_body,
+                )
+
+            break
+
+        if http_code >= 300:
+            # raise as API error
+            raise APIRequestError(http_code, str(response_body))
+
+        # parse JSON response (if any) and return
+        return APIResponse(
+            http_code,
+            response_header_collection,
+            json.loads(response_body) if (response_body) else None,
+        )
+
+    def _request_count_increment(self) -> None:
+        with self._rate_limit_lock:
+            if (self._max_requests is not None) and (
+                self.request_count >= self._max_requests
+            ):
+                raise RequestBudgetError(self._max_requests)
+
+            self.request_count += 1
+
+    def _retry_count_increment(self) -> None:
+        with self._rate_limit_lock:
+            self.retry_count += 1
+
+    def _send(
+        self,
+        method: str,
+        request_path: str,
+        header_collection: dict[str, str],
+        data_send: bytes | None,
+        resend: bool = True,
+    ) -> tuple[int, http.client.HTTPMessage, bytes]:
+        # resend only where safe to repeat - request may have been received before connection closed
+        while True:
+            # reuse an idle connection from the pool, otherwise open a new connection
+            try:
+                connection = self._connection_pool.get_nowait()
+                connection_reused = True
+            except queue.Empty:
+                connection = self._connection_class(self._host, timeout=self._timeout)
+                connection_reused = False
+
+            try:
+                connection.request(
+                    method, request_path, body=data_send, headers=header_collection
+                )
+
+                response = connection.getresponse()
+                response_body = response.read()
+
+            except (
+                BrokenPipeError,
+                ConnectionResetError,
+                http.client.RemoteDisconnected,
+            ):
+                # keep-alive connection closed by remote end whilst idle - retry with new connection
+                connection.close()
+                if connection_reused and resend:
+                    continue
+
+                raise
+
+            except Exception:
+                connection.close()
+                raise
+
+            break
+
+        # return connection to pool, unless closed by remote end or pool is full
+        if response.will_close:
+            connection.close()
+        else:
+            try:
+                self._connection_pool.put_nowait(connection)
+            except queue.Full:
+                connection.close()
+
+        return response.status, response.headers, response_body
+
+
+def _request_build(
+    path_prefix: str,
+    header_collection_base: dict[str, str],
     auth_token: str | None,
     api_path: str,
-    method: str | None = None,
-    parameter_collection: dict[str, bool | str] = {},
-) -> Any:
-    # build base request URL/headers
-    request_url = f"{API_BASE_URL}/{api_path}"
-    header_collection = {
-        "Accept": REQUEST_ACCEPT_VERSION,
-        "User-Agent": REQUEST_USER_AGENT,
-        "X-GitHub-Api-Version": REQUEST_API_VERSION,
-    }
+    method: str | None,
+    parameter_collection: dict[str, Any],
+) -> tuple[str, str, dict[str, str], bytes | None]:
+    # build base request path/headers
+    request_path = f"{path_prefix}/{api_path}"
+    header_collection = header_collection_base.copy()
 
     # API request has authorization token present?
     if auth_token is not None:
         header_collection["Authorization"] = f"Bearer {auth_token}"
 
+    data_send: bytes | None = None
     if method is None:
         # GET method
         # add request parameters as URL querystring items
+        method = "GET"
         if parameter_collection:
-            request_url = (
-                f"{request_url}?{urllib.parse.urlencode(parameter_collection)}"
+            request_path = (
+                f"{request_path}?{urllib.parse.urlencode(parameter_collection)}"
             )
 
-        request = urllib.request.Request(headers=header_collection, url=request_url)
-    else:
+    elif parameter_collection:
         # other method types (POST/PATCH/PUT/DELETE)
-        data_send = ""
-        if parameter_collection:
-            # convert parameter collection to JSON - sent as request payload
-            data_send = json.dumps(parameter_collection, separators=(",", ":"))
+        # convert parameter collection to JSON - sent as request payload
+        data_send = bytes(
+            json.dumps(parameter_collection, separators=(",", ":")), "ascii"
+        )
 
-            # set content type
-            header_collection["Content-Type"] = REQUEST_DATA_CONTENT_TYPE
+        # set content type
+        header_collection["Content-Type"] = REQUEST_DATA_CONTENT_TYPE
 
-        request = urllib.request.Request(
-            data=None if (data_send == "") else bytes(data_send, "ascii"),
-            headers=header_collection,
-            method=method,
-            url=request_url,
-        )
+    return method, request_path, header_collection, data_send
 
-    # make the request
-    try:
-        response = urllib.request.urlopen(request)
-    except urllib.error.HTTPError as err:
-        # re-raise as API error
-        raise APIRequestError(err.code, str(err.read()))  # HTTP code and error message
-    else:
-        # parse JSON response and return
-        response_data = json.load(response)
-        response.close()
 
-        return response_data
+def _request_hook_call(
+    request_hook_list: list[RequestHook],
+    method: str,
+    endpoint: str,
+    http_code: int,
+    latency: float,
+    header_collection: http.client.HTTPMessage,
+    response_bytes: int,
+    retry_wait: float | None = None,
+    error: str | None = None,
+    auth_token: str | None = None,
+) -> None:
+    if not request_hook_list:
+        # no work
+        return
+
+    request_record = RequestRecord(
+        method,
+        endpoint,
+        http_code,
+        latency,
+        response_bytes,
+        header_collection,
+        retry_wait,
+        error,
+        None if (auth_token is None) else auth_token_label(auth_token),
+    )
+
+    for request_hook in request_hook_list:
+        request_hook(request_record)
+
+
+def auth_token_label(auth_token: str) -> str:
+    # identify token in reports by final characters alone
+    return f"...{auth_token[-4:]}"
+
+
+class ListingTokenSelector:
+    def __init__(self):
+        # active listings of each pooled token
+        self._lock = threading.Lock()
+        self._listing_count_collection: dict[str, int] = {}
+
+    @contextlib.contextmanager
+    def select(
+        self,
+        auth_token_pool: list[str],
+        rate_limit: Callable[[str, str], RateLimitScheduler],
+        auth_token: str,
+        resource: str,
+    ) -> Generator[str]:
+        # all pages of a pooled listing sent with a single token - tokens may differ in repositories visible
+        # whole listings spread across tokens with remaining quota, fewest active listings first
+        if auth_token not in auth_token_pool:
+            # token not pooled
+            yield auth_token
+            return
+
+        def token_key(token: str) -> tuple[bool, int, float, int]:
+            token_rate_limit = rate_limit(token, resource)
+            available = token_rate_limit.available()
+            return (
+                available > 0,
+                -self._listing_count_collection.get(token, 0),
+                available,
+                -token_rate_limit.reserve_count,
+            )
+
+        with self._lock:
+            listing_auth_token = max(auth_token_pool, key=token_key)
+            self._listing_count_collection[listing_auth_token] = (
+                self._listing_count_collection.get(listing_auth_token, 0) + 1
+            )
+
+        try:
+            yield listing_auth_token
+
+        finally:
+            with self._lock:
+                self._listing_count_collection[listing_auth_token] -= 1
+
+
+def _auth_token_select(
+    auth_token_pool: list[str],
+    rate_limit: Callable[[str, str], RateLimitScheduler],
+    auth_token: str | None,
+    resource: str,
+) -> str | None:
+    if (auth_token is None) or (auth_token not in auth_token_pool):
+        # token not pooled
+        return auth_token
+
+    # token with the most remaining quota - when equal (e.g. quota yet to be reported)
+    # the token with fewest requests made
+    def token_key(token: str) -> tuple[float, int]:
+        token_rate_limit = rate_limit(token, resource)
+        return (token_rate_limit.available(), -token_rate_limit.reserve_count)
+
+    return max(auth_token_pool, key=token_key)
+
+
+def _request_auth_header(
+    header_collection: dict[str, str],
+    auth_token: str | None,
+    request_auth_token: str | None,
+) -> dict[str, str]:
+    # request headers built for auth token, swap token when sent with another from pool
+    if request_auth_token == auth_token:
+        return header_collection
+
+    return header_collection | {"Authorization": f"Bearer {request_auth_token}"}
+
+
+def _request_retryable(method: str, mutation: bool) -> bool:
+    # idempotent methods, or requests which don't mutate (e.g. GraphQL queries)
+    return (method in REQUEST_RETRY_METHOD_SET) or (not mutation)
+
+
+def _request_retry_wait(
+    retry_count: int, header_collection: http.client.HTTPMessage | None = None
+) -> float:
+    # honor Retry-After response header, otherwise backoff with full jitter
+    retry_after = (
+        None if (header_collection is None) else header_collection.get("Retry-After")
+    )
+
+    if (retry_after is not None) and retry_after.isdigit():
+        return int(retry_after)
+
+    return random.uniform(
+        0,
+        min(REQUEST_RETRY_BACKOFF_MAX, REQUEST_RETRY_BACKOFF_BASE * (2**retry_count)),
+    )
+
+
+def _response_body_decode(
+    header_collection: http.client.HTTPMessage, response_body: bytes
+) -> bytes:
+    # decompress response body
+    if header_collection.get("Content-Encoding", "").lower() == "gzip":
+        return gzip.decompress(response_body)
+
+    return response_body
+
+
+def _rate_limit_resource(api_path: str) -> str:
+    # REST and GraphQL APIs have separate rate limits
+    return (
+        RATE_LIMIT_RESOURCE_GRAPHQL
+        if (api_path == GRAPHQL_API_PATH)
+        else RATE_LIMIT_RESOURCE_CORE
+    )
+
+
+_default_client: GitHubClient | None = None
+_default_client_lock = threading.Lock()
+
+
+def client() -> GitHubClient:
+    # return shared client, created on first use
+    global _default_client
+
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = GitHubClient()
+
+        return _default_client
+
+
+def set_client(github_client: GitHubClient) -> None:
+    global _default_client
+
+    with _default_client_lock:
+        if _default_client is not None:
+            _default_client.close()
+
+        _default_client = github_client
+
+
+def _request(
+    auth_token: str | None,
+    api_path: str,
+    method: str | None = None,
+    parameter_collection: dict[str, Any] = {},
+    mutation: bool | None = None,
+    endpoint: str | None = None,
+    token_pool: bool = False,
+) -> Any:
+    return client().request(
+        auth_token,
+        api_path,
+        method,
+        parameter_collection,
+        mutation,
+        endpoint,
+        token_pool,
+    )
 
 
 def _request_paged(
@@ -85,6 +1027,12 @@ def _request_paged(
     api_path: str,
     parameter_collection: dict[str, bool | str] = {},
     item_processor: Callable[[list[Any]], Generator[Any]] | None = None,
+    page_size: int = REQUEST_PAGE_SIZE,
+    page_worker_count: int = REQUEST_PAGE_WORKER_COUNT,
+    endpoint: str | None = None,
+    page_cursor: str | None = None,
+    page_complete: PageComplete | None = None,
+    token_pool: bool = False,
 ) -> Generator[Any]:
     # init a default item processor function, if none given
     def default_item_processor(response_data: list[Any]) -> Generator[Any]:
@@ -94,30 +1042,282 @@ def _request_paged(
     if item_processor is None:
         item_processor = default_item_processor
 
-    # init initial request page
-    request_page = 1
-    active = True
+    github_client = client()
+    if token_pool:
+        # pooled listing - pages requested with token selected for listing
+        with github_client.listing_auth_token(
+            auth_token, api_path
+        ) as listing_auth_token:
+            yield from _request_paged(
+                listing_auth_token,
+                api_path,
+                parameter_collection,
+                item_processor,
+                page_size,
+                page_worker_count,
+                endpoint,
+                page_cursor,
+                page_complete,
+            )
 
-    while active:
+        return
+
+    def request_page(page: int) -> tuple[int, list[Any]]:
         # build paging parameters - merged with base request parameters
         parameter_paged_collection = parameter_collection.copy()
-        parameter_paged_collection.update(
-            page=str(request_page), per_page=str(REQUEST_PAGE_SIZE)
-        )
+        parameter_paged_collection.update(page=str(page), per_page=str(page_size))
 
         # make API request
-        response_data = _request(
-            auth_token, api_path, parameter_collection=parameter_paged_collection
+        with github_client.page_semaphore or contextlib.nullcontext():
+            response = github_client.request_response(
+                auth_token,
+                api_path,
+                parameter_collection=parameter_paged_collection,
+                endpoint=endpoint,
+            )
+
+        # process page items as received, decoded response then dropped
+        # pages waiting in request window hold processed items alone
+        return (
+            _link_last_page(response.header_collection),
+            list(item_processor(response.data)),
         )
 
-        # process result items/rows - will exit when page returned with no further items
-        active = False
-        for response_item in item_processor(response_data):
-            active = True
-            yield response_item
+    def page_processed(page: int, page_last: int) -> None:
+        # items of page consumed by caller - report cursor of the next page, None when all pages processed
+        if page_complete is not None:
+            page_complete(str(page + 1) if (page < page_last) else None)
+
+    # request first page (or page to resume from) - response Link header will give the final page number
+    page_start = int(page_cursor) if (page_cursor) else 1
+    page_last, item_list = request_page(page_start)
+    page_last = max(page_start, page_last)
+
+    yield from item_list
+    del item_list
+
+    page_processed(page_start, page_last)
+    if page_last <= page_start:
+        # single page of results
+        return
+
+    # fetch remaining pages concurrently, with a bounded window of requests in flight
+    # results are yielded in page order
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=page_worker_count)
+    future_queue: collections.deque[
+        concurrent.futures.Future[tuple[int, list[Any]]]
+    ] = collections.deque()
+
+    try:
+        page = page_start
+        page_next = page_start + 1
+        while future_queue or (page_next <= page_last):
+            while (page_next <= page_last) and (
+                len(future_queue) < (page_worker_count * 2)
+            ):
+                future_queue.append(executor.submit(request_page, page_next))
+                page_next += 1
+
+            _, item_list = future_queue.popleft().result()
+            yield from item_list
+            del item_list
+
+            page += 1
+            page_processed(page, page_last)
+
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _request_paged_count(
+    auth_token: str,
+    api_path: str,
+    parameter_collection: dict[str, bool | str] = {},
+    endpoint: str | None = None,
+) -> int:
+    # request single item pages - page number of the final page is the total item count
+    response = client().request_response(
+        auth_token,
+        api_path,
+        parameter_collection=parameter_collection | {"page": "1", "per_page": "1"},
+        endpoint=endpoint,
+    )
+
+    if "Link" not in response.header_collection:
+        # single page - zero or one items
+        return len(response.data)
+
+    return _link_last_page(response.header_collection)
+
+
+def _link_last_page(header_collection: http.client.HTTPMessage) -> int:
+    # extract page number of rel="last" link from response Link header
+    # info: https://docs.github.com/en/rest/using-the-rest-api/using-pagination-in-the-rest-api
+    link_match = LINK_HEADER_LAST_REGEXP.search(header_collection.get("Link", ""))
+    if link_match is None:
+        return 1
+
+    page_list = urllib.parse.parse_qs(
+        urllib.parse.urlsplit(link_match.group(1)).query
+    ).get("page")
+
+    return int(page_list[0]) if (page_list) else 1
+
+
+# info: https://docs.github.com/en/graphql/guides/forming-calls-with-graphql
+def _graphql_request(
+    auth_token: str,
+    query: str,
+    variable_collection: dict[str, Any] = {},
+    mutation: bool = False,
+    token_pool: bool = False,
+) -> Any:
+    response_data = _request(
+        auth_token,
+        GRAPHQL_API_PATH,
+        method="POST",
+        parameter_collection={"query": query, "variables": variable_collection},
+        mutation=mutation,
+        token_pool=token_pool,
+    )
+
+    # mutation errors are returned to the caller, mapped to each aliased mutation
+    if response_data.get("errors") and (not mutation):
+        raise GraphQLRequestError(response_data["errors"])
+
+    return response_data
+
+
+def _graphql_repository_paged(
+    auth_token: str,
+    query: str,
+    variable_collection: dict[str, Any],
+    connection_path: list[str],
+    page_cursor: str | None = None,
+    page_complete: PageComplete | None = None,
+    token_pool: bool = False,
+) -> Generator[Repository]:
+    if token_pool:
+        # pooled listing - pages requested with token selected for listing
+        with client().listing_auth_token(
+            auth_token, GRAPHQL_API_PATH
+        ) as listing_auth_token:
+            yield from _graphql_repository_paged(
+                listing_auth_token,
+                query,
+                variable_collection,
+                connection_path,
+                page_cursor,
+                page_complete,
+            )
 
-        # increment page for next API call
-        request_page += 1
+        return
+
+    # cursor based paging - each page must be requested in turn
+    cursor = page_cursor
+    while True:
+        with client().page_semaphore or contextlib.nullcontext():
+            connection_data = _graphql_request(
+                auth_token,
+                query,
+                variable_collection | {"cursor": cursor},
+            )["data"]
+
+        for connection_key in connection_path:
+            connection_data = connection_data[connection_key]
+
+        # project page nodes, decoded response then dropped
+        repository_list = [
+            _graphql_repository_item(node) for node in connection_data["nodes"]
+        ]
+
+        cursor = (
+            connection_data["pageInfo"]["endCursor"]
+            if (connection_data["pageInfo"]["hasNextPage"])
+            else None
+        )
+
+        del connection_data
+        yield from repository_list
+        del repository_list
+
+        # items of page consumed by caller - report cursor of the next page, None when all pages processed
+        if page_complete is not None:
+            page_complete(cursor)
+
+        if cursor is None:
+            return
+
+
+def _graphql_repository_item(node: dict[str, Any]) -> Repository:
+    # return GraphQL repository node as the equivalent of a REST API repository item
+    return Repository(
+        node["nameWithOwner"],
+        node_id=node["id"],
+        git_url=f"git://{urllib.parse.urlsplit(node['url']).netloc}/{node['nameWithOwner']}.git",
+        html_url=node["url"],
+        size=node["diskUsage"] or 0,
+        private=node["isPrivate"],
+        fork=node["isFork"],
+        archived=node["isArchived"],
+        has_projects=node["hasProjectsEnabled"],
+        has_wiki=node["hasWikiEnabled"],
+        admin=node["viewerPermission"] == "ADMIN",
+        subscribed=node["viewerSubscription"] == "SUBSCRIBED",
+        updated_at=node["updatedAt"],
+    )
+
+
+def repository_item_list(response_data: list[dict[str, Any]]) -> Generator[Repository]:
+    # project REST API repository items of a page - nested owner/license/etc. objects dropped
+    for item in response_data:
+        yield Repository(
+            item["full_name"],
+            node_id=item.get("node_id", ""),
+            git_url=item.get("git_url", ""),
+            html_url=item.get("html_url", ""),
+            size=item.get("size") or 0,
+            private=item.get("private", False),
+            fork=item.get("fork", False),
+            archived=item.get("archived", False),
+            has_projects=item.get("has_projects", False),
+            has_wiki=item.get("has_wiki", False),
+            admin=(item.get("permissions") or {}).get("admin"),
+            updated_at=item.get("updated_at") or "",
+        )
+
+
+def _graphql_repository_type_argument(
+    type_argument_collection: dict[str, str],
+    repository_type: str,
+    sort: str | None = None,
+    direction: str | None = None,
+) -> str:
+    if repository_type not in type_argument_collection:
+        raise APIRequestError(
+            422,
+            f"Repository type [{repository_type}] not supported by GraphQL API",
+        )
+
+    order_argument = ""
+    if sort is not None:
+        if sort not in GRAPHQL_REPOSITORY_ORDER_FIELD:
+            raise APIRequestError(
+                422, f"Repository sort [{sort}] not supported by GraphQL API"
+            )
+
+        order_argument = f"orderBy: {{field: {GRAPHQL_REPOSITORY_ORDER_FIELD[sort]}, direction: {(direction or 'asc').upper()}}}"
+
+    return ", ".join(
+        item
+        for item in (
+            f"first: {GRAPHQL_PAGE_SIZE}",
+            "after: $cursor",
+            type_argument_collection[repository_type],
+            order_argument,
+        )
+        if item
+    )
 
 
 def _urlquote(value: str) -> str:
@@ -126,21 +1326,143 @@ def _urlquote(value: str) -> str:
 
 # info: https://docs.github.com/en/rest/repos/repos#list-repositories-for-the-authenticated-user
 def user_repository_list(
-    auth_token: str, repository_type: str
-) -> Generator[dict[str, Any]]:
+    auth_token: str,
+    repository_type: str,
+    graphql: bool = False,
+    sort: str | None = None,
+    direction: str | None = None,
+    page_worker_count: int = REQUEST_PAGE_WORKER_COUNT,
+    page_cursor: str | None = None,
+    page_complete: PageComplete | None = None,
+) -> Generator[Repository]:
+    if graphql:
+        return _graphql_user_repository_list(
+            auth_token, repository_type, sort, direction, page_cursor, page_complete
+        )
+
+    # optional ordering, e.g. newest first - default order is by full name
+    parameter_collection: dict[str, bool | str] = {"type": repository_type}
+    if sort is not None:
+        parameter_collection["sort"] = sort
+
+    if direction is not None:
+        parameter_collection["direction"] = direction
+
     return _request_paged(
-        auth_token, "user/repos", parameter_collection={"type": repository_type}
+        auth_token,
+        "user/repos",
+        parameter_collection=parameter_collection,
+        item_processor=repository_item_list,
+        page_worker_count=page_worker_count,
+        page_cursor=page_cursor,
+        page_complete=page_complete,
     )
 
 
 # info: https://docs.github.com/en/rest/repos/repos#list-organization-repositories
 def organization_repository_list(
-    auth_token: str, organization_name: str, repository_type: str
-) -> Generator[dict[str, Any]]:
+    auth_token: str,
+    organization_name: str,
+    repository_type: str,
+    graphql: bool = False,
+    page_cursor: str | None = None,
+    page_complete: PageComplete | None = None,
+) -> Generator[Repository]:
+    if graphql:
+        return _graphql_organization_repository_list(
+            auth_token, organization_name, repository_type, page_cursor, page_complete
+        )
+
     return _request_paged(
         auth_token,
         f"orgs/{_urlquote(organization_name)}/repos",
         parameter_collection={"type": repository_type},
+        item_processor=repository_item_list,
+        endpoint="orgs/{org}/repos",
+        page_cursor=page_cursor,
+        page_complete=page_complete,
+        token_pool=True,
+    )
+
+
+# info: https://docs.github.com/en/rest/orgs/members#get-an-organization-membership-for-the-authenticated-user
+def user_organization_owner(auth_token: str, organization_name: str) -> bool:
+    try:
+        membership = _request(
+            auth_token,
+            f"user/memberships/orgs/{_urlquote(organization_name)}",
+            endpoint="user/memberships/orgs/{org}",
+        )
+
+    except APIRequestError as err:
+        if err.http_code in (403, 404):
+            # not a member of organization, or not an organization
+            return False
+
+        raise
+
+    # active membership with organization owner role - admin of every organization repository
+    return (membership.get("state") == "active") and (membership.get("role") == "admin")
+
+
+# info: https://docs.github.com/en/graphql/reference/objects#user
+def _graphql_user_repository_list(
+    auth_token: str,
+    repository_type: str,
+    sort: str | None = None,
+    direction: str | None = None,
+    page_cursor: str | None = None,
+    page_complete: PageComplete | None = None,
+) -> Generator[Repository]:
+    argument = _graphql_repository_type_argument(
+        GRAPHQL_USER_REPOSITORY_TYPE_ARGUMENT, repository_type, sort, direction
+    )
+
+    return _graphql_repository_paged(
+        auth_token,
+        f"query($cursor: String) {{ viewer {{ repositories({argument}) {{ {GRAPHQL_REPOSITORY_CONNECTION} }} }} }}",
+        {},
+        ["viewer", "repositories"],
+        page_cursor,
+        page_complete,
+    )
+
+
+# info: https://docs.github.com/en/graphql/reference/objects#organization
+def _graphql_organization_repository_list(
+    auth_token: str,
+    organization_name: str,
+    repository_type: str,
+    page_cursor: str | None = None,
+    page_complete: PageComplete | None = None,
+) -> Generator[Repository]:
+    argument = _graphql_repository_type_argument(
+        GRAPHQL_ORGANIZATION_REPOSITORY_TYPE_ARGUMENT, repository_type
+    )
+
+    return _graphql_repository_paged(
+        auth_token,
+        f"query($login: String!, $cursor: String) {{ organization(login: $login) {{ repositories({argument}) {{ {GRAPHQL_REPOSITORY_CONNECTION} }} }} }}",
+        {"login": organization_name},
+        ["organization", "repositories"],
+        page_cursor,
+        page_complete,
+        token_pool=True,
+    )
+
+
+# info: https://docs.github.com/en/rest/repos/repos#get-a-repository
+def repository_properties(auth_token: str, owner: str, repository: str) -> Repository:
+    return next(
+        repository_item_list(
+            [
+                _request(
+                    auth_token,
+                    f"repos/{_urlquote(owner)}/{_urlquote(repository)}",
+                    endpoint="repos/{owner}/{repo}",
+                )
+            ]
+        )
     )
 
 
@@ -178,12 +1500,27 @@ def update_repository_properties(
         f"repos/{_urlquote(owner)}/{_urlquote(repository)}",
         method="PATCH",
         parameter_collection=patch_collection,
+        endpoint="repos/{owner}/{repo}",
     )
 
 
 # info: https://docs.github.com/en/rest/activity/watching#list-repositories-watched-by-the-authenticated-user
-def user_subscription_list(auth_token: str) -> Generator[dict[str, Any]]:
-    return _request_paged(auth_token, "user/subscriptions")
+def user_subscription_list(
+    auth_token: str,
+    page_cursor: str | None = None,
+    page_complete: PageComplete | None = None,
+) -> Generator[Repository]:
+    return _request_paged(
+        auth_token,
+        "user/subscriptions",
+        item_processor=repository_item_list,
+        page_cursor=page_cursor,
+        page_complete=page_complete,
+    )
+
+
+def user_subscription_count(auth_token: str) -> int:
+    return _request_paged_count(auth_token, "user/subscriptions")
 
 
 # info: https://docs.github.com/en/rest/activity/watching#get-a-repository-subscription
@@ -191,6 +1528,7 @@ def repository_subscription(auth_token: str, owner: str, repository: str) -> Any
     return _request(
         auth_token,
         f"repos/{_urlquote(owner)}/{_urlquote(repository)}/subscription",
+        endpoint="repos/{owner}/{repo}/subscription",
     )
 
 
@@ -207,6 +1545,7 @@ def set_user_repository_subscription(
         f"repos/{_urlquote(owner)}/{_urlquote(repository)}/subscription",
         method="PUT",
         parameter_collection={"subscribed": subscribed, "ignored": ignored},
+        endpoint="repos/{owner}/{repo}/subscription",
     )
 
 
@@ -217,4 +1556,72 @@ def repository_webhook_list(
     return _request(
         auth_token,
         f"repos/{_urlquote(owner)}/{_urlquote(repository)}/hooks",
+        endpoint="repos/{owner}/{repo}/hooks",
+        token_pool=True,
+    )
+
+
+# info: https://docs.github.com/en/graphql/reference/mutations#updaterepository
+def graphql_update_repository_mutation(
+    node_id: str, projects: bool | None = None, wiki: bool | None = None
+) -> str:
+    # build mutation input from given arguments
+    input_list = [f"repositoryId: {json.dumps(node_id)}"]
+    if projects is not None:
+        input_list.append(f"hasProjectsEnabled: {json.dumps(projects)}")
+
+    if wiki is not None:
+        input_list.append(f"hasWikiEnabled: {json.dumps(wiki)}")
+
+    return (
+        f"updateRepository(input: {{{', '.join(input_list)}}}) {{ clientMutationId }}"
     )
+
+
+# info: https://docs.github.com/en/graphql/reference/mutations#updatesubscription
+def graphql_update_subscription_mutation(node_id: str, subscribed: bool) -> str:
+    state = "SUBSCRIBED" if (subscribed) else "UNSUBSCRIBED"
+    return f"updateSubscription(input: {{subscribableId: {json.dumps(node_id)}, state: {state}}}) {{ clientMutationId }}"
+
+
+def graphql_mutation_batch(
+    auth_token: str, mutation_list: list[str]
+) -> list[GraphQLRequestError | None]:
+    # send all mutations in a single request, each aliased by list index
+    alias_list = [
+        f"{GRAPHQL_MUTATION_ALIAS_PREFIX}{index}: {mutation_item}"
+        for index, mutation_item in enumerate(mutation_list)
+    ]
+
+    response_data = _graphql_request(
+        auth_token, f"mutation {{ {' '.join(alias_list)} }}", mutation=True
+    )
+
+    # map errors back to each alias - errors without a path apply to every mutation
+    error_collection: dict[int, list[dict[str, Any]]] = {}
+    for error_item in response_data.get("errors") or []:
+        alias = (error_item.get("path") or [""])[0]
+        if str(alias).startswith(GRAPHQL_MUTATION_ALIAS_PREFIX):
+            index = int(alias[len(GRAPHQL_MUTATION_ALIAS_PREFIX) :])
+            error_collection.setdefault(index, []).append(error_item)
+        else:
+            for index in range(len(mutation_list)):
+                error_collection.setdefault(index, []).append(error_item)
+
+    # mutation with no result data and no mapped errors also considered a failure
+    result_data = response_data.get("data") or {}
+    return [
+        (
+            GraphQLRequestError(error_collection[index])
+            if (index in error_collection)
+            else (
+                None
+                if (
+                    result_data.get(f"{GRAPHQL_MUTATION_ALIAS_PREFIX}{index}")
+                    is not None
+                )
+                else GraphQLRequestError([{"message": "No mutation result returned"}])
+            )
+        )
+        for index in range(len(mutation_list))
+    ]
@@ -0,0 +1,251 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Generator, Iterable
+from typing import Any
+
+from lib import githubapi
+
+INVENTORY_FILE_NAME = "inventory.sqlite"
+INVENTORY_SCHEMA_VERSION = 2
+DEFAULT_INVENTORY_TTL = 600
+
+# repository record fields held by inventory - also column names of repository table
+REPOSITORY_KEY_LIST = [
+    "full_name",
+    "node_id",
+    "git_url",
+    "html_url",
+    "size",
+    "private",
+    "fork",
+    "archived",
+    "has_projects",
+    "has_wiki",
+    "admin",
+    "subscribed",
+    "updated_at",
+]
+
+_REPOSITORY_FLAG_KEY_LIST = ["has_projects", "has_wiki"]
+_SCHEMA_STATEMENT_LIST = [
+    "CREATE TABLE source (source_key TEXT PRIMARY KEY, refresh_time REAL NOT NULL)",
+    "CREATE TABLE repository ("
+    + "source_key TEXT NOT NULL, owner TEXT NOT NULL, name TEXT NOT NULL, "
+    + "node_id TEXT NOT NULL, git_url TEXT NOT NULL, html_url TEXT NOT NULL, "
+    + "size INTEGER NOT NULL, private INTEGER NOT NULL, fork INTEGER NOT NULL, "
+    + "archived INTEGER NOT NULL, has_projects INTEGER NOT NULL, has_wiki INTEGER NOT NULL, "
+    + "admin INTEGER, subscribed INTEGER, updated_at TEXT NOT NULL, "
+    + "PRIMARY KEY (source_key, owner, name)) WITHOUT ROWID",
+    "CREATE INDEX repository_size ON repository (source_key, size DESC)",
+    "CREATE INDEX repository_has_projects ON repository (source_key, has_projects)",
+    "CREATE INDEX repository_has_wiki ON repository (source_key, has_wiki)",
+]
+
+
+class Inventory:
+    def __init__(self, file_path: str, ttl: float = DEFAULT_INVENTORY_TTL):
+        # sources refreshed more than TTL seconds ago are stale, listed again from the API
+        self.file_path = file_path
+        self._ttl = ttl
+        self._lock = threading.Lock()
+
+        # connection shared by organization listing threads, serialized by lock
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        self._connection = sqlite3.connect(
+            file_path, isolation_level=None, check_same_thread=False
+        )
+
+        self._schema_create()
+
+    def __enter__(self) -> "Inventory":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def fresh(self, source_key: str) -> bool:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT refresh_time FROM source WHERE source_key = ?", (source_key,)
+            ).fetchone()
+
+        return (row is not None) and ((time.time() - row[0]) < self._ttl)
+
+    def refresh(
+        self, source_key: str, repository_list: Iterable[githubapi.Repository]
+    ) -> Generator[githubapi.Repository]:
+        # pass through repositories of a listing, replacing those held for source once listing completes
+        row_list: list[tuple[Any, ...]] = []
+        for repository_item in repository_list:
+            row_list.append(_repository_row(source_key, repository_item))
+            yield repository_item
+
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.execute(
+                    "DELETE FROM repository WHERE source_key = ?", (source_key,)
+                )
+
+                self._connection.executemany(
+                    f"INSERT OR REPLACE INTO repository VALUES ({','.join(['?'] * (len(REPOSITORY_KEY_LIST) + 2))})",
+                    row_list,
+                )
+
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO source VALUES (?, ?)",
+                    (source_key, time.time()),
+                )
+
+                self._connection.execute("COMMIT")
+
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+
+    def repository_list(
+        self,
+        source_key_list: list[str],
+        order_by_size: bool = False,
+        limit: int | None = None,
+        **flag_collection: bool,
+    ) -> Generator[githubapi.Repository]:
+        # repositories of sources, optionally limited to those with given flags (e.g. has_wiki=True)
+        where, parameter_list = _source_where(source_key_list)
+        for key, value in flag_collection.items():
+            if key not in _REPOSITORY_FLAG_KEY_LIST:
+                raise ValueError(f"Unknown repository flag [{key}]")
+
+            where += f" AND {key} = ?"
+            parameter_list.append(int(value))
+
+        query = (
+            f"SELECT owner || '/' || name, {','.join(REPOSITORY_KEY_LIST[1:])} "
+            + f"FROM repository WHERE {where}"
+            + (" ORDER BY size DESC" if (order_by_size) else "")
+            + (" LIMIT ?" if (limit is not None) else "")
+        )
+
+        if limit is not None:
+            parameter_list.append(limit)
+
+        with self._lock:
+            row_list = self._connection.execute(query, parameter_list).fetchall()
+
+        for row in row_list:
+            yield _row_repository(row)
+
+    def repository_name_list(self, source_key_list: list[str]) -> list[str]:
+        # names alone - answered from primary key index, without reading repository rows
+        where, parameter_list = _source_where(source_key_list)
+        with self._lock:
+            return [
+                f"{owner}/{name}"
+                for owner, name in self._connection.execute(
+                    f"SELECT owner, name FROM repository WHERE {where}", parameter_list
+                )
+            ]
+
+    def repository_update(
+        self,
+        source_key_list: list[str],
+        repository_name_list: Iterable[str],
+        **flag_collection: bool,
+    ) -> None:
+        # record flags changed by a run, keeping held repositories in step until next refresh
+        for key in flag_collection:
+            if key not in _REPOSITORY_FLAG_KEY_LIST:
+                raise ValueError(f"Unknown repository flag [{key}]")
+
+        set_list = [f"{key} = ?" for key in flag_collection]
+        where, parameter_list = _source_where(source_key_list)
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                for repository_name in repository_name_list:
+                    owner, name = repository_name.split("/")
+                    self._connection.execute(
+                        f"UPDATE repository SET {', '.join(set_list)} "
+                        + f"WHERE {where} AND owner = ? AND name = ?",
+                        [int(value) for value in flag_collection.values()]
+                        + parameter_list
+                        + [owner, name],
+                    )
+
+                self._connection.execute("COMMIT")
+
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+
+    def _schema_create(self) -> None:
+        with self._lock:
+            (schema_version,) = self._connection.execute(
+                "PRAGMA user_version"
+            ).fetchone()
+
+            if schema_version == INVENTORY_SCHEMA_VERSION:
+                return
+
+            # new inventory, or written by an incompatible version - recreate
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.execute("DROP TABLE IF EXISTS repository")
+                self._connection.execute("DROP TABLE IF EXISTS source")
+                for statement in _SCHEMA_STATEMENT_LIST:
+                    self._connection.execute(statement)
+
+                self._connection.execute(
+                    f"PRAGMA user_version = {INVENTORY_SCHEMA_VERSION}"
+                )
+
+                self._connection.execute("COMMIT")
+
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+
+
+def inventory_path(cache_dir: str) -> str:
+    return f"{cache_dir}/{INVENTORY_FILE_NAME}"
+
+
+def source_key(auth_token: str, *key_list: str) -> str:
+    # source for each auth token/listing combination - token itself never written to disk
+    return hashlib.sha256(
+        "\n".join((auth_token,) + key_list).encode("utf-8")
+    ).hexdigest()[:16]
+
+
+def _source_where(source_key_list: list[str]) -> tuple[str, list[Any]]:
+    return (
+        f"source_key IN ({','.join(['?'] * len(source_key_list))})",
+        list(source_key_list),
+    )
+
+
+def _repository_row(
+    source_key: str, repository_item: githubapi.Repository
+) -> tuple[Any, ...]:
+    return (source_key, repository_item.owner, repository_item.name) + tuple(
+        getattr(repository_item, key) for key in REPOSITORY_KEY_LIST[1:]
+    )
+
+
+def _row_repository(row: tuple[Any, ...]) -> githubapi.Repository:
+    repository_collection = dict(zip(REPOSITORY_KEY_LIST, row))
+    for key in ("private", "fork", "archived", "has_projects", "has_wiki"):
+        repository_collection[key] = bool(repository_collection[key])
+
+    for key in ("admin", "subscribed"):
+        if repository_collection[key] is not None:
+            repository_collection[key] = bool(repository_collection[key])
+
+    return githubapi.Repository(**repository_collection)
@@ -0,0 +1,353 @@
+import collections
+import json
+import math
+import os
+import sys
+import threading
+import time
+from typing import Any
+
+from lib import fileutil, githubapi
+
+STATS_FORMAT_JSON = "json"
+STATS_FORMAT_PROMETHEUS = "prometheus"
+PERCENTILE_LIST = [50, 95, 99]
+LATENCY_SAMPLE_SIZE = 1000
+PROMETHEUS_METRIC_PREFIX = "githubutilities"
+
+
+class EndpointMetrics:
+    __slots__ = (
+        "requests",
+        "retries",
+        "status",
+        "response_bytes",
+        "latency_sum",
+        "latency_sample",
+    )
+
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.status: dict[str, int] = {}
+        self.response_bytes = 0
+        self.latency_sum = 0.0
+
+        # latency percentiles taken from most recent requests - bounded for long running (e.g. --watch) scripts
+        self.latency_sample: collections.deque[float] = collections.deque(
+            maxlen=LATENCY_SAMPLE_SIZE
+        )
+
+
+class RequestMetrics:
+    def __init__(self, script_name: str | None = None):
+        # script name labels exported metrics, allowing textfiles of several scripts to coexist
+        self.script_name = (
+            script_name or os.path.splitext(os.path.basename(sys.argv[0]))[0]
+        )
+
+        # requests aggregated as recorded - memory held by endpoint, not by request
+        self._lock = threading.Lock()
+        self._time_start = time.monotonic()
+        self._endpoint_collection: dict[tuple[str, str], EndpointMetrics] = {}
+        self._error_count = 0
+        self._rate_limit_collection: dict[str, dict[str, int | None]] = {}
+        self._token_collection: dict[str, dict[str, Any]] = {}
+
+    def record(self, request_record: githubapi.RequestRecord) -> None:
+        # request hook - called for every request sent by the API client
+        with self._lock:
+            endpoint_metrics = self._endpoint_collection.get(
+                (request_record.method, request_record.endpoint)
+            )
+
+            if endpoint_metrics is None:
+                endpoint_metrics = EndpointMetrics()
+                self._endpoint_collection[
+                    (request_record.method, request_record.endpoint)
+                ] = endpoint_metrics
+
+            status = _request_status(request_record)
+            endpoint_metrics.requests += 1
+            endpoint_metrics.status[status] = endpoint_metrics.status.get(status, 0) + 1
+            endpoint_metrics.response_bytes += request_record.response_bytes
+            endpoint_metrics.latency_sum += request_record.latency
+            endpoint_metrics.latency_sample.append(request_record.latency)
+
+            if request_record.retry_wait is not None:
+                endpoint_metrics.retries += 1
+
+            if (request_record.http_code >= 400) or (request_record.http_code == 0):
+                self._error_count += 1
+
+            # requests sent with each auth token
+            token_item: dict[str, Any] | None = None
+            if request_record.auth_token_label is not None:
+                token_item = self._token_collection.setdefault(
+                    request_record.auth_token_label, {"requests": 0, "rate_limit": {}}
+                )
+                token_item["requests"] += 1
+
+            # last reported rate limit state of each resource, overall and by auth token
+            if request_record.rate_limit_remaining is not None:
+                resource = request_record.rate_limit_resource or "core"
+                self._rate_limit_collection[resource] = {
+                    "limit": request_record.rate_limit_limit,
+                    "remaining": request_record.rate_limit_remaining,
+                    "used": request_record.rate_limit_used,
+                }
+
+                if token_item is not None:
+                    token_item["rate_limit"][resource] = self._rate_limit_collection[
+                        resource
+                    ]
+
+    def summary(self) -> dict[str, Any]:
+        duration = time.monotonic() - self._time_start
+
+        with self._lock:
+            endpoint_list: list[dict[str, Any]] = []
+            for (method, endpoint), endpoint_metrics in sorted(
+                self._endpoint_collection.items()
+            ):
+                latency_list = sorted(endpoint_metrics.latency_sample)
+                endpoint_list.append(
+                    {
+                        "method": method,
+                        "endpoint": endpoint,
+                        "requests": endpoint_metrics.requests,
+                        "retries": endpoint_metrics.retries,
+                        "status": dict(endpoint_metrics.status),
+                        "response_bytes": endpoint_metrics.response_bytes,
+                        "latency_sum": endpoint_metrics.latency_sum,
+                        "latency": {
+                            f"p{percentile}": _percentile(latency_list, percentile)
+                            for percentile in PERCENTILE_LIST
+                        },
+                    }
+                )
+
+            error_count = self._error_count
+            rate_limit_collection = {
+                resource: dict(rate_limit)
+                for resource, rate_limit in self._rate_limit_collection.items()
+            }
+
+            token_collection = {
+                token_label: {
+                    "requests": token_item["requests"],
+                    "rate_limit": {
+                        resource: dict(rate_limit)
+                        for resource, rate_limit in token_item["rate_limit"].items()
+                    },
+                }
+                for token_label, token_item in self._token_collection.items()
+            }
+
+        request_count = sum(item["requests"] for item in endpoint_list)
+        return {
+            "script": self.script_name,
+            "timestamp": int(time.time()),
+            "duration": duration,
+            "requests": request_count,
+            "retries": sum(item["retries"] for item in endpoint_list),
+            "errors": error_count,
+            "response_bytes": sum(item["response_bytes"] for item in endpoint_list),
+            "requests_per_second": (
+                (request_count / duration) if (duration > 0) else 0.0
+            ),
+            "rate_limit": rate_limit_collection,
+            "token": token_collection,
+            "endpoint": endpoint_list,
+        }
+
+    def format_text(self) -> str:
+        summary = self.summary()
+
+        line_list = [
+            f"Requests: {summary['requests']}, retries: {summary['retries']}, "
+            f"errors: {summary['errors']}, "
+            f"received: {summary['response_bytes'] / 1024:.1f} KB, "
+            f"duration: {summary['duration']:.2f}s, "
+            f"requests/sec: {summary['requests_per_second']:.1f}"
+        ]
+
+        for resource, rate_limit in sorted(summary["rate_limit"].items()):
+            line_list.append(
+                f"Rate limit remaining [{resource}]: {rate_limit['remaining']}/{rate_limit['limit']}"
+            )
+
+        if len(summary["token"]) > 1:
+            # usage of each pooled auth token
+            for token_label, token_item in sorted(summary["token"].items()):
+                line_list.append(
+                    f"Token [{token_label}]: requests: {token_item['requests']}"
+                    + "".join(
+                        f", remaining [{resource}]: {rate_limit['remaining']}/{rate_limit['limit']}"
+                        for resource, rate_limit in sorted(
+                            token_item["rate_limit"].items()
+                        )
+                    )
+                )
+
+        if summary["endpoint"]:
+            # latency by endpoint, in milliseconds
+            line_list.append("")
+            line_list.append(
+                "Endpoint".ljust(48)
+                + "Requests".rjust(10)
+                + "".join(
+                    f"p{percentile} ms".rjust(10) for percentile in PERCENTILE_LIST
+                )
+            )
+
+            for endpoint_item in summary["endpoint"]:
+                line_list.append(
+                    f"{endpoint_item['method']} {endpoint_item['endpoint']}".ljust(48)
+                    + f"{endpoint_item['requests']:10d}"
+                    + "".join(
+                        f"{endpoint_item['latency'][f'p{percentile}'] * 1000:10.1f}"
+                        for percentile in PERCENTILE_LIST
+                    )
+                )
+
+        return "\n".join(line_list)
+
+    def format_json(self) -> str:
+        return json.dumps(self.summary(), indent=2)
+
+    def format_prometheus(self) -> str:
+        # info: https://prometheus.io/docs/instrumenting/exposition_formats/#text-based-format
+        summary = self.summary()
+        script_label = f'script="{_prometheus_label_escape(self.script_name)}"'
+        line_list: list[str] = []
+
+        def add_metric(name: str, metric_type: str, help_text: str) -> str:
+            metric_name = f"{PROMETHEUS_METRIC_PREFIX}_{name}"
+            line_list.append(f"# HELP {metric_name} {help_text}")
+            line_list.append(f"# TYPE {metric_name} {metric_type}")
+
+            return metric_name
+
+        def endpoint_label(endpoint_item: dict[str, Any]) -> str:
+            return (
+                f'{script_label},method="{endpoint_item["method"]}",'
+                f'endpoint="{_prometheus_label_escape(endpoint_item["endpoint"])}"'
+            )
+
+        metric_name = add_metric(
+            "requests_total", "counter", "API requests sent, by endpoint and status."
+        )
+
+        for endpoint_item in summary["endpoint"]:
+            for status, count in sorted(endpoint_item["status"].items()):
+                line_list.append(
+                    f'{metric_name}{{{endpoint_label(endpoint_item)},status="{status}"}} {count}'
+                )
+
+        metric_name = add_metric(
+            "request_duration_seconds", "summary", "API request latency."
+        )
+
+        for endpoint_item in summary["endpoint"]:
+            label = endpoint_label(endpoint_item)
+            for percentile in PERCENTILE_LIST:
+                line_list.append(
+                    f'{metric_name}{{{label},quantile="{percentile / 100}"}} '
+                    + f"{endpoint_item['latency'][f'p{percentile}']:.6f}"
+                )
+
+            line_list.append(
+                f"{metric_name}_sum{{{label}}} {endpoint_item['latency_sum']:.6f}"
+            )
+            line_list.append(
+                f"{metric_name}_count{{{label}}} {endpoint_item['requests']}"
+            )
+
+        metric_name = add_metric(
+            "retries_total", "counter", "API requests retried, by endpoint."
+        )
+
+        for endpoint_item in summary["endpoint"]:
+            line_list.append(
+                f"{metric_name}{{{endpoint_label(endpoint_item)}}} {endpoint_item['retries']}"
+            )
+
+        metric_name = add_metric(
+            "response_bytes_total", "counter", "API response bytes received."
+        )
+
+        for endpoint_item in summary["endpoint"]:
+            line_list.append(
+                f"{metric_name}{{{endpoint_label(endpoint_item)}}} {endpoint_item['response_bytes']}"
+            )
+
+        for name, help_text in (
+            ("limit", "API rate limit, as last reported."),
+            ("remaining", "API rate limit remaining, as last reported."),
+        ):
+            metric_name = add_metric(f"rate_limit_{name}", "gauge", help_text)
+            for resource, rate_limit in sorted(summary["rate_limit"].items()):
+                if rate_limit[name] is not None:
+                    line_list.append(
+                        f'{metric_name}{{{script_label},resource="{_prometheus_label_escape(resource)}"}} {rate_limit[name]}'
+                    )
+
+        metric_name = add_metric(
+            "token_requests_total", "counter", "API requests sent, by auth token."
+        )
+
+        for token_label, token_item in sorted(summary["token"].items()):
+            line_list.append(
+                f'{metric_name}{{{script_label},token="{_prometheus_label_escape(token_label)}"}} {token_item["requests"]}'
+            )
+
+        metric_name = add_metric(
+            "token_rate_limit_remaining",
+            "gauge",
+            "API rate limit remaining by auth token, as last reported.",
+        )
+
+        for token_label, token_item in sorted(summary["token"].items()):
+            for resource, rate_limit in sorted(token_item["rate_limit"].items()):
+                line_list.append(
+                    f'{metric_name}{{{script_label},token="{_prometheus_label_escape(token_label)}",resource="{_prometheus_label_escape(resource)}"}} {rate_limit["remaining"]}'
+                )
+
+        metric_name = add_metric(
+            "run_duration_seconds", "gauge", "Duration of the last run."
+        )
+        line_list.append(f"{metric_name}{{{script_label}}} {summary['duration']:.6f}")
+
+        metric_name = add_metric(
+            "run_timestamp_seconds", "gauge", "Unix time the last run completed."
+        )
+        line_list.append(f"{metric_name}{{{script_label}}} {summary['timestamp']}")
+
+        return "\n".join(line_list) + "\n"
+
+    def write(self, file_path: str, stats_format: str = STATS_FORMAT_JSON) -> None:
+        content = (
+            self.format_prometheus()
+            if (stats_format == STATS_FORMAT_PROMETHEUS)
+            else (self.format_json() + "\n")
+        )
+
+        fileutil.atomic_write(file_path, content)
+
+
+def _percentile(sorted_list: list[float], percentile: int) -> float:
+    # nearest rank percentile of an ascending sorted list
+    if not sorted_list:
+        return 0.0
+
+    return sorted_list[max(0, math.ceil(len(sorted_list) * percentile / 100) - 1)]
+
+
+def _request_status(request_record: githubapi.RequestRecord) -> str:
+    # connection failures have no HTTP status
+    return "error" if (request_record.http_code == 0) else str(request_record.http_code)
+
+
+def _prometheus_label_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
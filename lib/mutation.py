@@ -0,0 +1,96 @@
+import concurrent.futures
+from collections.abc import Callable, Generator, Iterable
+from typing import Any
+
+from lib import githubapi
+
+
+class MutationResult:
+    def __init__(
+        self, repository_name: str, error: githubapi.APIRequestError | None = None
+    ):
+        # repository mutated and API error raised (if failed)
+        self.repository_name = repository_name
+        self.error = error
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+class GraphQLBatch:
+    def __init__(
+        self,
+        auth_token: str,
+        mutation: Callable[[str], str],
+        batch_size: int = githubapi.GRAPHQL_MUTATION_BATCH_SIZE,
+    ):
+        # mutation callable returns GraphQL mutation field for a given repository name
+        self.auth_token = auth_token
+        self.mutation = mutation
+        self.batch_size = batch_size
+
+    def apply(
+        self, repository_name_list: Iterable[str], concurrency: int
+    ) -> Generator[MutationResult]:
+        def mutate_batch(batch_name_list: list[str]) -> list[MutationResult]:
+            try:
+                error_list = githubapi.graphql_mutation_batch(
+                    self.auth_token, [self.mutation(name) for name in batch_name_list]
+                )
+            except githubapi.APIRequestError as err:
+                # entire batch request failed
+                return [MutationResult(name, err) for name in batch_name_list]
+
+            return [
+                MutationResult(name, error)
+                for name, error in zip(batch_name_list, error_list)
+            ]
+
+        # split repositories into batches, each batch sent as a single GraphQL request
+        name_list = list(repository_name_list)
+        batch_list = [
+            name_list[index : index + self.batch_size]
+            for index in range(0, len(name_list), self.batch_size)
+        ]
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=concurrency)
+        try:
+            future_list = [
+                executor.submit(mutate_batch, batch_name_list)
+                for batch_name_list in batch_list
+            ]
+
+            for future in concurrent.futures.as_completed(future_list):
+                yield from future.result()
+
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+
+def apply(
+    mutation: Callable[[str], Any],
+    repository_name_list: Iterable[str],
+    concurrency: int,
+) -> Generator[MutationResult]:
+    def mutate(repository_name: str) -> MutationResult:
+        try:
+            mutation(repository_name)
+        except githubapi.APIRequestError as err:
+            return MutationResult(repository_name, err)
+
+        return MutationResult(repository_name)
+
+    # apply mutation to each repository with bounded concurrency - results yielded as completed
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        future_list = [
+            executor.submit(mutate, repository_name)
+            for repository_name in repository_name_list
+        ]
+
+        for future in concurrent.futures.as_completed(future_list):
+            yield future.result()
+
+    finally:
+        executor.shutdown(cancel_futures=True)
@@ -0,0 +1,145 @@
+import concurrent.futures
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+
+from lib import fileutil, githubapi
+
+PLAN_VERSION = 1
+DEFAULT_PLAN_CHECK_AGE = 300
+
+# current state of a repository for a plan precondition check, None where repository no longer exists
+# state may include an "updated_at" key, compared against last update time recorded by plan
+RepositoryState = Callable[[str], dict[str, Any] | None]
+
+
+class PlanChange:
+    __slots__ = ("repository_name", "node_id", "state", "updated_at")
+
+    def __init__(
+        self,
+        repository_name: str,
+        node_id: str,
+        state: dict[str, Any],
+        updated_at: str = "",
+    ):
+        # state observed when planned - change applied only while repository remains in this state
+        self.repository_name = repository_name
+        self.node_id = node_id
+        self.state = state
+        self.updated_at = updated_at
+
+
+class Plan:
+    def __init__(
+        self,
+        script: str,
+        action: str,
+        change_list: list[PlanChange],
+        time_created: float | None = None,
+    ):
+        self.script = script
+        self.action = action
+        self.change_list = change_list
+        self.time_created = time.time() if (time_created is None) else time_created
+
+    def age(self) -> float:
+        return time.time() - self.time_created
+
+    def node_id_collection(self) -> dict[str, str]:
+        return {item.repository_name: item.node_id for item in self.change_list}
+
+    def write(self, file_path: str) -> None:
+        # changes held as arrays of repository, node ID, observed state and last update time
+        content = json.dumps(
+            {
+                "version": PLAN_VERSION,
+                "script": self.script,
+                "action": self.action,
+                "created": int(self.time_created),
+                "change": [
+                    [item.repository_name, item.node_id, item.state, item.updated_at]
+                    for item in self.change_list
+                ],
+            },
+            separators=(",", ":"),
+        )
+
+        fileutil.atomic_write(file_path, content + "\n")
+
+    @staticmethod
+    def load(file_path: str) -> "Plan":
+        # raises OSError when unreadable, ValueError when not a valid plan
+        fp = open(file_path, "rb")
+        plan_data = json.load(fp)
+        fp.close()
+
+        if (not isinstance(plan_data, dict)) or (
+            plan_data.get("version") != PLAN_VERSION
+        ):
+            raise ValueError("unknown plan format/version")
+
+        try:
+            return Plan(
+                plan_data["script"],
+                plan_data["action"],
+                [
+                    PlanChange(repository_name, node_id, state, updated_at)
+                    for repository_name, node_id, state, updated_at in plan_data[
+                        "change"
+                    ]
+                ],
+                float(plan_data["created"]),
+            )
+
+        except (KeyError, TypeError) as err:
+            raise ValueError(f"invalid plan - {err}")
+
+
+def check(
+    change_plan: Plan,
+    check_age: float,
+    concurrency: int,
+    repository_state: RepositoryState,
+) -> list[str]:
+    # plan younger than check age applied as-is
+    if change_plan.age() < check_age:
+        return [item.repository_name for item in change_plan.change_list]
+
+    # otherwise confirm each repository remains in planned state
+    def change_skip_reason(change: PlanChange) -> str | None:
+        try:
+            state = repository_state(change.repository_name)
+        except githubapi.APIRequestError as err:
+            if err.http_code == 404:
+                state = None
+            else:
+                raise
+
+        if state is None:
+            return "No longer exists"
+
+        if any(state.get(key) != value for key, value in change.state.items()):
+            return "Changed since planned"
+
+        # otherwise updated since planned (e.g. by another run) - planned change may no longer be wanted
+        if change.updated_at and (
+            state.get("updated_at", change.updated_at) != change.updated_at
+        ):
+            return "Updated since planned"
+
+        return None
+
+    repository_name_list: list[str] = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for change, skip_reason in zip(
+            change_plan.change_list,
+            executor.map(change_skip_reason, change_plan.change_list),
+        ):
+            if skip_reason is None:
+                repository_name_list.append(change.repository_name)
+            else:
+                print(f"{change.repository_name} - {skip_reason}, skipped")
+
+    return repository_name_list
@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+import threading
+
+from lib import fileutil
+
+DEFAULT_CACHE_DIR = (
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    + "/githubutilities"
+)
+DEFAULT_MAX_SIZE = 100 * 1024 * 1024
+CACHE_FILE_SUFFIX = ".cache"
+
+
+class CacheEntry:
+    def __init__(self, etag: str, link: str | None, body: bytes):
+        self.etag = etag
+        self.link = link
+        self.body = body
+
+
+class ResponseCache:
+    def __init__(
+        self, cache_dir: str = DEFAULT_CACHE_DIR, max_size: int = DEFAULT_MAX_SIZE
+    ):
+        self._cache_dir = cache_dir
+        self._max_size = max_size
+        self._lock = threading.Lock()
+
+        # determine current cache size from existing entries
+        os.makedirs(cache_dir, exist_ok=True)
+        self._size = sum(size for _, size, _ in self._entry_list())
+
+    def get(self, auth_token: str | None, request_path: str) -> CacheEntry | None:
+        file_path = self._file_path(auth_token, request_path)
+
+        try:
+            fp = open(file_path, "rb")
+            header = json.loads(fp.readline())
+            body = fp.read()
+            fp.close()
+
+            # mark entry as recently used
+            os.utime(file_path)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        return CacheEntry(header["etag"], header.get("link"), body)
+
+    def set(
+        self,
+        auth_token: str | None,
+        request_path: str,
+        etag: str,
+        link: str | None,
+        body: bytes,
+    ) -> None:
+        file_path = self._file_path(auth_token, request_path)
+
+        header = json.dumps({"etag": etag, "link": link}, separators=(",", ":"))
+        content = bytes(header, "utf-8") + b"\n" + body
+
+        with self._lock:
+            try:
+                self._size -= os.path.getsize(file_path)
+            except FileNotFoundError:
+                pass
+
+            fileutil.atomic_write(file_path, content)
+            self._size += len(content)
+
+            if self._size > self._max_size:
+                self._evict()
+
+    def _file_path(self, auth_token: str | None, request_path: str) -> str:
+        # key entries by auth identity and request path - auth token itself never stored
+        key = hashlib.sha256(
+            bytes(f"{auth_token or ''}\n{request_path}", "utf-8")
+        ).hexdigest()
+
+        return f"{self._cache_dir}/{key}{CACHE_FILE_SUFFIX}"
+
+    def _entry_list(self) -> list[tuple[str, int, float]]:
+        entry_list: list[tuple[str, int, float]] = []
+        for dir_entry in os.scandir(self._cache_dir):
+            if dir_entry.name.endswith(CACHE_FILE_SUFFIX):
+                stat = dir_entry.stat()
+                entry_list.append((dir_entry.path, stat.st_size, stat.st_mtime))
+
+        return entry_list
+
+    def _evict(self) -> None:
+        # remove least recently used entries until cache is within size limit
+        for file_path, size, _ in sorted(self._entry_list(), key=lambda item: item[2]):
+            if self._size <= self._max_size:
+                return
+
+            try:
+                os.remove(file_path)
+                self._size -= size
+            except FileNotFoundError:
+                pass
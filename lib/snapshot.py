@@ -0,0 +1,59 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any
+
+from lib import fileutil
+
+SNAPSHOT_DIR_NAME = "snapshot"
+SNAPSHOT_VERSION = 1
+
+
+class Snapshot:
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+
+        # state recorded by the previous run
+        self.data: dict[str, Any] = {}
+        self.time: float | None = None
+
+    def load(self) -> bool:
+        try:
+            fp = open(self.file_path, "rb")
+            snapshot_data = json.load(fp)
+            fp.close()
+        except (FileNotFoundError, ValueError):
+            return False
+
+        if snapshot_data.get("version") != SNAPSHOT_VERSION:
+            # written by an incompatible version - ignore
+            return False
+
+        self.data = snapshot_data["data"]
+        self.time = snapshot_data["time"]
+
+        return True
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        fileutil.atomic_write(
+            self.file_path,
+            json.dumps(
+                {
+                    "version": SNAPSHOT_VERSION,
+                    "time": time.time(),
+                    "data": self.data,
+                },
+                separators=(",", ":"),
+            ),
+        )
+
+
+def snapshot_path(cache_dir: str, name: str, auth_token: str, *key_list: str) -> str:
+    # snapshot for each auth token/key combination - token itself never written to disk
+    key_hash = hashlib.sha256(
+        "\n".join((auth_token,) + key_list).encode("utf-8")
+    ).hexdigest()
+
+    return f"{cache_dir}/{SNAPSHOT_DIR_NAME}/{name}-{key_hash[:16]}.json"
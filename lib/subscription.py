@@ -0,0 +1,128 @@
+import concurrent.futures
+import functools
+import math
+
+from lib import checkpoint, common, githubapi
+
+SUBSCRIPTION_STRATEGY_AUTO = "auto"
+SUBSCRIPTION_STRATEGY_CHECK = "check"
+SUBSCRIPTION_STRATEGY_LIST = "list"
+SUBSCRIPTION_STRATEGY_CHOICE_LIST = [
+    SUBSCRIPTION_STRATEGY_AUTO,
+    SUBSCRIPTION_STRATEGY_CHECK,
+    SUBSCRIPTION_STRATEGY_LIST,
+]
+
+
+def repository_subscription_name_set(
+    auth_token: str, run_checkpoint: checkpoint.Checkpoint | None = None
+) -> set[str]:
+    subscription_set: set[str] = set()
+
+    try:
+        # listing resumed from checkpoint, if any
+        for subscription_item in checkpoint.paged_list(
+            run_checkpoint,
+            "subscription",
+            ["full_name"],
+            functools.partial(githubapi.user_subscription_list, auth_token),
+        ):
+            repository_name = subscription_item.full_name
+
+            # display subscription name & add to set
+            print(repository_name)
+            subscription_set.add(repository_name)
+
+    except githubapi.APIRequestError as err:
+        common.github_api_exit_error("Unable to fetch subscription list.", err)
+
+    return subscription_set
+
+
+def repository_subscribed(auth_token: str, repository_name: str) -> bool:
+    # split repository into owner/repository parts
+    owner, repository = repository_name.split("/")
+
+    try:
+        return bool(
+            githubapi.repository_subscription(auth_token, owner, repository).get(
+                "subscribed"
+            )
+        )
+
+    except githubapi.APIRequestError as err:
+        if err.http_code == 404:
+            # repository not watched
+            return False
+
+        raise
+
+
+def set_repository_subscription(auth_token: str, repository_name: str) -> None:
+    # split repository into owner/repository parts
+    owner, repository = repository_name.split("/")
+
+    githubapi.set_user_repository_subscription(
+        auth_token, owner, repository, subscribed=True
+    )
+
+
+def set_repository_subscription_mutation(
+    node_id_collection: dict[str, str], repository_name: str
+) -> str:
+    return githubapi.graphql_update_subscription_mutation(
+        node_id_collection[repository_name], subscribed=True
+    )
+
+
+def repository_subscription_check_set(
+    auth_token: str, repository_name_set: set[str], concurrency: int
+) -> set[str]:
+    subscribed = functools.partial(repository_subscribed, auth_token)
+    subscription_set: set[str] = set()
+    repository_name_list = sorted(repository_name_set)
+
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for repository_name, is_subscribed in zip(
+                repository_name_list, executor.map(subscribed, repository_name_list)
+            ):
+                if is_subscribed:
+                    # display subscription name & add to set
+                    print(repository_name)
+                    subscription_set.add(repository_name)
+
+    except githubapi.APIRequestError as err:
+        common.github_api_exit_error("Unable to fetch repository subscription.", err)
+
+    return subscription_set
+
+
+def subscription_strategy(auth_token: str, strategy: str, check_count: int) -> str:
+    if strategy != SUBSCRIPTION_STRATEGY_AUTO:
+        # strategy forced by argument
+        return strategy
+
+    if check_count <= 1:
+        # listing subscriptions takes at least one request - no cheaper than a single check
+        return SUBSCRIPTION_STRATEGY_CHECK
+
+    # cost in requests - a check per repository, against a request per page of subscription list
+    # subscription count from a single item page of the subscription list
+    try:
+        subscription_count = githubapi.user_subscription_count(auth_token)
+    except githubapi.APIRequestError as err:
+        common.github_api_exit_error("Unable to fetch subscription count.", err)
+
+    list_count = max(1, math.ceil(subscription_count / githubapi.REQUEST_PAGE_SIZE))
+    strategy = (
+        SUBSCRIPTION_STRATEGY_CHECK
+        if (check_count < list_count)
+        else SUBSCRIPTION_STRATEGY_LIST
+    )
+
+    print(
+        f"Subscription check of {check_count} repositories, or list of {subscription_count} subscriptions in {list_count} requests - using {strategy}"
+    )
+
+    return strategy
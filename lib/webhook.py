@@ -0,0 +1,125 @@
+import hashlib
+import hmac
+import http.server
+import json
+import urllib.parse
+from collections.abc import Callable
+from typing import Any
+
+DEFAULT_LISTEN_HOST = "127.0.0.1"
+DEFAULT_LISTEN_PORT = 8000
+REQUEST_BODY_MAX = 1024 * 1024
+HEADER_EVENT = "X-GitHub-Event"
+HEADER_DELIVERY = "X-GitHub-Delivery"
+HEADER_SIGNATURE = "X-Hub-Signature-256"
+SIGNATURE_PREFIX = "sha256="
+
+
+class WebhookEvent:
+    __slots__ = ("name", "action", "delivery", "payload")
+
+    def __init__(
+        self, name: str, action: str | None, delivery: str | None, payload: Any
+    ):
+        self.name = name
+        self.action = action
+        self.delivery = delivery
+        self.payload = payload
+
+
+EventHandler = Callable[[WebhookEvent], None]
+
+
+class WebhookReceiver(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        event_handler: EventHandler,
+        secret: str | None = None,
+    ):
+        # event handler called from request threads - expected to hand off work and return quickly
+        super().__init__(address, _WebhookRequestHandler)
+
+        self.event_handler = event_handler
+        self.secret = secret
+
+
+class _WebhookRequestHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: WebhookReceiver
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_POST(self):
+        # info: https://docs.github.com/en/webhooks/webhook-events-and-payloads#delivery-headers
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+
+        if (length < 0) or (length > REQUEST_BODY_MAX):
+            self._send(413, "Payload too large")
+            return
+
+        body = self.rfile.read(length)
+        if not self._signature_valid(body):
+            self._send(401, "Invalid signature")
+            return
+
+        event_name = self.headers.get(HEADER_EVENT)
+        if not event_name:
+            self._send(400, f"Missing {HEADER_EVENT} header")
+            return
+
+        try:
+            payload = json.loads(_payload_body(self.headers.get("Content-Type"), body))
+        except ValueError:
+            self._send(400, "Invalid payload")
+            return
+
+        self.server.event_handler(
+            WebhookEvent(
+                event_name,
+                payload.get("action") if (isinstance(payload, dict)) else None,
+                self.headers.get(HEADER_DELIVERY),
+                payload,
+            )
+        )
+
+        self._send(202, "Accepted")
+
+    def _signature_valid(self, body: bytes) -> bool:
+        if not self.server.secret:
+            # no secret - all deliveries accepted
+            return True
+
+        # info: https://docs.github.com/en/webhooks/using-webhooks/validating-webhook-deliveries
+        signature = SIGNATURE_PREFIX + (
+            hmac.new(
+                self.server.secret.encode("utf-8"), body, hashlib.sha256
+            ).hexdigest()
+        )
+
+        return hmac.compare_digest(signature, self.headers.get(HEADER_SIGNATURE, ""))
+
+    def _send(self, http_code: int, message: str) -> None:
+        body = bytes(message + "\n", "utf-8")
+        self.send_response(http_code)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _payload_body(content_type: str | None, body: bytes) -> bytes:
+    # webhooks deliver JSON as request body, or form encoded under a "payload" field
+    # JSON body sent as form content type (e.g. by curl --data) taken as-is
+    if (content_type or "").startswith("application/x-www-form-urlencoded"):
+        payload_list = urllib.parse.parse_qs(body.decode("utf-8")).get("payload")
+        if payload_list:
+            return payload_list[0].encode("utf-8")
+
+    return body
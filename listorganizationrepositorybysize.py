@@ -1,22 +1,56 @@
 #!/usr/bin/env python3
 
-from lib import common, githubapi
+import functools
+import heapq
+import json
+from collections.abc import Generator
+
+from lib import checkpoint, common, githubapi, inventory
 
 ORGANIZATION_CONFIG_KEY = "ORGANIZATION"
+OUTPUT_FORMAT_NDJSON = "ndjson"
+OUTPUT_FORMAT_TSV = "tsv"
 
 
-def organization_repository_size_sorted_list(
+def inventory_source_key(
     auth_token: str, organization_name: str, repository_type: str
-) -> list[tuple[str, int]]:
-    repository_list: list[tuple[str, int]] = []
+) -> str:
+    return inventory.source_key(
+        auth_token, "organization", organization_name, repository_type
+    )
+
+
+def organization_repository_size_list(
+    auth_token: str,
+    organization_name: str,
+    repository_type: str,
+    graphql: bool = False,
+    run_checkpoint: checkpoint.Checkpoint | None = None,
+    run_inventory: inventory.Inventory | None = None,
+) -> Generator[tuple[str, int]]:
+    source_key = inventory_source_key(auth_token, organization_name, repository_type)
 
     try:
-        for repository_item in githubapi.organization_repository_list(
-            auth_token, organization_name, repository_type
-        ):
-            repository_list.append(
-                (repository_item["git_url"], int(repository_item["size"]))
+        # listing from fresh inventory, otherwise API listing resumed from checkpoint, if any
+        for repository_item in (
+            run_inventory.repository_list([source_key])
+            if ((run_inventory is not None) and run_inventory.fresh(source_key))
+            else common.inventory_paged_list(
+                run_inventory,
+                source_key,
+                run_checkpoint,
+                f"repository/{organization_name}",
+                ["git_url", "size"],
+                functools.partial(
+                    githubapi.organization_repository_list,
+                    auth_token,
+                    organization_name,
+                    repository_type,
+                    graphql,
+                ),
             )
+        ):
+            yield (repository_item.git_url, repository_item.size)
 
     except githubapi.APIRequestError as err:
         common.github_api_exit_error(
@@ -24,26 +58,175 @@ def organization_repository_size_sorted_list(
             err,
         )
 
+
+def organization_list_repository_size_list(
+    auth_token: str,
+    organization_list: list[str],
+    repository_type: str,
+    graphql: bool = False,
+    concurrency: int = 1,
+    run_checkpoint: checkpoint.Checkpoint | None = None,
+    run_inventory: inventory.Inventory | None = None,
+) -> Generator[tuple[str, int]]:
+    # organizations listed concurrently, repositories merged as fetched
+    for _, repository_size_item in common.organization_item_list(
+        organization_list,
+        lambda organization_name: organization_repository_size_list(
+            auth_token,
+            organization_name,
+            repository_type,
+            graphql,
+            run_checkpoint,
+            run_inventory,
+        ),
+        concurrency,
+    ):
+        yield repository_size_item
+
+
+def organization_repository_size_sorted_list(
+    auth_token: str,
+    organization_list: list[str],
+    repository_type: str,
+    graphql: bool = False,
+    top: int | None = None,
+    concurrency: int = 1,
+    run_checkpoint: checkpoint.Checkpoint | None = None,
+    run_inventory: inventory.Inventory | None = None,
+) -> list[tuple[str, int]]:
+    source_key_list = [
+        inventory_source_key(auth_token, organization_name, repository_type)
+        for organization_name in organization_list
+    ]
+
+    if (run_inventory is not None) and all(
+        run_inventory.fresh(source_key) for source_key in source_key_list
+    ):
+        # all organizations held by fresh inventory - ordered by indexed size query
+        return [
+            (repository_item.git_url, repository_item.size)
+            for repository_item in run_inventory.repository_list(
+                source_key_list, order_by_size=True, limit=top
+            )
+        ]
+
+    repository_list = organization_list_repository_size_list(
+        auth_token,
+        organization_list,
+        repository_type,
+        graphql,
+        concurrency,
+        run_checkpoint,
+        run_inventory,
+    )
+
+    if top is not None:
+        # keep only the largest repositories, bounded heap of size top
+        return heapq.nlargest(top, repository_list, key=lambda item: item[1])
+
     # sort by repository size descending
     return sorted(repository_list, key=lambda item: item[1], reverse=True)
 
 
+def format_repository_size(
+    output_format: str, repository_url: str, repository_size: int
+) -> str:
+    if output_format == OUTPUT_FORMAT_NDJSON:
+        return json.dumps(
+            {"git_url": repository_url, "size": repository_size},
+            separators=(",", ":"),
+        )
+
+    # repository URL/size - tab separated
+    return f"{repository_url}\t{repository_size}"
+
+
 def main():
-    # load config from file
-    config_data = common.load_config(config_key_addition_set={ORGANIZATION_CONFIG_KEY})
-    config_auth_token = config_data["AUTH_TOKEN"]
+    # fetch CLI arguments
+    parser = common.argument_parser(
+        repository_filter=False, organization=True, repository_inventory=True
+    )
+    parser.add_argument(
+        "--top", help="output only the largest N repositories", type=int
+    )
+
+    parser.add_argument(
+        "--format",
+        choices=[OUTPUT_FORMAT_NDJSON, OUTPUT_FORMAT_TSV],
+        help="stream repositories as fetched (unordered) in the given format",
+    )
 
-    # fetch repository names/sizes of the specified type
-    print("Building repository list ordered by size:")
-    repository_list = organization_repository_size_sorted_list(
-        config_auth_token,
-        config_data[ORGANIZATION_CONFIG_KEY],
-        config_data["REPOSITORY_TYPE"],
+    arg_list = common.parse_arguments(parser)
+    if (arg_list.top is not None) and (arg_list.top < 1):
+        parser.error(f"Invalid top repository count of [{arg_list.top}]")
+
+    # load config from file - organizations given as argument override config
+    config_data = common.load_config(
+        config_key_addition_set=(
+            set() if (arg_list.organization) else {ORGANIZATION_CONFIG_KEY}
+        )
     )
 
-    # output list, repository URL/size - tab separated
-    for repository_url, repository_size in repository_list:
-        print(f"{repository_url}\t{repository_size}")
+    config_auth_token = config_data["AUTH_TOKEN"]
+    common.auth_token_pool_configure(config_data)
+    organization_list = common.organization_list(
+        arg_list.organization or [config_data[ORGANIZATION_CONFIG_KEY]]
+    )
+
+    # save progress to checkpoint/hold repositories in local inventory, if requested - checkpoint removed once run completes
+    with (
+        common.checkpoint_open(
+            arg_list, ",".join(organization_list), config_data["REPOSITORY_TYPE"]
+        ) as run_checkpoint,
+        common.inventory_open(arg_list) as run_inventory,
+    ):
+        if (arg_list.format is not None) and (arg_list.top is None):
+            # stream repository names/sizes as each page is fetched
+            for (
+                repository_url,
+                repository_size,
+            ) in organization_list_repository_size_list(
+                config_auth_token,
+                organization_list,
+                config_data["REPOSITORY_TYPE"],
+                arg_list.graphql,
+                arg_list.concurrency,
+                run_checkpoint,
+                run_inventory,
+            ):
+                print(
+                    format_repository_size(
+                        arg_list.format, repository_url, repository_size
+                    ),
+                    flush=True,
+                )
+
+            return
+
+        # fetch repository names/sizes of the specified type
+        if arg_list.format is None:
+            print("Building repository list ordered by size:")
+
+        repository_list = organization_repository_size_sorted_list(
+            config_auth_token,
+            organization_list,
+            config_data["REPOSITORY_TYPE"],
+            arg_list.graphql,
+            arg_list.top,
+            arg_list.concurrency,
+            run_checkpoint,
+            run_inventory,
+        )
+
+        # output list, repository URL/size
+        for repository_url, repository_size in repository_list:
+            print(
+                format_repository_size(
+                    arg_list.format or OUTPUT_FORMAT_TSV,
+                    repository_url,
+                    repository_size,
+                )
+            )
 
 
 if __name__ == "__main__":
@@ -1,36 +1,220 @@
 #!/usr/bin/env python3
 
-from lib import common, githubapi
+import asyncio
+import concurrent.futures
+import functools
+from collections.abc import Generator
+
+from lib import asyncgithubapi, checkpoint, common, githubapi, responsecache
 
 ORGANIZATION_CONFIG_KEY = "ORGANIZATION"
+CHECKPOINT_WEBHOOK_RESULT_NAME = "webhook"
+REPOSITORY_ITEM_KEY_LIST = ["full_name", "git_url", "admin"]
+
+
+def repository_webhook_url_list(
+    auth_token: str, owner: str, repository: str
+) -> list[str]:
+    return [
+        item["config"]["url"]
+        for item in githubapi.repository_webhook_list(auth_token, owner, repository)
+    ]
+
+
+def checkpoint_webhook_result(
+    run_checkpoint: checkpoint.Checkpoint,
+    repository_name: str,
+    future: concurrent.futures.Future[list[str]] | asyncio.Future[list[str]],
+) -> None:
+    # record webhook list of repository once fetched
+    if (not future.cancelled()) and (future.exception() is None):
+        run_checkpoint.result_set(
+            CHECKPOINT_WEBHOOK_RESULT_NAME, repository_name, future.result()
+        )
+
+
+def organization_repository_list(
+    auth_token: str,
+    organization_name: str,
+    repository_type: str,
+    graphql: bool = False,
+    run_checkpoint: checkpoint.Checkpoint | None = None,
+) -> Generator[githubapi.Repository]:
+    try:
+        # listing resumed from checkpoint, if any
+        yield from checkpoint.paged_list(
+            run_checkpoint,
+            f"repository/{organization_name}",
+            REPOSITORY_ITEM_KEY_LIST,
+            functools.partial(
+                githubapi.organization_repository_list,
+                auth_token,
+                organization_name,
+                repository_type,
+                graphql,
+            ),
+        )
+
+    except githubapi.APIRequestError as err:
+        common.github_api_exit_error(
+            f"Unable to fetch repository list for organization {organization_name}, type {repository_type}.",
+            err,
+        )
 
 
 def organization_repository_webhooks_list(
-    auth_token: str, organization_name: str, repository_type: str
+    auth_token: str,
+    organization_list: list[str],
+    repository_type: str,
+    concurrency: int = 1,
+    graphql: bool = False,
+    run_checkpoint: checkpoint.Checkpoint | None = None,
+) -> list[tuple[str, list[str]]]:
+    repository_list: list[tuple[str, list[str]]] = []
+
+    # webhook lists fetched by run being resumed
+    webhook_collection = (
+        {}
+        if (run_checkpoint is None)
+        else run_checkpoint.result_collection(CHECKPOINT_WEBHOOK_RESULT_NAME)
+    )
+
+    # webhook lists fetched concurrently whilst organization repositories are paged
+    # a single executor across all organizations bounds concurrent webhook requests
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=concurrency)
+    future_collection: dict[
+        str, list[tuple[str, str, concurrent.futures.Future[list[str]]]]
+    ] = {organization_name: [] for organization_name in organization_list}
+
+    try:
+        for organization_name, repository_item in common.organization_item_list(
+            organization_list,
+            lambda organization_name: organization_repository_list(
+                auth_token, organization_name, repository_type, graphql, run_checkpoint
+            ),
+            concurrency,
+        ):
+            # skip repositories without admin permission - webhook list request will always fail
+            if repository_item.admin is False:
+                continue
+
+            repository_name = repository_item.full_name
+            if repository_name in webhook_collection:
+                # webhook list fetched by run being resumed
+                future: concurrent.futures.Future[list[str]] = (
+                    concurrent.futures.Future()
+                )
+                future.set_result(webhook_collection[repository_name])
+            else:
+                # split repository into owner/repository parts
+                owner, repository = repository_name.split("/")
+                future = executor.submit(
+                    repository_webhook_url_list, auth_token, owner, repository
+                )
+
+                if run_checkpoint is not None:
+                    future.add_done_callback(
+                        functools.partial(
+                            checkpoint_webhook_result,
+                            run_checkpoint,
+                            repository_name,
+                        )
+                    )
+
+            future_collection[organization_name].append(
+                (repository_name, repository_item.git_url, future)
+            )
+
+        # collect webhook lists grouped by organization, in repository list order
+        for organization_name in organization_list:
+            for repository_name, repository_url, future in future_collection[
+                organization_name
+            ]:
+                try:
+                    webhook_list = future.result()
+                except githubapi.APIRequestError as err:
+                    common.github_api_exit_error(
+                        f"Unable to fetch webhook list for repository {repository_name}.",
+                        err,
+                    )
+
+                if webhook_list:
+                    repository_list.append((repository_url, webhook_list))
+
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+    return repository_list
+
+
+async def repository_webhook_url_list_async(
+    auth_token: str, owner: str, repository: str
+) -> list[str]:
+    return [
+        item["config"]["url"]
+        for item in await asyncgithubapi.repository_webhook_list(
+            auth_token, owner, repository
+        )
+    ]
+
+
+async def organization_webhooks_list_async(
+    auth_token: str,
+    organization_name: str,
+    repository_type: str,
+    run_checkpoint: checkpoint.Checkpoint | None = None,
 ) -> list[tuple[str, list[str]]]:
     repository_list: list[tuple[str, list[str]]] = []
 
+    # webhook lists fetched by run being resumed
+    webhook_collection = (
+        {}
+        if (run_checkpoint is None)
+        else run_checkpoint.result_collection(CHECKPOINT_WEBHOOK_RESULT_NAME)
+    )
+
+    # webhook lists fetched as tasks whilst organization repositories are paged
+    task_list: list[tuple[str, str, asyncio.Future[list[str]]]] = []
+
     try:
-        for repository_item in githubapi.organization_repository_list(
-            auth_token, organization_name, repository_type
+        # listing resumed from checkpoint, if any
+        async for repository_item in checkpoint.paged_list_async(
+            run_checkpoint,
+            f"repository/{organization_name}",
+            REPOSITORY_ITEM_KEY_LIST,
+            functools.partial(
+                asyncgithubapi.organization_repository_list,
+                auth_token,
+                organization_name,
+                repository_type,
+            ),
         ):
-            # split repository into owner/repository parts
-            owner, repository = repository_item["full_name"].split("/")
-            webhook_list: list[str] = []
-
-            try:
-                for item in githubapi.repository_webhook_list(
-                    auth_token, owner, repository
-                ):
-                    webhook_list.append(item["config"]["url"])
-            except githubapi.APIRequestError as err:
-                common.github_api_exit_error(
-                    f"Unable to fetch webhook list for repository {owner}/{repository}.",
-                    err,
+            # skip repositories without admin permission - webhook list request will always fail
+            if repository_item.admin is False:
+                continue
+
+            repository_name = repository_item.full_name
+            if repository_name in webhook_collection:
+                # webhook list fetched by run being resumed
+                task: asyncio.Future[list[str]] = (
+                    asyncio.get_running_loop().create_future()
+                )
+                task.set_result(webhook_collection[repository_name])
+            else:
+                # split repository into owner/repository parts
+                owner, repository = repository_name.split("/")
+                task = asyncio.create_task(
+                    repository_webhook_url_list_async(auth_token, owner, repository)
                 )
 
-            if webhook_list:
-                repository_list.append((repository_item["git_url"], webhook_list))
+                if run_checkpoint is not None:
+                    task.add_done_callback(
+                        functools.partial(
+                            checkpoint_webhook_result, run_checkpoint, repository_name
+                        )
+                    )
+
+            task_list.append((repository_name, repository_item.git_url, task))
 
     except githubapi.APIRequestError as err:
         common.github_api_exit_error(
@@ -38,27 +222,119 @@ def organization_repository_webhooks_list(
             err,
         )
 
+    # collect webhook lists in repository list order
+    for repository_name, repository_url, task in task_list:
+        try:
+            webhook_list = await task
+        except githubapi.APIRequestError as err:
+            common.github_api_exit_error(
+                f"Unable to fetch webhook list for repository {repository_name}.",
+                err,
+            )
+
+        if webhook_list:
+            repository_list.append((repository_url, webhook_list))
+
     return repository_list
 
 
+async def organization_repository_webhooks_list_async(
+    auth_token: str,
+    organization_list: list[str],
+    repository_type: str,
+    run_checkpoint: checkpoint.Checkpoint | None = None,
+) -> list[tuple[str, list[str]]]:
+    # organizations listed concurrently - requests bounded by client concurrency
+    result_list = await asyncio.gather(
+        *(
+            organization_webhooks_list_async(
+                auth_token, organization_name, repository_type, run_checkpoint
+            )
+            for organization_name in organization_list
+        )
+    )
+
+    # grouped by organization
+    return [
+        repository_item
+        for repository_list in result_list
+        for repository_item in repository_list
+    ]
+
+
 def main():
-    # load config from file
-    config_data = common.load_config(config_key_addition_set={ORGANIZATION_CONFIG_KEY})
-    config_auth_token = config_data["AUTH_TOKEN"]
+    # fetch CLI arguments
+    parser = common.argument_parser(repository_filter=False, organization=True)
+    parser.add_argument(
+        "--asyncio",
+        action="store_true",
+        help="make requests with the asyncio API client, on a single thread",
+    )
+
+    arg_list = common.parse_arguments(parser)
+    if arg_list.asyncio and arg_list.graphql:
+        parser.error("--asyncio can't be used with --graphql")
 
-    # fetch repositories of the specified type and their defined webhooks
-    print("Building repository list including webhooks:")
-    repository_list = organization_repository_webhooks_list(
-        config_auth_token,
-        config_data[ORGANIZATION_CONFIG_KEY],
-        config_data["REPOSITORY_TYPE"],
+    # load config from file - organizations given as argument override config
+    config_data = common.load_config(
+        config_key_addition_set=(
+            set() if (arg_list.organization) else {ORGANIZATION_CONFIG_KEY}
+        )
+    )
+
+    config_auth_token = config_data["AUTH_TOKEN"]
+    config_auth_token_pool = common.auth_token_pool_configure(config_data)
+    organization_list = common.organization_list(
+        arg_list.organization or [config_data[ORGANIZATION_CONFIG_KEY]]
     )
 
-    # output list, repository URL with webhooks defined
-    for repository_url, webhook_list in repository_list:
-        print(f"{repository_url}:")
-        for hook_item in webhook_list:
-            print(f"\t{hook_item}")
+    # save progress to checkpoint, if requested - removed once run completes
+    with common.checkpoint_open(
+        arg_list, ",".join(organization_list), config_data["REPOSITORY_TYPE"]
+    ) as run_checkpoint:
+        # fetch repositories of the specified type and their defined webhooks
+        print("Building repository list including webhooks:")
+        if arg_list.asyncio:
+            asyncgithubapi.set_client(
+                asyncgithubapi.AsyncGitHubClient(
+                    base_url=common.API_BASE_URL,
+                    concurrency=arg_list.concurrency,
+                    max_requests=arg_list.max_requests,
+                    pacing=not arg_list.no_pacing,
+                    request_hook_list=common.request_hook_list(),
+                    retry_max=arg_list.retry_max,
+                    auth_token_pool=config_auth_token_pool,
+                    response_cache=(
+                        None
+                        if (arg_list.no_cache)
+                        else responsecache.ResponseCache(arg_list.cache_dir)
+                    ),
+                )
+            )
+
+            repository_list = asyncio.run(
+                organization_repository_webhooks_list_async(
+                    config_auth_token,
+                    organization_list,
+                    config_data["REPOSITORY_TYPE"],
+                    run_checkpoint,
+                )
+            )
+        else:
+            repository_list = organization_repository_webhooks_list(
+                config_auth_token,
+                organization_list,
+                config_data["REPOSITORY_TYPE"],
+                arg_list.concurrency,
+                arg_list.graphql,
+                run_checkpoint,
+            )
+
+        # output list, repository URL with webhooks defined
+        for repository_url, webhook_list in repository_list:
+            print(f"{repository_url}:")
+            for hook_item in webhook_list:
+                print(f"\t{hook_item}")
 
 
 if __name__ == "__main__":
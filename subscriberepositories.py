@@ -1,23 +1,109 @@
 #!/usr/bin/env python3
 
-from lib import common, githubapi
+import argparse
+import functools
+import ipaddress
+import os
+import queue
+import re
+import sys
+import threading
+import time
+
+from lib import (
+    checkpoint,
+    common,
+    githubapi,
+    mutation,
+    plan,
+    snapshot,
+    subscription,
+    webhook,
+)
+
+SNAPSHOT_NAME = "subscriberepositories"
+SNAPSHOT_REPOSITORY_KEY = "repository"
+SNAPSHOT_SUBSCRIPTION_KEY = "subscription"
+SNAPSHOT_FULL_TIME_KEY = "full_time"
+DEFAULT_SNAPSHOT_MAX_AGE = 24 * 60 * 60
+DEFAULT_RECONCILE_INTERVAL = 6 * 60 * 60
+LISTEN_ADDRESS_REGEXP = re.compile(r"^(?:(.*):)?(\d+)$")
+WEBHOOK_SECRET_ENV_NAME = "WEBHOOK_SECRET"
+
+# repository webhook event actions adding a repository to an organization
+# info: https://docs.github.com/en/webhooks/webhook-events-and-payloads#repository
+WATCH_EVENT_NAME = "repository"
+WATCH_EVENT_ACTION_SET = {"created", "transferred"}
 
 
 def repository_name_set(
-    auth_token: str, repository_type: str, repository_filter: common.RepositoryFilter
+    auth_token: str,
+    repository_type: str,
+    repository_filter: common.RepositoryFilter,
+    graphql: bool = False,
+    subscription_set: set[str] | None = None,
+    node_id_collection: dict[str, str] | None = None,
+    updated_at_collection: dict[str, str] | None = None,
+    known_repository_collection: dict[str, str] | None = None,
+    listed_repository_collection: dict[str, str] | None = None,
+    run_checkpoint: checkpoint.Checkpoint | None = None,
 ) -> set[str]:
     repository_set: set[str] = set()
 
     try:
-        for repository_item in githubapi.user_repository_list(
-            auth_token, repository_type
-        ):
-            repository_name = repository_item["full_name"]
+        # with repositories known from a previous run, list newest first
+        # paging then stops at the first known repository, avoiding fetch of the full list
+        # otherwise full listing resumed from checkpoint, if any
+        repository_list = (
+            checkpoint.paged_list(
+                run_checkpoint,
+                "repository",
+                ["full_name", "node_id", "subscribed", "updated_at"],
+                functools.partial(
+                    githubapi.user_repository_list,
+                    auth_token,
+                    repository_type,
+                    graphql,
+                ),
+            )
+            if (known_repository_collection is None)
+            else githubapi.user_repository_list(
+                auth_token,
+                repository_type,
+                graphql,
+                sort="created",
+                direction="desc",
+                page_worker_count=1,
+            )
+        )
+
+        for repository_item in repository_list:
+            repository_name = repository_item.full_name
+            if (known_repository_collection is not None) and (
+                repository_name in known_repository_collection
+            ):
+                break
+
+            # every repository listed recorded by node ID, regardless of filters
+            if listed_repository_collection is not None:
+                listed_repository_collection[repository_name] = repository_item.node_id
+
+            # GraphQL repository items include subscription state
+            if (subscription_set is not None) and repository_item.subscribed:
+                subscription_set.add(repository_name)
 
             # include/exclude repository?
             if not repository_filter.accept(repository_name):
                 continue
 
+            # GraphQL mutations address repositories by node ID
+            if node_id_collection is not None:
+                node_id_collection[repository_name] = repository_item.node_id
+
+            # last update of repository recorded by plans
+            if updated_at_collection is not None:
+                updated_at_collection[repository_name] = repository_item.updated_at
+
             # display name and add to set
             print(repository_name)
             repository_set.add(repository_name)
@@ -30,68 +116,420 @@ def repository_name_set(
     return repository_set
 
 
-def repository_subscription_name_set(auth_token: str) -> set[str]:
-    subscription_set: set[str] = set()
+def repository_subscription_state(
+    auth_token: str, repository_name: str
+) -> dict[str, bool]:
+    return {
+        "subscribed": subscription.repository_subscribed(auth_token, repository_name)
+    }
+
+
+def subscribe_repositories(
+    arg_list: argparse.Namespace,
+    config_auth_token: str,
+    config_repository_type: str,
+    repository_filter: common.RepositoryFilter,
+    full: bool = False,
+    run_checkpoint: checkpoint.Checkpoint | None = None,
+) -> None:
+    dry_run = not arg_list.commit
+
+    # load snapshot of repositories/subscriptions recorded by previous run
+    # when present, only repositories created since are fetched
+    repository_snapshot = snapshot.Snapshot(
+        snapshot.snapshot_path(
+            arg_list.cache_dir,
+            SNAPSHOT_NAME,
+            config_auth_token,
+            config_repository_type,
+        )
+    )
 
-    try:
-        for subscription_item in githubapi.user_subscription_list(auth_token):
-            repository_name = subscription_item["full_name"]
+    # snapshot refreshed by a full run once older than max age - seeing repositories transferred/shared since
+    incremental = (
+        (not full)
+        and repository_snapshot.load()
+        and (
+            (time.time() - repository_snapshot.data.get(SNAPSHOT_FULL_TIME_KEY, 0))
+            < arg_list.snapshot_max_age
+        )
+    )
+
+    full_time = (
+        repository_snapshot.data[SNAPSHOT_FULL_TIME_KEY]
+        if (incremental)
+        else time.time()
+    )
+    known_repository_collection: dict[str, str] | None = (
+        repository_snapshot.data[SNAPSHOT_REPOSITORY_KEY] if (incremental) else None
+    )
+
+    # fetch repository list of the specified type
+    print(
+        "Building list of repositories created since last run:"
+        if (incremental)
+        else "Building repository list:"
+    )
+
+    repository_subscription_set: set[str] = set()
+    repository_node_id_collection: dict[str, str] = {}
+    repository_updated_at_collection: dict[str, str] = {}
+    listed_repository_collection: dict[str, str] = {}
+    all_repository_set = repository_name_set(
+        config_auth_token,
+        config_repository_type,
+        repository_filter,
+        arg_list.graphql,
+        repository_subscription_set,
+        repository_node_id_collection,
+        repository_updated_at_collection,
+        known_repository_collection,
+        listed_repository_collection,
+        run_checkpoint,
+    )
+
+    if known_repository_collection is not None:
+        print(f"\nNew repositories: {len(all_repository_set)}")
+
+        # add repositories known from previous run
+        for repository_name, node_id in known_repository_collection.items():
+            if repository_filter.accept(repository_name):
+                all_repository_set.add(repository_name)
+                repository_node_id_collection[repository_name] = node_id
+
+    # get total count, if zero then no work
+    repository_count = len(all_repository_set)
+    if repository_count < 1:
+        print("\nNo repositories for processing")
+        return
+
+    print(f"\nTotal repositories: {repository_count}")
+
+    # fetch repository watch details (subscriptions)
+    print(
+        "\n\nFetching watched repositories created since last run:"
+        if (incremental)
+        else "\n\nFetching currently watched repositories:"
+    )
 
-            # display subscription name & add to set
+    # subscriptions known from previous run - only new repositories require a check
+    subscription_set: set[str] = (
+        set(repository_snapshot.data[SNAPSHOT_SUBSCRIPTION_KEY])
+        if (incremental)
+        else set()
+    )
+
+    if arg_list.graphql:
+        # subscriptions returned with GraphQL repository list - no further requests required
+        for repository_name in repository_subscription_set:
             print(repository_name)
-            subscription_set.add(repository_name)
 
-    except githubapi.APIRequestError as err:
-        common.github_api_exit_error("Unable to fetch subscription list.", err)
+        subscription_set.update(repository_subscription_set)
+    else:
+        # check subscription of each repository, or list all subscriptions - whichever is cheaper
+        check_repository_set = (
+            all_repository_set.intersection(listed_repository_collection)
+            if (incremental)
+            else all_repository_set
+        )
 
-    return subscription_set
+        if (
+            subscription.subscription_strategy(
+                config_auth_token,
+                arg_list.subscription_strategy,
+                len(check_repository_set),
+            )
+            == subscription.SUBSCRIPTION_STRATEGY_CHECK
+        ):
+            subscription_set.update(
+                subscription.repository_subscription_check_set(
+                    config_auth_token,
+                    check_repository_set,
+                    arg_list.concurrency,
+                )
+            )
+        else:
+            # full subscription list replaces that known from previous run
+            subscription_set = subscription.repository_subscription_name_set(
+                config_auth_token, run_checkpoint
+            )
 
+    print(f"\nTotal subscriptions: {len(subscription_set)}")
 
-def set_respository_subscription(auth_token: str, repository_name: str) -> None:
-    # split repository into owner/repository parts
-    owner, repository = repository_name.split("/")
+    # record repositories/subscriptions for next run - including subscriptions added below
+    repository_snapshot.data = {
+        SNAPSHOT_REPOSITORY_KEY: (known_repository_collection or {})
+        | listed_repository_collection,
+        SNAPSHOT_SUBSCRIPTION_KEY: sorted(subscription_set),
+        SNAPSHOT_FULL_TIME_KEY: full_time,
+    }
+
+    if getattr(arg_list, "plan_out", None) is not None:
+        # record unsubscribed repositories, for a later run with --apply
+        # repositories known from previous run have no last update time
+        common.plan_write(
+            arg_list,
+            "set subscription",
+            [
+                plan.PlanChange(
+                    repository_name,
+                    repository_node_id_collection[repository_name],
+                    {"subscribed": False},
+                    repository_updated_at_collection.get(repository_name, ""),
+                )
+                for repository_name in sorted(
+                    all_repository_set.difference(subscription_set)
+                )
+            ],
+        )
 
+        repository_snapshot.save()
+        return
+
+    success_set: set[str] = set()
+    not_found_set: set[str] = set()
     try:
-        githubapi.set_user_repository_subscription(
-            auth_token, owner, repository, subscribed=True
+        subscription_add(
+            config_auth_token,
+            all_repository_set,
+            subscription_set,
+            repository_node_id_collection,
+            dry_run,
+            arg_list.concurrency,
+            arg_list.graphql,
+            success_set,
+            run_checkpoint,
+            not_found_set,
         )
 
-    except githubapi.APIRequestError as err:
-        common.github_api_exit_error(
-            f"Unable to set subscription for repository {owner}/{repository}.", err
+    finally:
+        repository_snapshot.data[SNAPSHOT_SUBSCRIPTION_KEY] = sorted(
+            subscription_set.union(success_set)
+        )
+        snapshot_repository_remove(repository_snapshot, not_found_set)
+        repository_snapshot.save()
+
+
+def subscribe_plan_apply(
+    arg_list: argparse.Namespace,
+    config_auth_token: str,
+    config_repository_type: str,
+    run_checkpoint: checkpoint.Checkpoint | None = None,
+) -> None:
+    # repositories/node IDs from plan - applied without listing repositories or subscriptions
+    change_plan = common.plan_load(arg_list, "set subscription")
+    unsubscribed_repository_list = common.plan_repository_name_list(
+        arg_list,
+        change_plan,
+        functools.partial(repository_subscription_state, config_auth_token),
+    )
+
+    if not unsubscribed_repository_list:
+        # all repositories subscribed - no work
+        print("\nAll repositories subscribed")
+        return
+
+    print(f"\n\nAdding {len(unsubscribed_repository_list)} subscriptions:")
+
+    success_set: set[str] = set()
+    not_found_set: set[str] = set()
+    try:
+        failure_set = common.apply_repository_mutation(
+            "set subscription",
+            functools.partial(
+                subscription.set_repository_subscription, config_auth_token
+            ),
+            unsubscribed_repository_list,
+            False,
+            arg_list.concurrency,
+            (
+                mutation.GraphQLBatch(
+                    config_auth_token,
+                    functools.partial(
+                        subscription.set_repository_subscription_mutation,
+                        change_plan.node_id_collection(),
+                    ),
+                )
+                if (arg_list.graphql)
+                else None
+            ),
+            success_set,
+            run_checkpoint,
+            not_found_set,
         )
 
+        common.mutation_failure_exit({"set subscription": failure_set})
+
+    finally:
+        # keep snapshot of previous run, if any, in step with subscriptions added
+        repository_snapshot = snapshot.Snapshot(
+            snapshot.snapshot_path(
+                arg_list.cache_dir,
+                SNAPSHOT_NAME,
+                config_auth_token,
+                config_repository_type,
+            )
+        )
+
+        if (success_set or not_found_set) and repository_snapshot.load():
+            repository_snapshot.data[SNAPSHOT_SUBSCRIPTION_KEY] = sorted(
+                success_set.union(repository_snapshot.data[SNAPSHOT_SUBSCRIPTION_KEY])
+            )
+            snapshot_repository_remove(repository_snapshot, not_found_set)
+            repository_snapshot.save()
+
+
+def snapshot_repository_remove(
+    repository_snapshot: snapshot.Snapshot, repository_name_set: set[str]
+) -> None:
+    # repositories deleted/renamed or access removed since listed - dropped, otherwise failing every later run
+    for repository_name in repository_name_set:
+        repository_snapshot.data[SNAPSHOT_REPOSITORY_KEY].pop(repository_name, None)
+
+    repository_snapshot.data[SNAPSHOT_SUBSCRIPTION_KEY] = [
+        repository_name
+        for repository_name in repository_snapshot.data[SNAPSHOT_SUBSCRIPTION_KEY]
+        if repository_name not in repository_name_set
+    ]
+
 
 def main():
     # fetch CLI arguments
-    (dry_run, filter_include_list, filter_exclude_list) = common.read_arguments()
+    parser = common.argument_parser(change_plan=True)
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="ignore snapshot of previous run, fetching all repositories and subscriptions",
+    )
 
-    # load config from file
-    config_data = common.load_config()
-    config_auth_token = config_data["AUTH_TOKEN"]
+    parser.add_argument(
+        "--snapshot-max-age",
+        default=DEFAULT_SNAPSHOT_MAX_AGE,
+        help=f"seconds after which the snapshot of previous runs is refreshed by fetching all repositories and subscriptions - defaults to {DEFAULT_SNAPSHOT_MAX_AGE}",
+        type=int,
+    )
 
-    # fetch repository list of the specified type
-    print("Building repository list:")
-    all_repository_set = repository_name_set(
-        config_auth_token,
-        config_data["REPOSITORY_TYPE"],
-        common.RepositoryFilter(filter_include_list, filter_exclude_list),
+    parser.add_argument(
+        "--subscription-strategy",
+        choices=subscription.SUBSCRIPTION_STRATEGY_CHOICE_LIST,
+        default=subscription.SUBSCRIPTION_STRATEGY_AUTO,
+        help="check subscription of each repository, or list all subscriptions - "
+        + f"defaults to '{subscription.SUBSCRIPTION_STRATEGY_AUTO}', picking whichever takes fewer requests",
     )
 
-    # get total count, if zero then no work
-    repository_count = len(all_repository_set)
-    if repository_count < 1:
-        print("\nNo repositories for processing")
-        return
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="after run, keep running - subscribing to repositories created/transferred as reported by organization webhooks",
+    )
 
-    print(f"\nTotal repositories: {repository_count}")
+    parser.add_argument(
+        "--listen",
+        default=f"{webhook.DEFAULT_LISTEN_HOST}:{webhook.DEFAULT_LISTEN_PORT}",
+        help=f"address of --watch webhook receiver - defaults to '{webhook.DEFAULT_LISTEN_HOST}:{webhook.DEFAULT_LISTEN_PORT}'",
+    )
 
-    # fetch repository watch details (subscriptions)
-    print("\n\nFetching currently watched repositories:")
-    subscription_set = repository_subscription_name_set(config_auth_token)
+    parser.add_argument(
+        "--reconcile-interval",
+        default=DEFAULT_RECONCILE_INTERVAL,
+        help=f"seconds between full runs with --watch - defaults to {DEFAULT_RECONCILE_INTERVAL}",
+        type=int,
+    )
 
-    print(f"\nTotal subscriptions: {len(subscription_set)}")
+    arg_list = common.parse_arguments(parser)
+    listen_address = listen_address_parse(arg_list.listen)
+    if listen_address is None:
+        parser.error(f"Invalid listen address of [{arg_list.listen}]")
+
+    if arg_list.snapshot_max_age < 0:
+        parser.error(f"Invalid snapshot max age of [{arg_list.snapshot_max_age}]")
+
+    if arg_list.reconcile_interval < 1:
+        parser.error(f"Invalid reconcile interval of [{arg_list.reconcile_interval}]")
+
+    if arg_list.watch and (
+        (arg_list.plan_out is not None) or (arg_list.apply is not None)
+    ):
+        parser.error("unable to use --watch with --plan-out or --apply")
+
+    # empty secret treated as unset - never used as an empty HMAC key
+    webhook_secret = os.environ.get(WEBHOOK_SECRET_ENV_NAME) or None
+
+    # unsigned events accepted only from this host - otherwise anyone reaching receiver could trigger subscription runs
+    if (
+        arg_list.watch
+        and (webhook_secret is None)
+        and (not listen_address_loopback(listen_address[0]))
+    ):
+        parser.error(
+            f"unable to use --watch on non-loopback address [{arg_list.listen}] without {WEBHOOK_SECRET_ENV_NAME} set"
+        )
 
+    # load config from file
+    config_data = common.load_config()
+    config_auth_token = config_data["AUTH_TOKEN"]
+    common.auth_token_pool_configure(config_data)
+    config_repository_type = config_data["REPOSITORY_TYPE"]
+    repository_filter = common.RepositoryFilter(arg_list.include, arg_list.exclude)
+
+    # webhook receiver started ahead of run - events received during run are queued
+    # queue holds repository names from events, None for a reconciling full run
+    receiver: webhook.WebhookReceiver | None = None
+    work_queue: queue.Queue[str | None] = queue.Queue()
+    if arg_list.watch:
+        try:
+            receiver = webhook.WebhookReceiver(
+                listen_address,
+                functools.partial(watch_event, work_queue),
+                webhook_secret,
+            )
+        except OSError as err:
+            parser.error(f"Unable to listen on [{arg_list.listen}] - {err}")
+
+        threading.Thread(target=receiver.serve_forever, daemon=True).start()
+
+        # long running - output written as each line completes
+        sys.stdout.reconfigure(line_buffering=True)
+
+    # save progress to checkpoint, if requested - removed once run completes
+    with common.checkpoint_open(arg_list, config_repository_type) as run_checkpoint:
+        if arg_list.apply is not None:
+            subscribe_plan_apply(
+                arg_list, config_auth_token, config_repository_type, run_checkpoint
+            )
+        else:
+            subscribe_repositories(
+                arg_list,
+                config_auth_token,
+                config_repository_type,
+                repository_filter,
+                arg_list.full,
+                run_checkpoint,
+            )
+
+    if receiver is not None:
+        watch(
+            arg_list,
+            config_auth_token,
+            config_repository_type,
+            repository_filter,
+            receiver,
+            work_queue,
+        )
+
+
+def subscription_add(
+    auth_token: str,
+    all_repository_set: set[str],
+    subscription_set: set[str],
+    node_id_collection: dict[str, str],
+    dry_run: bool,
+    concurrency: int,
+    graphql: bool,
+    success_set: set[str],
+    run_checkpoint: checkpoint.Checkpoint | None = None,
+    not_found_set: set[str] | None = None,
+) -> None:
     # intersect repository set against current subscriptions - report difference
     unsubscribed_repository_set = all_repository_set.difference(subscription_set)
     unsubscribed_repository_set_count = len(unsubscribed_repository_set)
@@ -113,11 +551,139 @@ def main():
         + ":"
     )
 
-    for repository_name in unsubscribed_repository_set:
-        if not dry_run:
-            set_respository_subscription(config_auth_token, repository_name)
+    failure_set = common.apply_repository_mutation(
+        "set subscription",
+        functools.partial(subscription.set_repository_subscription, auth_token),
+        unsubscribed_repository_set,
+        dry_run,
+        concurrency,
+        (
+            mutation.GraphQLBatch(
+                auth_token,
+                functools.partial(
+                    subscription.set_repository_subscription_mutation,
+                    node_id_collection,
+                ),
+            )
+            if (graphql)
+            else None
+        ),
+        success_set,
+        run_checkpoint,
+        not_found_set,
+    )
 
-        print(repository_name)
+    common.mutation_failure_exit({"set subscription": failure_set})
+
+
+def listen_address_parse(value: str) -> tuple[str, int] | None:
+    # [HOST:]PORT - host defaults to loopback
+    address_match = LISTEN_ADDRESS_REGEXP.search(value)
+    if (address_match is None) or (int(address_match.group(2)) > 65535):
+        return None
+
+    return (
+        address_match.group(1) or webhook.DEFAULT_LISTEN_HOST,
+        int(address_match.group(2)),
+    )
+
+
+def listen_address_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        # host name - unable to confirm loopback
+        return False
+
+
+def watch_event(
+    work_queue: queue.Queue[str | None], event: webhook.WebhookEvent
+) -> None:
+    if (event.name != WATCH_EVENT_NAME) or (event.action not in WATCH_EVENT_ACTION_SET):
+        # not an event of interest (e.g. ping)
+        return
+
+    repository_item = (
+        event.payload.get("repository") if (isinstance(event.payload, dict)) else None
+    )
+
+    if isinstance(repository_item, dict) and repository_item.get("full_name"):
+        work_queue.put(repository_item["full_name"])
+
+
+def watch(
+    arg_list: argparse.Namespace,
+    config_auth_token: str,
+    config_repository_type: str,
+    repository_filter: common.RepositoryFilter,
+    receiver: webhook.WebhookReceiver,
+    work_queue: queue.Queue[str | None],
+) -> None:
+    def reconcile_timer() -> None:
+        while not reconcile_stop.wait(arg_list.reconcile_interval):
+            work_queue.put(None)
+
+    reconcile_stop = threading.Event()
+    threading.Thread(target=reconcile_timer, daemon=True).start()
+
+    print(
+        "\n\nWatching for repository webhook events on "
+        + f"[{str(receiver.server_address[0])}:{receiver.server_port}]"
+        + (" [DRY RUN]" if (not arg_list.commit) else "")
+        + ":"
+    )
+
+    # API client connection pool/response cache kept between events and runs
+    try:
+        while True:
+            repository_name = work_queue.get()
+
+            try:
+                if repository_name is None:
+                    # reconciling full run - subscriptions missed by events (e.g. receiver down)
+                    print("\n\nReconciling all repositories:")
+                    subscribe_repositories(
+                        arg_list,
+                        config_auth_token,
+                        config_repository_type,
+                        repository_filter,
+                        full=True,
+                    )
+                elif repository_filter.accept(repository_name):
+                    print(f"\n\nRepository added: {repository_name}")
+                    common.apply_repository_mutation(
+                        "set subscription",
+                        functools.partial(
+                            subscription.set_repository_subscription, config_auth_token
+                        ),
+                        [repository_name],
+                        not arg_list.commit,
+                        1,
+                    )
+
+            except SystemExit:
+                # failure already reported - carry on watching, next reconciling run will retry
+                pass
+
+            except githubapi.APIRequestError as err:
+                common.github_api_error(
+                    "Unable to complete run, retried by next reconciling run.", err
+                )
+
+            except githubapi.REQUEST_CONNECTION_EXCEPTION_LIST as err:
+                # connection failure outside of an API request (e.g. connection pool)
+                common.github_api_error(
+                    "Unable to complete run, retried by next reconciling run.",
+                    githubapi.ConnectionRequestError(err),
+                )
+
+    finally:
+        reconcile_stop.set()
+        receiver.shutdown()
+        receiver.server_close()
 
 
 if __name__ == "__main__":
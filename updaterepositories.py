@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+
+import argparse
+import functools
+
+from lib import checkpoint, common, githubapi, mutation, subscription
+
+
+def repository_list(
+    auth_token: str,
+    repository_type: str,
+    repository_filter: common.RepositoryFilter,
+    graphql: bool = False,
+    run_checkpoint: checkpoint.Checkpoint | None = None,
+) -> list[githubapi.Repository]:
+    filtered_repository_list: list[githubapi.Repository] = []
+
+    try:
+        # single listing for all actions, narrowed by include filters and resumed from checkpoint, if any
+        for repository_item in common.repository_filter_paged_list(
+            run_checkpoint,
+            "repository",
+            ["full_name", "has_projects", "has_wiki", "node_id", "subscribed"],
+            auth_token,
+            repository_type,
+            repository_filter,
+            graphql,
+        ):
+            # include/exclude repository?
+            if repository_filter.accept(repository_item.full_name):
+                filtered_repository_list.append(repository_item)
+
+    except githubapi.APIRequestError as err:
+        common.github_api_exit_error(
+            f"Unable to fetch repository list for type {repository_type}.", err
+        )
+
+    return filtered_repository_list
+
+
+def repository_property_collection(
+    repository_item: githubapi.Repository, disable_wiki: bool, disable_projects: bool
+) -> dict[str, bool]:
+    # properties to change - argument names of update_repository_properties()
+    property_collection: dict[str, bool] = {}
+    if disable_wiki and repository_item.has_wiki:
+        property_collection["wiki"] = False
+
+    if disable_projects and repository_item.has_projects:
+        property_collection["projects"] = False
+
+    return property_collection
+
+
+def update_repository(
+    auth_token: str,
+    property_change_collection: dict[str, dict[str, bool]],
+    repository_name: str,
+) -> None:
+    # split repository into owner/repository parts
+    owner, repository = repository_name.split("/")
+
+    # all property changes of repository applied with a single request
+    property_collection = property_change_collection[repository_name]
+    githubapi.update_repository_properties(
+        auth_token,
+        owner,
+        repository,
+        projects=property_collection.get("projects"),
+        wiki=property_collection.get("wiki"),
+    )
+
+
+def update_repository_mutation(
+    node_id_collection: dict[str, str],
+    property_change_collection: dict[str, dict[str, bool]],
+    repository_name: str,
+) -> str:
+    property_collection = property_change_collection[repository_name]
+    return githubapi.graphql_update_repository_mutation(
+        node_id_collection[repository_name],
+        projects=property_collection.get("projects"),
+        wiki=property_collection.get("wiki"),
+    )
+
+
+def property_change_description(property_collection: dict[str, bool]) -> str:
+    return ", ".join(
+        f"{'Wiki' if (key == 'wiki') else 'Projects'} enabled"
+        for key in sorted(property_collection, reverse=True)
+    )
+
+
+def subscribe_repository_list(
+    arg_list: argparse.Namespace,
+    auth_token: str,
+    all_repository_list: list[githubapi.Repository],
+    node_id_collection: dict[str, str],
+    run_checkpoint: checkpoint.Checkpoint | None = None,
+) -> set[str]:
+    # subscribe to unwatched repositories, returning those failing
+    dry_run = not arg_list.commit
+
+    # fetch repository watch details (subscriptions)
+    print("\n\nFetching currently watched repositories:")
+    all_repository_set = {item.full_name for item in all_repository_list}
+    if arg_list.graphql:
+        # subscriptions returned with GraphQL repository list - no further requests required
+        subscription_set = {
+            item.full_name for item in all_repository_list if item.subscribed
+        }
+
+        for repository_name in sorted(subscription_set):
+            print(repository_name)
+
+    elif (
+        subscription.subscription_strategy(
+            auth_token,
+            arg_list.subscription_strategy,
+            len(all_repository_set),
+        )
+        == subscription.SUBSCRIPTION_STRATEGY_CHECK
+    ):
+        subscription_set = subscription.repository_subscription_check_set(
+            auth_token, all_repository_set, arg_list.concurrency
+        )
+    else:
+        subscription_set = subscription.repository_subscription_name_set(
+            auth_token, run_checkpoint
+        )
+
+    # intersect repository set against current subscriptions - report difference
+    unsubscribed_repository_set = all_repository_set.difference(subscription_set)
+    if not unsubscribed_repository_set:
+        print("\nAll repositories subscribed")
+        return set()
+
+    # add subscriptions (only simulation if dry run mode)
+    print(
+        f"\n\nAdding {len(unsubscribed_repository_set)} subscriptions"
+        + (" [DRY RUN]" if (dry_run) else "")
+        + ":"
+    )
+
+    return common.apply_repository_mutation(
+        "set subscription",
+        functools.partial(subscription.set_repository_subscription, auth_token),
+        sorted(unsubscribed_repository_set),
+        dry_run,
+        arg_list.concurrency,
+        (
+            mutation.GraphQLBatch(
+                auth_token,
+                functools.partial(
+                    subscription.set_repository_subscription_mutation,
+                    node_id_collection,
+                ),
+            )
+            if (arg_list.graphql)
+            else None
+        ),
+        run_checkpoint=run_checkpoint,
+    )
+
+
+def main():
+    # fetch CLI arguments
+    parser = common.argument_parser()
+    parser.add_argument(
+        "--disable-wiki", action="store_true", help="disable repository wikis"
+    )
+
+    parser.add_argument(
+        "--disable-projects",
+        action="store_true",
+        help="disable repository project boards",
+    )
+
+    parser.add_argument(
+        "--subscribe", action="store_true", help="watch unwatched repositories"
+    )
+
+    parser.add_argument(
+        "--subscription-strategy",
+        choices=subscription.SUBSCRIPTION_STRATEGY_CHOICE_LIST,
+        default=subscription.SUBSCRIPTION_STRATEGY_AUTO,
+        help="check subscription of each repository, or list all subscriptions - "
+        + f"defaults to '{subscription.SUBSCRIPTION_STRATEGY_AUTO}', picking whichever takes fewer requests",
+    )
+
+    arg_list = common.parse_arguments(parser)
+    if not (arg_list.disable_wiki or arg_list.disable_projects or arg_list.subscribe):
+        parser.error(
+            "at least one of --disable-wiki, --disable-projects or --subscribe required"
+        )
+
+    dry_run = not arg_list.commit
+
+    # load config from file
+    config_data = common.load_config()
+    config_auth_token = config_data["AUTH_TOKEN"]
+    common.auth_token_pool_configure(config_data)
+
+    # save progress to checkpoint, if requested - removed once run completes
+    with common.checkpoint_open(
+        arg_list,
+        config_data["REPOSITORY_TYPE"],
+        str(arg_list.disable_wiki),
+        str(arg_list.disable_projects),
+        str(arg_list.subscribe),
+    ) as run_checkpoint:
+        # fetch repository list of the specified type - once, for all actions
+        print("Building repository list:")
+        all_repository_list = repository_list(
+            config_auth_token,
+            config_data["REPOSITORY_TYPE"],
+            common.RepositoryFilter(arg_list.include, arg_list.exclude),
+            arg_list.graphql,
+            run_checkpoint,
+        )
+
+        # get total count, if zero then no work
+        repository_count = len(all_repository_list)
+        if repository_count < 1:
+            print("\nNo repositories for processing")
+            return
+
+        # property changes of each repository - merged into a single update
+        repository_node_id_collection: dict[str, str] = {}
+        property_change_collection: dict[str, dict[str, bool]] = {}
+        for repository_item in all_repository_list:
+            repository_node_id_collection[repository_item.full_name] = (
+                repository_item.node_id
+            )
+
+            property_collection = repository_property_collection(
+                repository_item, arg_list.disable_wiki, arg_list.disable_projects
+            )
+
+            if property_collection:
+                property_change_collection[repository_item.full_name] = (
+                    property_collection
+                )
+
+            # display name and properties to change
+            print(
+                repository_item.full_name
+                + (
+                    f" - {property_change_description(property_collection)}"
+                    if (property_collection)
+                    else ""
+                )
+            )
+
+        print(f"\nTotal repositories: {repository_count}")
+
+        failure_collection: dict[str, set[str]] = {}
+        if arg_list.disable_wiki or arg_list.disable_projects:
+            if not property_change_collection:
+                print("\nNo repository properties to update")
+            else:
+                # update properties (only simulation if dry run mode)
+                print(
+                    f"\n\nUpdating {len(property_change_collection)} repositories"
+                    + (" [DRY RUN]" if (dry_run) else "")
+                    + ":"
+                )
+
+                failure_collection["update repository"] = (
+                    common.apply_repository_mutation(
+                        "update repository",
+                        functools.partial(
+                            update_repository,
+                            config_auth_token,
+                            property_change_collection,
+                        ),
+                        sorted(property_change_collection),
+                        dry_run,
+                        arg_list.concurrency,
+                        (
+                            mutation.GraphQLBatch(
+                                config_auth_token,
+                                functools.partial(
+                                    update_repository_mutation,
+                                    repository_node_id_collection,
+                                    property_change_collection,
+                                ),
+                            )
+                            if (arg_list.graphql)
+                            else None
+                        ),
+                        run_checkpoint=run_checkpoint,
+                    )
+                )
+
+        if arg_list.subscribe:
+            failure_collection["set subscription"] = subscribe_repository_list(
+                arg_list,
+                config_auth_token,
+                all_repository_list,
+                repository_node_id_collection,
+                run_checkpoint,
+            )
+
+        # exit once all actions applied - a failed update doesn't prevent subscriptions
+        common.mutation_failure_exit(failure_collection)
+
+
+if __name__ == "__main__":
+    main()